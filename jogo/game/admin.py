@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Player, GameState, Scenario, Round, Choice, GameSession
+from .models import (
+    CatalogMeta, Player, Game, GameEvent, GameSnapshot, GameState, Ruleset, Scenario, Round, Choice,
+    GameSession,
+)
 
 
 @admin.register(GameSession)
@@ -22,9 +25,9 @@ class GameSessionAdmin(admin.ModelAdmin):
         }),
         ('Resultados do Jogo', {
             'fields': (
+                'ruleset',
                 'rounds_completados',
-                ('estabilidade_final', 'seguranca_final'),
-                ('economia_final', 'liberdade_final')
+                'indicadores_finais',
             )
         }),
         ('Pontuações dos Jogadores', {
@@ -44,38 +47,74 @@ class GameSessionAdmin(admin.ModelAdmin):
         if obj:  # editing an existing object
             return self.readonly_fields + [
                 'tipo_comunicacao', 'status', 'rounds_completados',
-                'estabilidade_final', 'seguranca_final', 'economia_final', 'liberdade_final',
+                'ruleset', 'indicadores_finais',
                 'pontuacoes_individuais', 'pontuacoes_coletivas',
                 'total_consensos', 'total_empates'
             ]
         return self.readonly_fields
 
 
+@admin.register(Game)
+class GameAdmin(admin.ModelAdmin):
+    list_display = ['codigo', 'seed', 'criado_em']
+    search_fields = ['codigo']
+    readonly_fields = ['criado_em']
+
+
 # Manter os admins existentes
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
-    list_display = ['name', 'papel', 'pontuacao_individual', 'pontuacao_coletiva']
+    list_display = ['game', 'name', 'papel', 'bot', 'pontuacao_individual', 'pontuacao_coletiva']
+    list_filter = ['game', 'bot']
+
+
+@admin.register(Ruleset)
+class RulesetAdmin(admin.ModelAdmin):
+    list_display = ['nome', 'rodadas', 'minimo', 'maximo', 'colapso', 'atualizado_em']
+    search_fields = ['nome']
+    readonly_fields = ['atualizado_em']
 
 
 @admin.register(Scenario)
 class ScenarioAdmin(admin.ModelAdmin):
-    list_display = ['codigo', 'titulo', 'numero', 'tema']
-    list_filter = ['tema']
+    list_display = ['codigo', 'titulo', 'numero', 'tema', 'ruleset']
+    list_filter = ['tema', 'ruleset']
     ordering = ['numero']
 
 
 @admin.register(GameState)
 class GameStateAdmin(admin.ModelAdmin):
-    list_display = ['rodada_atual', 'estabilidade', 'seguranca', 'economia', 'liberdade', 'active']
+    list_display = ['game', 'rodada_atual', 'indicadores', 'active']
 
 
 @admin.register(Round)
 class RoundAdmin(admin.ModelAdmin):
-    list_display = ['numero', 'scenario', 'created_at']
-    list_filter = ['created_at']
+    list_display = ['game', 'numero', 'scenario', 'votos_a', 'votos_b', 'opcao_vencedora', 'created_at']
+    list_filter = ['game', 'created_at']
 
 
 @admin.register(Choice)
 class ChoiceAdmin(admin.ModelAdmin):
     list_display = ['player', 'round', 'escolha', 'alinhado', 'pontos_ganhos']
-    list_filter = ['escolha', 'alinhado', 'round__numero']
\ No newline at end of file
+    list_filter = ['escolha', 'alinhado', 'round__numero']
+
+
+@admin.register(CatalogMeta)
+class CatalogMetaAdmin(admin.ModelAdmin):
+    list_display = ['nome', 'versao', 'hash', 'revisao', 'fonte', 'atualizado_em']
+    readonly_fields = ['nome', 'versao', 'hash', 'revisao', 'fonte', 'atualizado_em']
+
+
+@admin.register(GameEvent)
+class GameEventAdmin(admin.ModelAdmin):
+    list_display = ['game', 'seq', 'tipo', 'criado_em']
+    list_filter = ['tipo', 'criado_em']
+    search_fields = ['game__codigo']
+    readonly_fields = ['game', 'seq', 'tipo', 'dados', 'criado_em']
+
+
+@admin.register(GameSnapshot)
+class GameSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['game', 'seq', 'criado_em']
+    search_fields = ['game__codigo']
+    readonly_fields = ['game', 'seq', 'estado', 'criado_em']
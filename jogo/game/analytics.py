@@ -0,0 +1,114 @@
+"""
+Estatísticas agregadas das sessões salvas (GameSession).
+
+Tudo sai de uma única consulta agrupada por tipo de comunicação, e o
+resultado fica em cache por ANALYTICS_CACHE_TTL segundos. Quando
+_save_game_session grava uma sessão o cache é limpo na hora, mas com o
+cache local de cada processo isso só alcança o worker que gravou: nos
+outros a sessão nova aparece quando o TTL vence.
+Só entram as sessões das regras padrão: as variantes têm outros
+indicadores e papéis, e misturá-las tornaria as médias incomparáveis.
+"""
+from django.core.cache import cache
+from django.db.models import Avg, Count, IntegerField, Q
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .engine import INDICATORS, MAX_VALUE, MIN_VALUE, ROLE_INTEREST
+from .models import GameSession
+
+ANALYTICS_CACHE_KEY = 'game:analytics'
+ANALYTICS_CACHE_TTL = 60  # segundos
+
+# Chaves seguras para os aliases da consulta (os papéis têm espaços e acentos)
+ROLE_ALIASES = {papel: f'papel_{i}' for i, papel in enumerate(ROLE_INTEREST)}
+
+
+def _aggregates():
+    aggregates = {
+        'sessoes': Count('id'),
+        'completos': Count('id', filter=Q(status='COMPLETO')),
+        'colapsos': Count('id', filter=Q(status='INTERROMPIDO')),
+        'rodadas_media': Avg('rounds_completados'),
+        'consensos_media': Avg('total_consensos'),
+        'empates_media': Avg('total_empates'),
+    }
+
+    for name in INDICATORS:
+        aggregates[f'{name}_media'] = Avg(Cast(KeyTextTransform(name, 'indicadores_finais'), IntegerField()))
+        for value in range(MIN_VALUE, MAX_VALUE + 1):
+            aggregates[f'{name}_{value}'] = Count('id', filter=Q(**{f'indicadores_finais__{name}': value}))
+
+    for papel, alias in ROLE_ALIASES.items():
+        aggregates[f'{alias}_individual'] = Avg(
+            Cast(KeyTextTransform(papel, 'pontuacoes_individuais'), IntegerField())
+        )
+        aggregates[f'{alias}_coletiva'] = Avg(
+            Cast(KeyTextTransform(papel, 'pontuacoes_coletivas'), IntegerField())
+        )
+
+    return aggregates
+
+
+def _ratio(part, total):
+    return part / total if total else 0.0
+
+
+def _group(row, label):
+    sessoes = row['sessoes']
+    return {
+        'tipo_comunicacao': row['tipo_comunicacao'],
+        'label': label,
+        'sessoes': sessoes,
+        'completos': row['completos'],
+        'colapsos': row['colapsos'],
+        'taxa_completos': _ratio(row['completos'], sessoes),
+        'taxa_colapso': _ratio(row['colapsos'], sessoes),
+        'rodadas_media': row['rodadas_media'],
+        'consensos_media': row['consensos_media'],
+        'empates_media': row['empates_media'],
+        'indicadores': {
+            name: {
+                'media': row[f'{name}_media'],
+                'distribuicao': [row[f'{name}_{value}'] for value in range(MIN_VALUE, MAX_VALUE + 1)],
+            }
+            for name in INDICATORS
+        },
+        'papeis': {
+            papel: {
+                'individual': row[f'{alias}_individual'],
+                'coletiva': row[f'{alias}_coletiva'],
+            }
+            for papel, alias in ROLE_ALIASES.items()
+        },
+    }
+
+
+def compute_analytics():
+    labels = dict(GameSession.COMUNICACAO_CHOICES)
+    rows = (
+        GameSession.objects
+        .filter(ruleset__isnull=True)
+        .order_by()
+        .values('tipo_comunicacao')
+        .annotate(**_aggregates())
+        .order_by('tipo_comunicacao')
+    )
+    return {
+        'grupos': [_group(row, labels.get(row['tipo_comunicacao'], row['tipo_comunicacao'])) for row in rows],
+        'valores': list(range(MIN_VALUE, MAX_VALUE + 1)),
+        'gerado_em': timezone.now().isoformat(),
+    }
+
+
+def get_analytics():
+    data = cache.get(ANALYTICS_CACHE_KEY)
+    if data is None:
+        data = compute_analytics()
+        cache.set(ANALYTICS_CACHE_KEY, data, ANALYTICS_CACHE_TTL)
+    return data
+
+
+def invalidate_analytics():
+    cache.delete(ANALYTICS_CACHE_KEY)
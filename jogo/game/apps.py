@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class GameConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'game'
+
+    def ready(self):
+        from .catalog import ruleset_changed, scenario_changed
+        from .middleware import install_query_timer
+        from .models import GameSession, Ruleset, Scenario
+        from .replay import session_changed
+
+        # Mede as consultas de cada requisição (ver game.middleware)
+        connection_created.connect(install_query_timer, dispatch_uid='game_query_timer')
+
+        # Edições de cenários (admin, shell) invalidam o catálogo em memória
+        post_save.connect(scenario_changed, sender=Scenario, dispatch_uid='game_scenario_saved')
+        post_delete.connect(scenario_changed, sender=Scenario, dispatch_uid='game_scenario_deleted')
+        post_save.connect(ruleset_changed, sender=Ruleset, dispatch_uid='game_ruleset_saved')
+        post_delete.connect(ruleset_changed, sender=Ruleset, dispatch_uid='game_ruleset_deleted')
+
+        # Replays em cache ficam presos ao histórico da sessão (ver game.replay)
+        post_save.connect(session_changed, sender=GameSession, dispatch_uid='game_session_saved')
+        post_delete.connect(session_changed, sender=GameSession, dispatch_uid='game_session_deleted')
@@ -0,0 +1,211 @@
+"""
+Arquivo compacto do histórico de uma partida encerrada.
+
+Quando a partida termina, as rodadas e escolhas da sala viram um único
+blob gravado em GameSession.historico, e as linhas de Round/Choice são
+apagadas: as tabelas quentes só guardam partidas em andamento.
+
+O blob é JSON compacto comprimido com zlib. Cada rodada é uma lista
+curta, com os votos numa string na ordem de "papeis" e o alinhamento
+num bitmask:
+
+    {"v": 1, "sala": "ABC234", "seed": 123, "papeis": [...], "indicadores": [...],
+     "regras": {"interesse": [[papel, indicador], ...], "iniciais": [...], ...},
+     "rodadas": [[numero, cenario, opcao, "AABA", alinhados, [impacto], timestamp], ...]}
+
+O impacto segue a ordem de "indicadores", e "regras" guarda o resto das
+regras da sala na época (limites, faixa coletiva, valores iniciais): o
+replay não depende do ruleset como ele está hoje.
+
+SessionHistory só descomprime quando alguém lê as rodadas.
+"""
+import json
+import zlib
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import NamedTuple
+
+from .engine import DEFAULT_RULES, Rules
+from .models import Choice, GameSession, Round
+
+ARCHIVE_VERSION = 1
+COMPRESSION_LEVEL = 9
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+class ArchivedRound(NamedTuple):
+    numero: int
+    cenario: int
+    opcao: str
+    votos: dict  # papel -> 'A' | 'B'
+    alinhados: dict  # papel -> bool
+    impacto: dict  # indicador -> impacto aplicado
+    criado_em: datetime
+
+    @property
+    def votos_a(self):
+        return sum(1 for escolha in self.votos.values() if escolha == 'A')
+
+    @property
+    def votos_b(self):
+        return len(self.votos) - self.votos_a
+
+
+def encode(game, papeis, rows, rules=DEFAULT_RULES):
+    """
+    Blob da partida. rows: (numero, cenario, opcao, criado_em, papel,
+    escolha, alinhado, impacto), ordenadas por rodada
+    """
+    indicadores = rules.indicadores
+    index = {papel: i for i, papel in enumerate(papeis)}
+    rodadas = []
+    current = None
+    for numero, cenario, opcao, criado_em, papel, escolha, alinhado, impacto in rows:
+        if current is None or current[0] != numero:
+            current = [numero, cenario, opcao, ['?'] * len(papeis), 0,
+                       [impacto.get(name, 0) for name in indicadores] if impacto else [0] * len(indicadores),
+                       int(criado_em.timestamp())]
+            rodadas.append(current)
+        current[3][index[papel]] = escolha
+        if alinhado:
+            current[4] |= 1 << index[papel]
+
+    for rodada in rodadas:
+        rodada[3] = ''.join(rodada[3])
+
+    data = {
+        'v': ARCHIVE_VERSION,
+        'sala': game.codigo,
+        'seed': game.seed,
+        'papeis': list(papeis),
+        'indicadores': list(indicadores),
+        'regras': {
+            'nome': rules.nome,
+            'interesse': list(rules.interesse.items()),
+            'rodadas': rules.rodadas,
+            'iniciais': list(rules.iniciais),
+            'minimo': rules.minimo,
+            'maximo': rules.maximo,
+            'colapso': rules.colapso,
+            'faixa': list(rules.faixa),
+            'rotulos': rules.rotulos,
+        },
+        'rodadas': rodadas,
+    }
+    return zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def archive_game(game, players, rules=DEFAULT_RULES):
+    """Blob com todas as rodadas e escolhas da sala (uma consulta)"""
+    rows = (
+        Choice.objects.filter(round__game=game)
+        .order_by('round__numero', 'player_id')
+        .values_list(
+            'round__numero', 'round__scenario_id', 'round__opcao_vencedora', 'round__created_at',
+            'player__papel', 'escolha', 'alinhado', 'impacto',
+        )
+    )
+    return encode(game, [p.papel for p in players], rows, rules)
+
+
+def clear_hot_tables(game):
+    """Apaga as rodadas da sala (e as escolhas, por CASCADE) depois de arquivar"""
+    Round.objects.filter(game=game).delete()
+
+
+class SessionHistory:
+    """Histórico arquivado de uma sessão, decodificado na primeira leitura"""
+
+    def __init__(self, blob):
+        self.blob = bytes(blob)
+
+    @cached_property
+    def data(self):
+        try:
+            data = json.loads(zlib.decompress(self.blob))
+        except (zlib.error, ValueError) as exc:
+            raise ArchiveError(f'Histórico corrompido: {exc}')
+        if data.get('v') != ARCHIVE_VERSION:
+            raise ArchiveError(f"Versão de histórico desconhecida: {data.get('v')}")
+        return data
+
+    @property
+    def sala(self):
+        return self.data['sala']
+
+    @property
+    def seed(self):
+        return self.data['seed']
+
+    @property
+    def papeis(self):
+        return self.data['papeis']
+
+    @property
+    def indicadores(self):
+        return self.data['indicadores']
+
+    @cached_property
+    def rules(self):
+        """Regras da sala na época em que a partida foi jogada"""
+        regras = self.data['regras']
+        return Rules(self.indicadores, [tuple(par) for par in regras['interesse']], **{
+            name: value for name, value in regras.items() if name != 'interesse'
+        })
+
+    def __len__(self):
+        return len(self.data['rodadas'])
+
+    def _round(self, row):
+        numero, cenario, opcao, votos, alinhados, impacto, timestamp = row
+        papeis = self.papeis
+        return ArchivedRound(
+            numero=numero,
+            cenario=cenario,
+            opcao=opcao,
+            votos=dict(zip(papeis, votos)),
+            alinhados={papel: bool(alinhados >> i & 1) for i, papel in enumerate(papeis)},
+            impacto=dict(zip(self.indicadores, impacto)),
+            criado_em=datetime.fromtimestamp(timestamp, tz=timezone.utc),
+        )
+
+    def rounds(self):
+        for row in self.data['rodadas']:
+            yield self._round(row)
+
+    def round(self, numero):
+        for row in self.data['rodadas']:
+            if row[0] == numero:
+                return self._round(row)
+        raise KeyError(numero)
+
+    def as_dict(self):
+        return {
+            'sala': self.sala,
+            'seed': self.seed,
+            'papeis': self.papeis,
+            'indicadores': self.indicadores,
+            'rodadas': [
+                {
+                    'numero': rnd.numero,
+                    'cenario': rnd.cenario,
+                    'opcao_vencedora': rnd.opcao,
+                    'votos': rnd.votos,
+                    'alinhados': rnd.alinhados,
+                    'impacto': rnd.impacto,
+                    'criado_em': rnd.criado_em.isoformat(),
+                }
+                for rnd in self.rounds()
+            ],
+        }
+
+
+def load_history(session_id):
+    """Histórico da sessão (só o blob sai do banco), ou None se ela não foi arquivada"""
+    blob = GameSession.objects.filter(pk=session_id).values_list('historico', flat=True).first()
+    if blob is None:
+        return None
+    return SessionHistory(blob)
@@ -0,0 +1,281 @@
+"""
+Benchmarks das telas da sala.
+
+- Servidor real (benchmark_servers): gerador de carga HTTP em threads,
+  uma conexão por requisição, contra o runserver (WSGI) ou o uvicorn (ASGI).
+- Em processo (benchmark_game): partidas completas pelo django.test.Client,
+  em série ou em várias threads, medindo latência e consultas de cada
+  requisição por tipo (voto, tela, estado).
+
+Os resumos trazem req/s e percentis p50/p90/p99 das latências.
+"""
+import http.client
+import itertools
+import json
+import math
+import random
+import socket
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import engine
+from .engine import INDICATORS, MAX_ROUNDS, ROLE_INTEREST
+
+
+def percentile(values, q):
+    """Percentil pelo método do posto mais próximo (q de 0 a 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    done = len(latencies)
+    return {
+        'requests': done + errors,
+        'errors': errors,
+        'seconds': elapsed,
+        'rps': done / elapsed if elapsed else 0.0,
+        'mean_ms': 1000 * sum(latencies) / done if done else 0.0,
+        'p50_ms': 1000 * percentile(latencies, 50),
+        'p90_ms': 1000 * percentile(latencies, 90),
+        'p99_ms': 1000 * percentile(latencies, 99),
+    }
+
+
+class Client:
+    """Cliente HTTP mínimo com cookies (para o csrftoken dos POSTs)"""
+
+    def __init__(self, host, port, timeout=30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.cookies = SimpleCookie()
+        self.body = b''
+
+    def request(self, method, path, data=None):
+        headers = {'Connection': 'close'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={m.value}' for k, m in self.cookies.items())
+        body = None
+        if data is not None:
+            body = urlencode(data)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            if 'csrftoken' in self.cookies:
+                headers['X-CSRFToken'] = self.cookies['csrftoken'].value
+
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            self.body = response.read()
+            for value in response.headers.get_all('Set-Cookie') or []:
+                self.cookies.load(value)
+            return response.status
+        finally:
+            conn.close()
+
+
+def page_workload(codigo):
+    """GET da tela da sala"""
+    def step(client, context):
+        return client.request('GET', f'/game/{codigo}/')
+    return step
+
+
+def state_workload(codigo):
+    """GET do estado em JSON"""
+    def step(client, context):
+        return client.request('GET', f'/game/{codigo}/estado/')
+    return step
+
+
+def vote_workload(codigos):
+    """
+    POST de rodadas completas, cada worker na sua sala. Como a tela, o
+    formulário leva a rodada e o cenário lidos do estado em JSON; com a
+    partida encerrada a sala é resetada para o jogo não acabar
+    """
+    votes = {f'choice_{papel}': 'A' for papel in ROLE_INTEREST}
+
+    def step(client, context):
+        codigo = codigos[context['worker'] % len(codigos)]
+        path = f'/game/{codigo}/'
+        if 'csrftoken' not in client.cookies:
+            client.request('GET', path)
+        status = client.request('GET', f'/game/{codigo}/estado/')
+        if status != 200:
+            return status
+        state = json.loads(client.body)
+        data = {'rodada': state['rodada'], 'cenario': state['cenario_id'] or ''}
+        if not state['ativo']:
+            return client.request('POST', path, {**data, 'reset_game': '1'})
+        return client.request('POST', path, {**data, **votes})
+    return step
+
+
+def run_load(host, port, step, requests, concurrency):
+    """Dispara `requests` chamadas de step(client, context) em `concurrency` threads"""
+    counter = itertools.count()
+
+    def worker(worker_id):
+        client = Client(host, port)
+        context = {'worker': worker_id}
+        latencies = []
+        errors = 0
+        while next(counter) < requests:
+            started = time.perf_counter()
+            try:
+                status = step(client, context)
+            except (OSError, http.client.HTTPException):
+                status = None
+            if status is not None and status < 400:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for chunk, _ in results for latency in chunk]
+    return summarize(latencies, sum(errors for _, errors in results), elapsed)
+
+
+def wait_for_port(host, port, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+# ====== Partidas completas em processo (django.test.Client) ======
+
+class Recorder:
+    """Latência, consultas e status de cada requisição, por tipo"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)  # tipo -> [(segundos, consultas, status)]
+        self.games = 0
+        self.rounds = 0
+        self.codigos = []
+
+    def measure(self, kind, call):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = call()
+            elapsed = time.perf_counter() - started
+        self.samples[kind].append((elapsed, len(queries), response.status_code))
+        return response
+
+    def merge(self, other):
+        for kind, samples in other.samples.items():
+            self.samples[kind].extend(samples)
+        self.games += other.games
+        self.rounds += other.rounds
+        self.codigos.extend(other.codigos)
+
+    def summary(self, elapsed):
+        requests = {}
+        for kind, samples in sorted(self.samples.items()):
+            ok = [latency for latency, _, status in samples if status < 400]
+            queries = [count for _, count, _ in samples]
+            requests[kind] = {
+                **summarize(ok, len(samples) - len(ok), elapsed),
+                'queries_mean': sum(queries) / len(queries),
+                'queries_max': max(queries),
+            }
+        return {
+            'games': self.games,
+            'rounds': self.rounds,
+            'seconds': elapsed,
+            'rounds_per_s': self.rounds / elapsed if elapsed else 0.0,
+            'requests': requests,
+        }
+
+
+def play_game(client, scenarios, policy, rng, recorder):
+    """
+    Cria uma sala pelo lobby e joga até o fim: a cada rodada lê o estado,
+    vota com a política e recarrega a tela da sala
+    """
+    response = recorder.measure('create', lambda: client.post(reverse('game:lobby'), {'create_game': '1'}))
+    codigo = response.url.rstrip('/').rsplit('/', 1)[-1]
+    recorder.codigos.append(codigo)
+    state_url = reverse('game:state', args=[codigo])
+    game_url = reverse('game:game', args=[codigo])
+
+    # MAX_ROUNDS + 1: não fica preso se uma votação falhar
+    for _ in range(MAX_ROUNDS + 1):
+        response = recorder.measure('state', lambda: client.get(state_url))
+        if response.status_code != 200:
+            break
+        payload = response.json()
+        if not payload['ativo']:
+            break
+
+        state = engine.State(tuple(payload['indicadores'][name] for name in INDICATORS), payload['rodada'])
+        votes = policy(state, scenarios[payload['cenario_id']], rng)
+        data = {f'choice_{papel}': escolha for papel, escolha in votes.items()}
+        data.update(rodada=payload['rodada'], cenario=payload['cenario_id'])
+        recorder.measure('vote', lambda: client.post(game_url, data))
+        recorder.measure('page', lambda: client.get(game_url))
+        recorder.rounds += 1
+
+    recorder.games += 1
+
+
+def run_games(scenarios, policy, games, seed=0):
+    """Partidas em série num único cliente"""
+    recorder = Recorder()
+    client = TestClient(raise_request_exception=False)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for _ in range(games):
+        play_game(client, scenarios, policy, rng, recorder)
+    return recorder, time.perf_counter() - started
+
+
+def run_games_threaded(scenarios, policy, games, concurrency, seed=0):
+    """
+    Partidas em `concurrency` threads, cada uma com seu cliente e sua
+    conexão ao banco (o SQLite serializa as escritas entre elas)
+    """
+    counter = itertools.count()
+
+    def worker(worker_id):
+        recorder = Recorder()
+        client = TestClient(raise_request_exception=False)
+        rng = random.Random(seed + worker_id)
+        try:
+            while next(counter) < games:
+                play_game(client, scenarios, policy, rng, recorder)
+        finally:
+            connection.close()
+        return recorder
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        recorders = list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total = Recorder()
+    for recorder in recorders:
+        total.merge(recorder)
+    return total, elapsed
@@ -0,0 +1,210 @@
+"""
+Bots que ocupam os papéis sem jogador humano.
+
+O voto do bot sai no mesmo ciclo da requisição que fecha a rodada: quando
+o formulário da sala chega, ou quando o último humano vota pelo celular.
+As estratégias são as políticas de game.simulation aplicadas ao papel do
+bot, mais a lookahead, que olha as próximas rodadas (expectativa sobre
+os cenários do ruleset) com orçamento de tempo fixo.
+
+Os votos humanos já estão dados quando os bots votam: cada bot testa A e
+B contra eles (e contra os bots anteriores) e fica com o voto cujo
+resultado a sua estratégia prefere. O voto da política vale como
+desempate, ou seja, quando o bot não decide a rodada.
+
+A lookahead aprofunda uma rodada por vez e fica com a melhor escolha da
+última profundidade completa, então um bot nunca segura a sala mais que
+LOOKAHEAD_BUDGET. As avaliações ficam numa tabela por catálogo e
+ruleset, compartilhada entre salas e rodadas do mesmo processo.
+"""
+import random
+import threading
+import time
+
+from . import engine
+from .catalog import get_catalog
+from .engine import ScenarioImpacts
+from .simulation import POLICIES, outcome_score, votes_for_outcome
+
+# Segundos que um bot lookahead pode gastar por voto
+LOOKAHEAD_BUDGET = 0.05
+# Entradas da tabela de avaliações antes de recomeçar do zero
+MEMO_LIMIT = 200_000
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Lookahead:
+    """
+    Valor esperado das próximas rodadas (uma por rodada sobrevivida, mais
+    uma na faixa coletiva) com o grupo escolhendo o melhor resultado
+    """
+
+    def __init__(self, scenarios, rules=engine.DEFAULT_RULES):
+        self.rules = rules
+        # Cenários com impactos idênticos valem o mesmo: uma classe, com peso
+        counts = {}
+        for s in scenarios:
+            key = tuple(s.impact(opcao) for opcao in rules.outcomes)
+            counts[key] = counts.get(key, 0) + 1
+        self.classes = list(counts.items())
+        self.total = sum(counts.values())
+        self.table = {}
+
+    def _step(self, indicadores, impacto, depth, deadline):
+        new = engine.apply_impact(indicadores, impacto, self.rules)
+        if engine.is_collapsed(new, self.rules):
+            return 0.0
+        return 1.0 + engine.in_collective_band(new, self.rules) + self.value(new, depth, deadline)
+
+    def value(self, indicadores, depth, deadline=None):
+        if depth <= 0 or not self.classes:
+            return 0.0
+        key = (indicadores, depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        if deadline is not None and time.perf_counter() > deadline:
+            raise _Timeout
+
+        total = 0.0
+        for impacts, count in self.classes:
+            total += count * max(self._step(indicadores, impacto, depth - 1, deadline) for impacto in impacts)
+        result = total / self.total
+
+        if len(self.table) >= MEMO_LIMIT:
+            self.table.clear()
+        self.table[key] = result
+        return result
+
+    def outcome_values(self, state, scenario, budget=LOOKAHEAD_BUDGET):
+        """Valor de cada resultado do cenário na última profundidade completa dentro do orçamento"""
+        deadline = time.perf_counter() + budget
+
+        def values(depth):
+            result = {}
+            for opcao in self.rules.outcomes:
+                impacto = scenario.impact(opcao)
+                new = engine.apply_impact(state.indicadores, impacto, self.rules)
+                result[opcao] = (self._step(state.indicadores, impacto, depth, deadline), outcome_score(new, self.rules))
+            return result
+
+        # Profundidade 0 é a escolha gulosa, sempre disponível
+        best = values(0)
+        for depth in range(1, self.rules.rodadas - state.rodada + 1):
+            try:
+                best = values(depth)
+            except _Timeout:
+                break
+        return best
+
+    def best_outcome(self, state, scenario, budget=LOOKAHEAD_BUDGET):
+        """Melhor resultado para o cenário da rodada, dentro do orçamento"""
+        values = self.outcome_values(state, scenario, budget)
+        return max(self.rules.outcomes, key=values.__getitem__)
+
+
+_lookaheads = {}
+_lookaheads_lock = threading.Lock()
+
+
+def get_lookahead(catalog, ruleset_id=None):
+    """Lookahead do ruleset para a revisão atual do catálogo (tabela compartilhada)"""
+    key = (catalog.version, ruleset_id)
+    lookahead = _lookaheads.get(key)
+    if lookahead is None:
+        with _lookaheads_lock:
+            lookahead = _lookaheads.get(key)
+            if lookahead is None:
+                # Revisão nova: as tabelas das antigas não servem mais
+                for old in [k for k in _lookaheads if k[0] != catalog.version]:
+                    del _lookaheads[old]
+                lookahead = Lookahead(catalog.impacts_for(ruleset_id), catalog.rules(ruleset_id))
+                _lookaheads[key] = lookahead
+    return lookahead
+
+
+def lookahead_policy(state, scenario, rng, rules=engine.DEFAULT_RULES, lookahead=None):
+    lookahead = lookahead or Lookahead([scenario], rules)
+    return votes_for_outcome(lookahead.best_outcome(state, scenario), rules.papeis)
+
+
+STRATEGIES = {
+    'selfish': POLICIES['selfish'],
+    'cooperative': POLICIES['cooperative'],
+    'random': POLICIES['random'],
+    'lookahead': lookahead_policy,
+}
+
+
+def _rng(game, rodada, papel):
+    # Mesma sala, rodada e papel: mesmo voto aleatório (reprodutível no replay)
+    return random.Random(f'{game.seed}:{rodada}:{papel}')
+
+
+def _scorers(rules, outcome_values):
+    """
+    Como cada estratégia avalia o resultado de uma rodada (RoundResult)
+    para o papel do bot; a random não avalia nada e fica com o próprio voto
+    """
+    return {
+        'selfish': lambda result, papel: result.state.indicadores[rules.role_index[papel]],
+        'cooperative': lambda result, papel: outcome_score(result.state.indicadores, rules),
+        'lookahead': lambda result, papel: outcome_values()[result.opcao_vencedora],
+    }
+
+
+def fill_votes(gs, players, scenario, choices):
+    """
+    Completa choices com o voto de cada bot que ainda não votou, levando
+    em conta os votos já dados
+    """
+    bots = [p for p in players if p.bot and not choices.get(p.papel)]
+    if not bots:
+        return choices
+
+    game = gs.game
+    catalog = get_catalog()
+    rules = catalog.rules(game.ruleset_id)
+    state = engine.State(tuple(gs.indicadores), gs.rodada_atual, gs.active)
+    impacts = catalog.impacts.get(scenario.pk) or ScenarioImpacts.from_model(scenario)
+    pontos = catalog.pontos.get(scenario.pk) or engine.points_table(impacts, rules)
+    values = {}
+
+    def outcome_values():
+        # Uma busca por rodada, dividida entre os bots lookahead
+        if not values:
+            values.update(get_lookahead(catalog, game.ruleset_id).outcome_values(state, impacts))
+        return values
+
+    # Voto de cada bot pela política, sem olhar os outros votos
+    wanted = {}
+    for p in bots:
+        if p.bot == 'lookahead':
+            best = max(rules.outcomes, key=outcome_values().__getitem__)
+            votes = votes_for_outcome(best, rules.papeis)
+        else:
+            votes = STRATEGIES[p.bot](state, impacts, _rng(game, gs.rodada_atual, p.papel), rules)
+        wanted[p.papel] = votes[p.papel]
+
+    scorers = _scorers(rules, outcome_values)
+    # O formulário manda os papéis dos bots em branco
+    choices = {papel: escolha for papel, escolha in choices.items() if escolha}
+    for p in bots:
+        score = scorers.get(p.bot)
+        if score is None:
+            choices[p.papel] = wanted[p.papel]
+            continue
+        # Bots que ainda não decidiram entram com o voto da política
+        others = {**wanted, **choices}
+
+        def result_score(voto):
+            result = engine.resolve_round(state, impacts, {**others, p.papel: voto}, pontos, rules)
+            return score(result, p.papel)
+
+        other = engine.OPTION_B if wanted[p.papel] == engine.OPTION_A else engine.OPTION_A
+        # Em caso de empate max fica com o primeiro: o voto da política
+        choices[p.papel] = max((wanted[p.papel], other), key=result_score)
+    return choices
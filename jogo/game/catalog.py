@@ -0,0 +1,324 @@
+"""
+Catálogo de cenários em arquivos de dados versionados (game/data).
+
+O arquivo é JSON (ou YAML, se o PyYAML estiver instalado) no formato
+{"versao": N, "ruleset": "nome", "cenarios": [{...campos do Scenario...}]},
+com os impactos de cada cenário em {"sim": [...], "nao": [...],
+"empate": [...]} (um valor por indicador do ruleset) ou já no vetor plano
+do banco. Sem "ruleset" os cenários são do ruleset padrão. A carga compara
+o conteúdo com o banco por `codigo` e grava só o que mudou, com um único
+bulk_create(update_conflicts=True) numa transação. O hash do conteúdo
+fica em CatalogMeta: catálogo igual ao último carregado nem consulta os
+cenários.
+
+Em execução, get_catalog() devolve uma foto dos cenários e rulesets
+carregada uma vez por processo, com índices, impactos e regras compiladas
+(engine.Rules) já calculados. Ela é recarregada quando CatalogMeta.revisao
+muda (cargas e saves/deletes de Scenario ou Ruleset); a
+revisão atual é lida do cache, com validade curta para que processos com
+cache próprio (LocMemCache) também percebam mudanças feitas por outros.
+"""
+import hashlib
+import json
+import threading
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+from .engine import DEFAULT_RULES, OUTCOMES, ScenarioImpacts, points_table
+from .models import CatalogMeta, Ruleset, Scenario
+
+CATALOG_NAME = 'scenarios'
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+DEFAULT_CATALOG = DATA_DIR / 'cenarios.json'
+
+CATALOG_VERSION_KEY = 'game:catalog_version'
+CATALOG_VERSION_TTL = 5  # segundos
+
+SCENARIO_FIELDS = [
+    f.attname for f in Scenario._meta.concrete_fields if not f.primary_key
+]
+# O ruleset vem do cabeçalho do arquivo, não de cada cenário
+FILE_FIELDS = [name for name in SCENARIO_FIELDS if name != 'ruleset_id']
+REQUIRED_FIELDS = [
+    f.attname for f in Scenario._meta.concrete_fields if not f.primary_key and not f.null
+]
+INT_FIELDS = [
+    f.attname for f in Scenario._meta.concrete_fields if f.get_internal_type() == 'IntegerField'
+]
+# Chaves da forma legível dos impactos, na ordem de engine.OUTCOMES
+IMPACT_KEYS = ('sim', 'nao', 'empate')
+
+
+class CatalogError(ValueError):
+    pass
+
+
+class SyncResult(NamedTuple):
+    versao: int
+    hash: str
+    criados: int
+    atualizados: int
+    iguais: int
+    pulado: bool  # hash igual ao último carregado
+
+
+def catalog_name(ruleset=None):
+    """Nome do CatalogMeta: um catálogo por ruleset"""
+    return CATALOG_NAME if ruleset is None else f'{CATALOG_NAME}:{ruleset.nome}'
+
+
+def read_catalog(path=DEFAULT_CATALOG):
+    """
+    Lê e valida o arquivo; devolve (versão, ruleset, lista de cenários).
+    ruleset é None para o padrão
+    """
+    path = Path(path)
+    try:
+        text = path.read_text(encoding='utf-8')
+    except OSError as exc:
+        raise CatalogError(f'Não foi possível ler {path}: {exc}')
+
+    if path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise CatalogError('Arquivos YAML precisam do PyYAML: pip install pyyaml')
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if not isinstance(data, dict) or not isinstance(data.get('cenarios'), list):
+        raise CatalogError(f'{path}: esperado {{"versao": N, "cenarios": [...]}}')
+
+    ruleset = None
+    if data.get('ruleset'):
+        ruleset = Ruleset.objects.filter(nome=data['ruleset']).first()
+        if ruleset is None:
+            raise CatalogError(f"{path}: ruleset desconhecido: {data['ruleset']}")
+    return int(data.get('versao', 0)), ruleset, validate(data['cenarios'], ruleset)
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _impact_vector(record, rules):
+    """Vetor plano de impactos a partir da forma legível ou do próprio vetor"""
+    impactos = record['impactos']
+    if isinstance(impactos, dict):
+        if set(impactos) != set(IMPACT_KEYS):
+            raise CatalogError(f"Cenário {record['codigo']}: 'impactos' precisa de {list(IMPACT_KEYS)}")
+        parts = [impactos[key] for key in IMPACT_KEYS]
+        if any(not isinstance(part, list) or len(part) != len(rules.indicadores) for part in parts):
+            raise CatalogError(
+                f"Cenário {record['codigo']}: um impacto por indicador ({len(rules.indicadores)}) em cada opção"
+            )
+        impactos = [v for part in parts for v in part]
+
+    if not isinstance(impactos, list) or len(impactos) != rules.vector_size or not all(map(_is_int, impactos)):
+        raise CatalogError(
+            f"Cenário {record['codigo']}: 'impactos' deve ter {len(OUTCOMES)} x {len(rules.indicadores)} inteiros"
+        )
+    return impactos
+
+
+def validate(records, ruleset=None):
+    rules = ruleset.compile() if ruleset is not None else DEFAULT_RULES
+    seen = set()
+    clean = []
+    for i, record in enumerate(records, start=1):
+        unknown = set(record) - set(FILE_FIELDS)
+        if unknown:
+            raise CatalogError(f'Cenário {i}: campos desconhecidos {sorted(unknown)}')
+        missing = [name for name in REQUIRED_FIELDS if record.get(name) is None]
+        if missing:
+            raise CatalogError(f'Cenário {i}: faltam os campos {missing}')
+        for name in INT_FIELDS:
+            if not _is_int(record[name]):
+                raise CatalogError(f"Cenário {record['codigo']}: '{name}' deve ser inteiro")
+        if record['codigo'] in seen:
+            raise CatalogError(f"Código duplicado: {record['codigo']}")
+        seen.add(record['codigo'])
+        row = {name: record.get(name) for name in FILE_FIELDS}
+        row['impactos'] = _impact_vector(record, rules)
+        row['ruleset_id'] = ruleset.pk if ruleset is not None else None
+        clean.append(row)
+    return clean
+
+
+def content_hash(records):
+    canonical = json.dumps(
+        sorted(records, key=lambda r: r['codigo']),
+        ensure_ascii=False, sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def sync_catalog(records, versao=0, fonte='', force=False, ruleset=None):
+    """Grava no banco os cenários novos ou alterados, numa transação só"""
+    digest = content_hash(records)
+
+    with transaction.atomic():
+        meta, _ = CatalogMeta.objects.select_for_update().get_or_create(nome=catalog_name(ruleset))
+        if meta.hash == digest and not force:
+            return SyncResult(meta.versao, digest, 0, 0, len(records), True)
+
+        existing = {
+            row['codigo']: row
+            for row in Scenario.objects.order_by().values(*SCENARIO_FIELDS)
+        }
+        changed = [r for r in records if existing.get(r['codigo']) != r]
+        created = sum(1 for r in changed if r['codigo'] not in existing)
+
+        if changed:
+            Scenario.objects.bulk_create(
+                [Scenario(**r) for r in changed],
+                update_conflicts=True,
+                unique_fields=['codigo'],
+                update_fields=[name for name in SCENARIO_FIELDS if name != 'codigo'],
+            )
+
+        meta.versao = versao
+        meta.hash = digest
+        meta.fonte = str(fonte)
+        if meta.nome == CATALOG_NAME:
+            meta.revisao = uuid.uuid4().hex
+            meta.save()
+            _forget_version()
+        else:
+            # A revisão que invalida os processos fica sempre no catálogo padrão
+            meta.save()
+            bump_catalog_version()
+
+    return SyncResult(versao, digest, created, len(changed) - created, len(records) - len(changed), False)
+
+
+# ====== Catálogo em memória ======
+
+class ScenarioCatalog:
+    """
+    Foto imutável dos cenários, indexada por id, codigo, par e tema, e dos
+    rulesets compilados. ids e os índices por ruleset só trazem cenários
+    com o vetor de impactos do tamanho certo
+    """
+
+    def __init__(self, scenarios, rulesets, version):
+        self.version = version
+        self.rulesets = {r.pk: r.compile() for r in rulesets}
+        self.ruleset_ids = {r.nome: r.pk for r in rulesets}
+        self.by_id = {s.id: s for s in scenarios}
+        self.by_codigo = {s.codigo: s for s in scenarios}
+        self.by_par = {}
+        self.by_tema = {}
+        for s in scenarios:
+            self.by_par.setdefault(s.par, []).append(s)
+            self.by_tema.setdefault(s.tema, []).append(s)
+
+        self.impacts = {}
+        self.pontos = {}
+        by_ruleset = {}
+        for s in scenarios:
+            rules = self.rules(s.ruleset_id)
+            if len(s.impactos) != rules.vector_size:
+                continue
+            impacts = ScenarioImpacts.from_model(s)
+            self.impacts[s.id] = impacts
+            # Pontos por (papel, voto, resultado): ver engine.points_table
+            self.pontos[s.id] = points_table(impacts, rules)
+            by_ruleset.setdefault(s.ruleset_id, []).append(s.id)
+        self.ids_by_ruleset = {key: sorted(ids) for key, ids in by_ruleset.items()}
+        self.ids = self.ids_by_ruleset.get(None, [])
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def get(self, scenario_id):
+        return self.by_id.get(scenario_id)
+
+    def rules(self, ruleset_id=None):
+        """Regras compiladas do ruleset (None = padrão do motor)"""
+        if ruleset_id is None:
+            return DEFAULT_RULES
+        return self.rulesets[ruleset_id]
+
+    def ids_for(self, ruleset_id=None):
+        return self.ids_by_ruleset.get(ruleset_id, [])
+
+    def impacts_for(self, ruleset_id=None):
+        """ScenarioImpacts dos cenários do ruleset, para simulação e solver"""
+        return [self.impacts[i] for i in self.ids_for(ruleset_id)]
+
+    def ruleset_id(self, nome):
+        """Id do ruleset pelo nome (None para o padrão); KeyError se não existe"""
+        if nome in (None, '', DEFAULT_RULES.nome):
+            return None
+        return self.ruleset_ids[nome]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def _forget_version():
+    cache.delete(CATALOG_VERSION_KEY)
+    transaction.on_commit(lambda: cache.delete(CATALOG_VERSION_KEY))
+
+
+def bump_catalog_version(reset_hash=False):
+    """
+    Marca o catálogo como alterado. Com reset_hash a próxima carga do
+    arquivo compara tudo de novo (o banco deixou de bater com o arquivo)
+    """
+    fields = {'revisao': uuid.uuid4().hex}
+    if reset_hash:
+        fields['hash'] = ''
+        CatalogMeta.objects.filter(nome__startswith=f'{CATALOG_NAME}:').update(hash='')
+    if not CatalogMeta.objects.filter(nome=CATALOG_NAME).update(**fields):
+        CatalogMeta.objects.create(nome=CATALOG_NAME, **fields)
+    _forget_version()
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = (
+            CatalogMeta.objects.filter(nome=CATALOG_NAME)
+            .values_list('revisao', flat=True).first()
+        ) or ''
+        cache.set(CATALOG_VERSION_KEY, version, CATALOG_VERSION_TTL)
+    return version
+
+
+def get_catalog():
+    """Catálogo do processo; sem consultas enquanto a revisão não muda"""
+    global _catalog
+    version = catalog_version()
+    catalog = _catalog
+    if catalog is None or catalog.version != version:
+        with _catalog_lock:
+            if _catalog is None or _catalog.version != version:
+                _catalog = ScenarioCatalog(list(Scenario.objects.all()), list(Ruleset.objects.all()), version)
+            catalog = _catalog
+    return catalog
+
+
+async def aget_catalog():
+    """get_catalog() para views assíncronas: só vai a uma thread se precisar recarregar"""
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    catalog = _catalog
+    if version is not None and catalog is not None and catalog.version == version:
+        return catalog
+    return await sync_to_async(get_catalog)()
+
+
+def scenario_changed(sender, **kwargs):
+    bump_catalog_version(reset_hash=True)
+
+
+def ruleset_changed(sender, **kwargs):
+    bump_catalog_version()
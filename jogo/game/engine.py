@@ -0,0 +1,247 @@
+"""
+Regras do jogo em Python puro, sem acesso ao banco.
+
+O estado é um NamedTuple imutável e os indicadores são sempre tuplas na
+ordem de INDICATORS. resolve_round() aplica uma rodada e devolve o novo
+estado, sem efeitos colaterais: a view só persiste o resultado, e
+simulações/bots podem chamar o motor diretamente.
+
+Indicadores, papéis, limites e rodadas vêm de um Rules: a compilação de
+um Ruleset (models) com as tabelas derivadas já calculadas. As funções
+recebem rules e usam DEFAULT_RULES, montado com as constantes abaixo,
+quando nenhum é passado.
+"""
+from typing import NamedTuple
+
+INDICATORS = ('estabilidade', 'seguranca', 'economia', 'liberdade')
+
+ROLE_INTEREST = {
+    'Presidente': 'estabilidade',
+    'Lider Militar': 'seguranca',
+    'Lider Politico': 'economia',
+    'Lider da População': 'liberdade',
+}
+
+DEFAULT_PLAYERS = [
+    ('Presidente', 'Presidente'),
+    ('Lider Militar', 'Lider Militar'),
+    ('Lider Politico', 'Lider Politico'),
+    ('Lider da População', 'Lider da População'),
+]
+
+MAX_ROUNDS = 8
+INITIAL_VALUE = 5
+MIN_VALUE = 1
+MAX_VALUE = 8
+COLLAPSE_VALUE = 1
+COLLECTIVE_BAND = (3, 5)
+
+# Opções vencedoras, na mesma ordem dos impactos em ScenarioImpacts
+OPTION_A = 'A'
+OPTION_B = 'B'
+OPTION_TIE = 'E'
+OUTCOMES = (OPTION_A, OPTION_B, OPTION_TIE)
+
+# Tabela de pontos (points_table): tupla plana por (papel, voto, resultado),
+# com os papéis na ordem do ruleset
+VOTES = (OPTION_A, OPTION_B)
+VOTE_OFFSET = {voto: i * len(OUTCOMES) for i, voto in enumerate(VOTES)}
+OUTCOME_OFFSET = {opcao: i for i, opcao in enumerate(OUTCOMES)}
+
+INDICATOR_LABELS = {
+    'estabilidade': '🏛️ Estabilidade',
+    'seguranca': '🛡️ Segurança',
+    'economia': '💰 Economia',
+    'liberdade': '🗽 Liberdade',
+}
+
+
+class State(NamedTuple):
+    indicadores: tuple
+    rodada: int = 1
+    active: bool = True
+
+
+class Rules:
+    """
+    Regras compiladas de um ruleset. papeis é uma sequência de pares
+    (papel, indicador de interesse), na ordem dos jogadores da sala
+    """
+
+    def __init__(self, indicadores, papeis, rodadas=MAX_ROUNDS, iniciais=None, minimo=MIN_VALUE,
+                 maximo=MAX_VALUE, colapso=COLLAPSE_VALUE, faixa=COLLECTIVE_BAND, nome='padrao', rotulos=None):
+        self.nome = nome
+        self.indicadores = tuple(indicadores)
+        self.interesse = dict(papeis)
+        self.papeis = tuple(self.interesse)
+        self.rodadas = rodadas
+        self.minimo = minimo
+        self.maximo = maximo
+        self.colapso = colapso
+        self.faixa = tuple(faixa)
+        self.iniciais = tuple(iniciais) if iniciais is not None else (INITIAL_VALUE,) * len(self.indicadores)
+
+        if not self.indicadores or not self.papeis:
+            raise ValueError('O ruleset precisa de indicadores e papéis')
+        if rodadas < 1:
+            raise ValueError('O ruleset precisa de ao menos uma rodada')
+        unknown = set(self.interesse.values()) - set(self.indicadores)
+        if unknown:
+            raise ValueError(f'Indicadores de interesse desconhecidos: {sorted(unknown)}')
+        if len(self.iniciais) != len(self.indicadores):
+            raise ValueError('Um valor inicial por indicador')
+        if not all(minimo <= v <= maximo for v in self.iniciais) or not minimo <= self.faixa[0] <= self.faixa[1] <= maximo:
+            raise ValueError(f'Valores iniciais e faixa coletiva devem ficar em {minimo}..{maximo}')
+
+        # Tabelas derivadas, usadas direto no caminho quente
+        self.jogadores = [(papel, papel) for papel in self.papeis]
+        self.role_index = {papel: self.indicadores.index(ind) for papel, ind in self.interesse.items()}
+        self.role_offset = {papel: i * len(VOTES) * len(OUTCOMES) for i, papel in enumerate(self.papeis)}
+        self.outcomes = OUTCOMES if len(self.papeis) % 2 == 0 else OUTCOMES[:2]
+        self.vector_size = len(OUTCOMES) * len(self.indicadores)
+        self.initial = State(self.iniciais)
+        rotulos = rotulos or {}
+        self.rotulos = {name: rotulos.get(name) or INDICATOR_LABELS.get(name) or name.capitalize()
+                        for name in self.indicadores}
+
+    def __repr__(self):
+        return f'<Rules {self.nome}: {len(self.indicadores)} indicadores, {len(self.papeis)} papéis>'
+
+    def named(self, indicadores):
+        """Indicadores (ou impactos) em dict, pelo nome"""
+        return dict(zip(self.indicadores, indicadores))
+
+
+DEFAULT_RULES = Rules(INDICATORS, ROLE_INTEREST.items())
+
+
+class ScenarioImpacts(NamedTuple):
+    """Impactos de um cenário: uma tupla de indicadores por opção"""
+    id: int
+    sim: tuple
+    nao: tuple
+    empate: tuple
+
+    @classmethod
+    def from_vector(cls, scenario_id, vector):
+        """Vetor plano de impactos: os de A, depois os de B e os do empate"""
+        n = len(vector) // len(OUTCOMES)
+        return cls(scenario_id, tuple(vector[:n]), tuple(vector[n:2 * n]), tuple(vector[2 * n:3 * n]))
+
+    @classmethod
+    def from_model(cls, scenario):
+        """Lê o vetor impactos de um Scenario (ou objeto equivalente)"""
+        return cls.from_vector(scenario.id, scenario.impactos)
+
+    def impact(self, opcao):
+        """Impacto da opção vencedora ('A', 'B' ou 'E')"""
+        return self[1 + OUTCOMES.index(opcao)]
+
+
+class RoundResult(NamedTuple):
+    state: State
+    opcao_vencedora: str
+    impacto: tuple
+    votos_a: int
+    votos_b: int
+    # papel -> escolha alinhada com o interesse do papel
+    alinhados: dict
+    ponto_coletivo: bool
+    colapso: bool
+
+
+def initial_state(rules=DEFAULT_RULES):
+    return rules.initial
+
+
+def winning_option(votos_a, votos_b):
+    if votos_a > votos_b:
+        return OPTION_A
+    if votos_b > votos_a:
+        return OPTION_B
+    return OPTION_TIE
+
+
+def apply_impact(indicadores, impacto, rules=DEFAULT_RULES):
+    lo, hi = rules.minimo, rules.maximo
+    return tuple([
+        lo if v + d < lo else hi if v + d > hi else v + d
+        for v, d in zip(indicadores, impacto)
+    ])
+
+
+def is_aligned(scenario, papel, escolha, opcao_vencedora, rules=DEFAULT_RULES):
+    """
+    A escolha pontua se a opção escolhida venceu (ou houve empate) e ela
+    beneficia o indicador de interesse do papel
+    """
+    if escolha != opcao_vencedora and opcao_vencedora != OPTION_TIE:
+        return False
+    return scenario.impact(escolha)[rules.role_index[papel]] > 0
+
+
+def points_table(scenario, rules=DEFAULT_RULES):
+    """
+    Pontos individuais do cenário para cada (papel, voto, resultado), pela
+    regra de is_aligned(). A posição de um trio é point_index(); calcula-se
+    uma vez por cenário e a pontuação da rodada vira uma leitura indexada
+    """
+    return tuple(
+        int(is_aligned(scenario, papel, voto, resultado, rules))
+        for papel in rules.papeis
+        for voto in VOTES
+        for resultado in OUTCOMES
+    )
+
+
+def point_index(papel, voto, resultado, rules=DEFAULT_RULES):
+    return rules.role_offset[papel] + VOTE_OFFSET[voto] + OUTCOME_OFFSET[resultado]
+
+
+def in_collective_band(indicadores, rules=DEFAULT_RULES):
+    lo, hi = rules.faixa
+    return lo <= min(indicadores) and max(indicadores) <= hi
+
+
+def is_collapsed(indicadores, rules=DEFAULT_RULES):
+    return rules.colapso in indicadores
+
+
+def resolve_round(state, scenario, votes, pontos=None, rules=DEFAULT_RULES):
+    """
+    Resolve uma rodada.
+
+    votes mapeia papel -> 'A' ou 'B'. pontos é a points_table() do cenário
+    (calculada aqui se não vier pronta). Em caso de colapso o jogo termina
+    na própria rodada; caso contrário a rodada avança e o jogo termina
+    depois de rules.rodadas rodadas.
+    """
+    escolhas = list(votes.values())
+    votos_a = escolhas.count(OPTION_A)
+    votos_b = escolhas.count(OPTION_B)
+    opcao_vencedora = winning_option(votos_a, votos_b)
+    impacto = scenario.impact(opcao_vencedora)
+
+    if pontos is None:
+        pontos = points_table(scenario, rules)
+    resultado = OUTCOME_OFFSET[opcao_vencedora]
+    role_offset = rules.role_offset
+    alinhados = {
+        papel: pontos[role_offset[papel] + VOTE_OFFSET[escolha] + resultado] > 0
+        for papel, escolha in votes.items()
+    }
+
+    indicadores = apply_impact(state.indicadores, impacto, rules)
+    ponto_coletivo = in_collective_band(indicadores, rules)
+    colapso = rules.colapso in indicadores
+
+    if colapso:
+        new_state = State(indicadores, state.rodada, False)
+    else:
+        rodada = state.rodada + 1
+        new_state = State(indicadores, rodada, rodada <= rules.rodadas)
+
+    return RoundResult(
+        new_state, opcao_vencedora, impacto, votos_a, votos_b,
+        alinhados, ponto_coletivo, colapso,
+    )
@@ -0,0 +1,161 @@
+"""
+Log de eventos da sala (GameEvent) e snapshots periódicos (GameSnapshot).
+
+Cada gravação do estado acrescenta seus eventos ao log: INICIO (criação
+ou reset), VOTO (voto do celular ainda sem apuração), RODADA (resultado
+completo da apuração) e FIM. O seq do evento é reservado no mesmo UPDATE
+com compare-and-swap do GameState (campo ultimo_evento), então duas
+submissões concorrentes nunca disputam o mesmo número.
+
+O GameState continua sendo a leitura rápida da sala; o log é a fonte
+para auditoria e replay. O estado de qualquer sala sai do último
+snapshot mais a cauda de eventos depois dele (no máximo SNAPSHOT_EVERY).
+Os eventos guardam o resultado de cada rodada, não só os votos, então
+reaplicar não depende do catálogo de cenários atual.
+"""
+import copy
+
+from .models import GameEvent, GameSnapshot
+
+# Um snapshot a cada K eventos
+SNAPSHOT_EVERY = 10
+
+
+class EventLogError(ValueError):
+    pass
+
+
+def started(game, players, indicadores):
+    return (GameEvent.INICIO, {
+        'seed': game.seed,
+        'deck': list(game.deck),
+        'indicadores': list(indicadores),
+        'jogadores': [p.papel for p in players],
+    })
+
+
+def vote_cast(papel, escolha):
+    return (GameEvent.VOTO, {'papel': papel, 'escolha': escolha})
+
+
+def round_resolved(numero, scenario_id, choices, result):
+    return (GameEvent.RODADA, {
+        'numero': numero,
+        'cenario': scenario_id,
+        'votos': dict(choices),
+        'votos_a': result.votos_a,
+        'votos_b': result.votos_b,
+        'opcao': result.opcao_vencedora,
+        'indicadores': list(result.state.indicadores),
+        'rodada': result.state.rodada,
+        'ativo': result.state.active,
+        'alinhados': sorted(papel for papel, aligned in result.alinhados.items() if aligned),
+        'ponto_coletivo': result.ponto_coletivo,
+    })
+
+
+def ended(numero, colapso):
+    return (GameEvent.FIM, {
+        'status': 'INTERROMPIDO' if colapso else 'COMPLETO',
+        'rodadas': numero,
+    })
+
+
+def apply_event(state, tipo, dados):
+    """Aplica um evento ao estado (dict do live_state). Altera state no lugar"""
+    if tipo == GameEvent.INICIO:
+        return {
+            'rodada': 1,
+            'ativo': True,
+            'indicadores': list(dados['indicadores']),
+            'consensos': 0,
+            'empates': 0,
+            'votos': {},
+            'pontuacoes': {papel: [0, 0] for papel in dados['jogadores']},
+        }
+
+    if state is None:
+        raise EventLogError(f'Evento {tipo} antes do início da partida')
+
+    if tipo == GameEvent.VOTO:
+        state['votos'][dados['papel']] = dados['escolha']
+    elif tipo == GameEvent.RODADA:
+        state['rodada'] = dados['rodada']
+        state['ativo'] = dados['ativo']
+        state['indicadores'] = list(dados['indicadores'])
+        state['votos'] = {}
+        if dados['votos_a'] == 0 or dados['votos_b'] == 0:
+            state['consensos'] += 1
+        elif dados['votos_a'] == dados['votos_b']:
+            state['empates'] += 1
+        for papel in dados['alinhados']:
+            state['pontuacoes'][papel][0] += 1
+        if dados['ponto_coletivo']:
+            for pontos in state['pontuacoes'].values():
+                pontos[1] += 1
+    elif tipo == GameEvent.FIM:
+        state['ativo'] = False
+    else:
+        raise EventLogError(f'Tipo de evento desconhecido: {tipo}')
+    return state
+
+
+def fold(events, state=None):
+    """Reaplica uma sequência de (tipo, dados) a partir de state (não alterado)"""
+    state = copy.deepcopy(state)
+    for tipo, dados in events:
+        state = apply_event(state, tipo, dados)
+    return state
+
+
+def live_state(gs, players):
+    """O estado atual da sala no mesmo formato do fold (é o que vai no snapshot)"""
+    return {
+        'rodada': gs.rodada_atual,
+        'ativo': gs.active,
+        'indicadores': list(gs.indicadores),
+        'consensos': gs.total_consensos,
+        'empates': gs.total_empates,
+        'votos': dict(gs.votos_pendentes),
+        'pontuacoes': {p.papel: [p.pontuacao_individual, p.pontuacao_coletiva] for p in players},
+    }
+
+
+def append(gs, players, pending):
+    """
+    Grava os eventos pendentes com os seqs já reservados em
+    gs.ultimo_evento (ver views._save_state) e, ao cruzar um múltiplo de
+    SNAPSHOT_EVERY, o snapshot do estado atual. Deve rodar na mesma
+    transação da gravação do estado
+    """
+    last = gs.ultimo_evento
+    first = last - len(pending) + 1
+    GameEvent.objects.bulk_create([
+        GameEvent(game=gs.game, seq=first + i, tipo=tipo, dados=dados)
+        for i, (tipo, dados) in enumerate(pending)
+    ])
+    if last // SNAPSHOT_EVERY > (first - 1) // SNAPSHOT_EVERY:
+        GameSnapshot.objects.create(game=gs.game, seq=last, estado=live_state(gs, players))
+
+
+def rebuild_state(game):
+    """Estado da sala a partir do último snapshot e da cauda do log (duas consultas)"""
+    snapshot = (
+        GameSnapshot.objects.filter(game=game)
+        .order_by('-seq').values_list('seq', 'estado').first()
+    )
+    seq, state = snapshot or (0, None)
+    tail = (
+        GameEvent.objects.filter(game=game, seq__gt=seq)
+        .order_by('seq').values_list('tipo', 'dados')
+    )
+    return fold(tail, state)
+
+
+def history(game):
+    """(seq, tipo, dados, estado depois do evento) de todo o log da sala, para auditoria"""
+    state = None
+    events = GameEvent.objects.filter(game=game).order_by('seq').values_list('seq', 'tipo', 'dados')
+    for seq, tipo, dados in events.iterator():
+        state = apply_event(state, tipo, dados)
+        yield seq, tipo, dados, copy.deepcopy(state)
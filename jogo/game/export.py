@@ -0,0 +1,218 @@
+"""
+Exportação em streaming de sessões, rodadas e escolhas.
+
+As linhas saem de .values_list(...).iterator(chunk_size=...) e são
+codificadas (CSV ou NDJSON, com gzip opcional) aos pedaços, então a
+memória usada não depende do tamanho das tabelas.
+
+Rodadas e escolhas de partidas encerradas saem das tabelas e ficam no
+histórico da sessão (game.archive); o dataset archived_choices
+decodifica esses blobs um a um.
+"""
+import csv
+import json
+import zlib
+from datetime import date, datetime
+
+from django.utils.dateparse import parse_date
+
+from .archive import SessionHistory
+from .models import Choice, GameSession, Round
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Tamanho aproximado de cada pedaço enviado ao cliente
+BUFFER_SIZE = 64 * 1024
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# dataset -> (model, campo de data, [(coluna, campo do values_list)])
+DATASETS = {
+    'sessions': (GameSession, 'criado_em', [
+        ('id', 'id'),
+        ('nome_sessao', 'nome_sessao'),
+        ('tipo_comunicacao', 'tipo_comunicacao'),
+        ('status', 'status'),
+        ('rounds_completados', 'rounds_completados'),
+        ('ruleset', 'ruleset__nome'),
+        ('indicadores_finais', 'indicadores_finais'),
+        ('pontuacoes_individuais', 'pontuacoes_individuais'),
+        ('pontuacoes_coletivas', 'pontuacoes_coletivas'),
+        ('total_consensos', 'total_consensos'),
+        ('total_empates', 'total_empates'),
+        ('criado_em', 'criado_em'),
+        ('observacoes', 'observacoes'),
+    ]),
+    'rounds': (Round, 'created_at', [
+        ('id', 'id'),
+        ('sala', 'game__codigo'),
+        ('numero', 'numero'),
+        ('cenario', 'scenario__codigo'),
+        ('votos_a', 'votos_a'),
+        ('votos_b', 'votos_b'),
+        ('opcao_vencedora', 'opcao_vencedora'),
+        ('created_at', 'created_at'),
+    ]),
+    'choices': (Choice, 'timestamp', [
+        ('id', 'id'),
+        ('round_id', 'round_id'),
+        ('sala', 'round__game__codigo'),
+        ('rodada', 'round__numero'),
+        ('papel', 'player__papel'),
+        ('escolha', 'escolha'),
+        ('alinhado', 'alinhado'),
+        ('impacto', 'impacto'),
+        ('pontos_ganhos', 'pontos_ganhos'),
+        ('timestamp', 'timestamp'),
+    ]),
+    # Lido como (id, historico) e expandido em ARCHIVE_COLUMNS por _archived_rows
+    'archived_choices': (GameSession, 'criado_em', [
+        ('session_id', 'id'),
+        ('historico', 'historico'),
+    ]),
+}
+
+ARCHIVE_DATASET = 'archived_choices'
+ARCHIVE_COLUMNS = [
+    'session_id', 'sala', 'rodada', 'cenario', 'opcao_vencedora', 'papel', 'escolha', 'alinhado', 'timestamp',
+]
+
+
+def parse_day(value):
+    """Data AAAA-MM-DD dos filtros, ou None se inválida (inclusive as que não existem, como 2024-02-30)"""
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+class ExportError(ValueError):
+    pass
+
+
+def columns(dataset):
+    if dataset == ARCHIVE_DATASET:
+        return ARCHIVE_COLUMNS
+    return [column for column, _ in DATASETS[dataset][2]]
+
+
+def export_queryset(dataset, since=None, until=None, tipo_comunicacao=None):
+    """values_list do dataset com os filtros de data (inclusivos) e de comunicação"""
+    if dataset not in DATASETS:
+        raise ExportError(f'Dataset desconhecido: {dataset}')
+
+    model, date_field, fields = DATASETS[dataset]
+    qs = model.objects.order_by('pk')
+    if since:
+        qs = qs.filter(**{f'{date_field}__date__gte': since})
+    if until:
+        qs = qs.filter(**{f'{date_field}__date__lte': until})
+    if tipo_comunicacao:
+        if dataset not in ('sessions', ARCHIVE_DATASET):
+            raise ExportError('O filtro de comunicação só vale para sessões')
+        qs = qs.filter(tipo_comunicacao=tipo_comunicacao)
+
+    return qs.values_list(*[field for _, field in fields])
+
+
+def _archived_rows(sessions):
+    for session_id, blob in sessions:
+        if blob is None:
+            continue
+        history = SessionHistory(blob)
+        for rnd in history.rounds():
+            for papel in history.papeis:
+                yield (
+                    session_id, history.sala, rnd.numero, rnd.cenario, rnd.opcao,
+                    papel, rnd.votos[papel], rnd.alinhados[papel], rnd.criado_em,
+                )
+
+
+def iter_rows(dataset, chunk_size=EXPORT_CHUNK_SIZE, **filters):
+    rows = export_queryset(dataset, **filters).iterator(chunk_size=chunk_size)
+    if dataset == ARCHIVE_DATASET:
+        return _archived_rows(rows)
+    return rows
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return _plain(value)
+
+
+class _Echo:
+    """Arquivo falso para o csv.writer: devolve a linha em vez de guardar"""
+
+    def write(self, value):
+        return value
+
+
+def encode_csv(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def encode_ndjson(header, rows):
+    for row in rows:
+        record = {column: _plain(value) for column, value in zip(header, row)}
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+ENCODERS = {
+    'csv': encode_csv,
+    'ndjson': encode_ndjson,
+}
+
+
+def _buffered(lines, size=BUFFER_SIZE):
+    """Junta as linhas em pedaços de ~size bytes"""
+    buffer = []
+    length = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        length += len(data)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 16 + 15: cabeçalho gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(dataset, fmt='csv', compress=False, chunk_size=EXPORT_CHUNK_SIZE, **filters):
+    """Gerador de bytes com o dataset codificado"""
+    if fmt not in ENCODERS:
+        raise ExportError(f'Formato desconhecido: {fmt}')
+
+    # Valida dataset e filtros antes de começar a responder
+    export_queryset(dataset, **filters)
+
+    rows = iter_rows(dataset, chunk_size=chunk_size, **filters)
+    chunks = _buffered(ENCODERS[fmt](columns(dataset), rows))
+    return _gzipped(chunks) if compress else chunks
+
+
+def filename(dataset, fmt, compress=False):
+    return f'{dataset}.{fmt}' + ('.gz' if compress else '')
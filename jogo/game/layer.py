@@ -0,0 +1,58 @@
+"""
+Camada de canais em memória, por processo (sem Redis).
+
+Cada conexão WebSocket assina o grupo da sua sala e recebe uma
+asyncio.Queue. publish() pode ser chamado de qualquer thread (inclusive
+das views síncronas): a entrega é agendada no event loop de cada
+assinante com call_soon_threadsafe.
+"""
+import asyncio
+import threading
+
+
+class RoomLayer:
+    def __init__(self, max_queue=32):
+        self.max_queue = max_queue
+        self._groups = {}  # sala -> {queue: loop}
+        self._lock = threading.Lock()
+
+    def subscribe(self, room):
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._groups.setdefault(room, {})[queue] = loop
+        return queue
+
+    def unsubscribe(self, room, queue):
+        with self._lock:
+            members = self._groups.get(room)
+            if members is None:
+                return
+            members.pop(queue, None)
+            if not members:
+                del self._groups[room]
+
+    def has_subscribers(self, room):
+        return room in self._groups
+
+    def publish(self, room, message):
+        with self._lock:
+            targets = list(self._groups.get(room, {}).items())
+
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # Loop já encerrado: a conexão morreu sem se desinscrever
+                self.unsubscribe(room, queue)
+
+    @staticmethod
+    def _deliver(queue, message):
+        # As mensagens são o estado completo da sala: para um cliente lento
+        # basta a mais recente, então a mais antiga é descartada
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+layer = RoomLayer()
@@ -0,0 +1,107 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SQLITE_PROFILES = ('dev', 'sqlite')
+
+# O benchmark recria e enche o banco: no postgres, só num banco descartável
+POSTGRES_BENCH_DB = 'POSTGRES_BENCH_DB'
+
+
+def select_profiles(requested, environ=os.environ):
+    """
+    Perfis a medir. postgres só entra pedido com --profile postgres, e
+    exige POSTGRES_BENCH_DB diferente do banco da aplicação (POSTGRES_DB)
+    """
+    profiles = list(requested or SQLITE_PROFILES)
+    if 'postgres' in profiles:
+        if importlib.util.find_spec('psycopg') is None:
+            raise CommandError('O perfil postgres precisa do psycopg: pip install "psycopg[binary,pool]"')
+        bench_db = environ.get(POSTGRES_BENCH_DB)
+        if not bench_db:
+            raise CommandError(f'O perfil postgres precisa de {POSTGRES_BENCH_DB} (um banco descartável)')
+        if bench_db == settings.DATABASE_PROFILES['postgres']['NAME']:
+            raise CommandError(f'{POSTGRES_BENCH_DB} não pode ser o banco da aplicação ({bench_db})')
+    return profiles
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara a vazão de escrita (rodadas concorrentes) dos perfis de banco '
+        '(GAME_DB_PROFILE), rodando benchmark_game em threads para cada um'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile',
+            action='append',
+            choices=sorted(settings.DATABASE_PROFILES),
+            help=f'Perfil; pode ser repetido (padrão: dev e sqlite; postgres só com {POSTGRES_BENCH_DB})',
+        )
+        parser.add_argument('--games', type=int, default=40, help='Partidas por perfil (padrão: 40)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Threads (padrão: 8)')
+        parser.add_argument('-o', '--output', default=None, help='Grava os resultados em JSON')
+
+    def handle(self, *args, **options):
+        profiles = select_profiles(options['profile'])
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for profile in profiles:
+                self.stderr.write(f'Perfil {profile}...')
+                results[profile] = self._run_profile(profile, Path(tmp), options)
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+
+        self.stdout.write(
+            f"{'perfil':<9} {'rodadas/s':>10} {'votos/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'erros':>6}"
+        )
+        for profile, result in results.items():
+            vote = result['requests']['vote']
+            self.stdout.write(
+                f"{profile:<9} {result['rounds_per_s']:>10.1f} {vote['rps']:>8.1f} "
+                f"{vote['p50_ms']:>8.1f} {vote['p99_ms']:>8.1f} {vote['errors']:>6}"
+            )
+
+    def _run_profile(self, profile, tmp, options):
+        env = {**os.environ, 'GAME_DB_PROFILE': profile, 'GAME_LOG_LEVEL': 'WARNING'}
+        if profile in SQLITE_PROFILES:
+            # Banco novo por perfil: o modo WAL fica gravado no arquivo
+            env['GAME_DB_NAME'] = str(tmp / f'{profile}.sqlite3')
+        elif profile == 'postgres':
+            env['POSTGRES_DB'] = os.environ[POSTGRES_BENCH_DB]
+
+        report = tmp / f'{profile}.json'
+        steps = [
+            ['migrate', '-v0'],
+            ['populate_scenarios'],
+            [
+                'benchmark_game', '--mode', 'threads',
+                '--games', str(options['games']),
+                '--concurrency', str(options['concurrency']),
+                '-o', str(report),
+            ],
+        ]
+        for step in steps:
+            completed = subprocess.run(
+                [sys.executable, 'manage.py', *step],
+                cwd=settings.BASE_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if completed.returncode:
+                raise CommandError(f'{profile}: manage.py {step[0]} falhou\n{completed.stderr}')
+
+        with open(report) as fh:
+            return json.load(fh)['results']['threads']
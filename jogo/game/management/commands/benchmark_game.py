@@ -0,0 +1,107 @@
+import json
+import logging
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from game.benchmark import run_games, run_games_threaded
+from game.engine import ScenarioImpacts
+from game.models import Game, GameSession, Scenario
+from game.simulation import POLICIES
+
+MODES = ('client', 'threads')
+
+
+class Command(BaseCommand):
+    help = 'Joga partidas completas pelas views (test client, em série e em threads) e grava um relatório JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=20, help='Partidas por modo (padrão: 20)')
+        parser.add_argument('--mode', action='append', choices=MODES, help='Modo; pode ser repetido (padrão: ambos)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Threads do modo threads (padrão: 8)')
+        parser.add_argument('--policy', choices=sorted(POLICIES), default='random', help='Política de votação')
+        parser.add_argument('--seed', type=int, default=0, help='Seed das políticas')
+        parser.add_argument('-o', '--output', default='benchmark-report.json', help='Arquivo do relatório')
+        parser.add_argument(
+            '--max-queries',
+            type=int,
+            default=None,
+            help='Falha se alguma votação passar deste número de consultas',
+        )
+        parser.add_argument('--keep', action='store_true', help='Mantém as salas e sessões criadas')
+
+    def handle(self, *args, **options):
+        scenarios = {s.id: ScenarioImpacts.from_model(s) for s in Scenario.objects.all()}
+        if not scenarios:
+            raise CommandError('Nenhum cenário cadastrado. Rode populate_scenarios antes.')
+
+        # A linha de log por requisição atrapalharia a medição (e a saída)
+        game_logger = logging.getLogger('game')
+        previous_level = game_logger.level
+        if options['verbosity'] < 2:
+            game_logger.setLevel(logging.WARNING)
+
+        policy = POLICIES[options['policy']]
+        codigos = []
+        results = {}
+        try:
+            for mode in options['mode'] or list(MODES):
+                if mode == 'client':
+                    recorder, elapsed = run_games(scenarios, policy, options['games'], seed=options['seed'])
+                else:
+                    recorder, elapsed = run_games_threaded(
+                        scenarios, policy, options['games'], options['concurrency'], seed=options['seed'],
+                    )
+                codigos.extend(recorder.codigos)
+                results[mode] = recorder.summary(elapsed)
+        finally:
+            game_logger.setLevel(previous_level)
+            if not options['keep']:
+                # Só as sessões das salas do benchmark: partidas reais de
+                # outros processos no mesmo banco ficam
+                GameSession.objects.filter(game__codigo__in=codigos).delete()
+                Game.objects.filter(codigo__in=codigos).delete()
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'config': {
+                'games': options['games'],
+                'concurrency': options['concurrency'],
+                'policy': options['policy'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as fh:
+            json.dump(report, fh, indent=2)
+
+        self._print_results(results)
+        self.stdout.write(f"Relatório gravado em {options['output']}")
+
+        if options['max_queries'] is not None:
+            worst = max(r['requests'].get('vote', {}).get('queries_max', 0) for r in results.values())
+            if worst > options['max_queries']:
+                raise CommandError(f"Votação com {worst} consultas (limite: {options['max_queries']})")
+
+    def _print_results(self, results):
+        for mode, result in results.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"\n{mode}: {result['games']} partidas, {result['rounds']} rodadas em {result['seconds']:.2f}s "
+                f"({result['rounds_per_s']:.1f} rodadas/s)"
+            ))
+            self.stdout.write(
+                f"  {'tipo':<7} {'n':>5} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'consultas':>10} {'erros':>6}"
+            )
+            for kind, r in result['requests'].items():
+                self.stdout.write(
+                    f"  {kind:<7} {r['requests']:>5} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} "
+                    f"{r['p99_ms']:>8.1f} {r['queries_mean']:>5.1f}/{r['queries_max']:<4} {r['errors']:>6}"
+                )
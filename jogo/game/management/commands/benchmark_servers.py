@@ -0,0 +1,108 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from game.benchmark import page_workload, run_load, state_workload, vote_workload, wait_for_port
+from game.models import Game, GameSession, Scenario
+from game.views import _create_game
+
+HOST = '127.0.0.1'
+
+SERVERS = ('wsgi', 'asgi')
+WORKLOADS = ('page', 'state', 'vote')
+
+
+def _server_command(kind, port):
+    if kind == 'wsgi':
+        # runserver serve o poc_game.wsgi.application (WSGI_APPLICATION), com threads
+        return [sys.executable, 'manage.py', 'runserver', '--noreload', '--skip-checks', f'{HOST}:{port}']
+    return [
+        sys.executable, '-m', 'uvicorn', 'poc_game.asgi:application',
+        '--host', HOST, '--port', str(port), '--log-level', 'warning', '--no-access-log',
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compara req/s e latência (p50/p99) da sala servida por WSGI e por ASGI (uvicorn)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', action='append', choices=SERVERS, help='Servidor; pode ser repetido (padrão: ambos)')
+        parser.add_argument('--workload', action='append', choices=WORKLOADS, help='Carga; pode ser repetida (padrão: todas)')
+        parser.add_argument('--requests', type=int, default=500, help='Requisições por carga (padrão: 500)')
+        parser.add_argument('--concurrency', type=int, default=16, help='Threads do gerador de carga (padrão: 16)')
+        parser.add_argument('--warmup', type=int, default=20, help='Requisições de aquecimento por carga')
+        parser.add_argument('--port', type=int, default=8765, help='Porta usada pelos servidores')
+        parser.add_argument('--json', action='store_true', help='Imprime o resultado em JSON')
+
+    def handle(self, *args, **options):
+        if not Scenario.objects.exists():
+            raise CommandError('Nenhum cenário cadastrado. Rode populate_scenarios antes.')
+
+        servers = options['server'] or list(SERVERS)
+        if 'asgi' in servers and importlib.util.find_spec('uvicorn') is None:
+            if options['server']:
+                raise CommandError('O servidor ASGI precisa do uvicorn: pip install "uvicorn[standard]"')
+            self.stderr.write('uvicorn não instalado: medindo só o WSGI')
+            servers.remove('asgi')
+
+        # Salas do benchmark: uma para as leituras e uma por thread para os votos
+        reader = _create_game()
+        voters = [_create_game() for _ in range(options['concurrency'])]
+        workloads = {
+            'page': page_workload(reader.codigo),
+            'state': state_workload(reader.codigo),
+            'vote': vote_workload([game.codigo for game in voters]),
+        }
+
+        results = {}
+        try:
+            for kind in servers:
+                results[kind] = self._bench_server(kind, workloads, options)
+        finally:
+            # Só as sessões das salas do benchmark: partidas reais de
+            # outros processos no mesmo banco ficam
+            rooms = [reader, *voters]
+            GameSession.objects.filter(game__in=rooms).delete()
+            Game.objects.filter(pk__in=[game.pk for game in rooms]).delete()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self._print_results(results)
+
+    def _bench_server(self, kind, workloads, options):
+        port = options['port']
+        env = {**os.environ, 'GAME_ASYNC_VIEWS': '1' if kind == 'asgi' else '0'}
+        process = subprocess.Popen(
+            _server_command(kind, port),
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            if not wait_for_port(HOST, port):
+                raise CommandError(f'O servidor {kind} não subiu na porta {port}')
+
+            results = {}
+            for name in options['workload'] or list(WORKLOADS):
+                step = workloads[name]
+                run_load(HOST, port, step, options['warmup'], options['concurrency'])
+                results[name] = run_load(HOST, port, step, options['requests'], options['concurrency'])
+            return results
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    def _print_results(self, results):
+        self.stdout.write(f"{'servidor':<8} {'carga':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'erros':>6}")
+        for kind, workloads in results.items():
+            for name, r in workloads.items():
+                self.stdout.write(
+                    f"{kind:<8} {name:<6} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>6}"
+                )
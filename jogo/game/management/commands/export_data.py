@@ -0,0 +1,51 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.export import DATASETS, ENCODERS, ExportError, parse_day, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Exporta sessões, rodadas, escolhas ou escolhas arquivadas em CSV/NDJSON, em streaming'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', choices=sorted(ENCODERS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help='Comprime a saída com gzip')
+        parser.add_argument('--output', '-o', help='Arquivo de saída (padrão: stdout)')
+        parser.add_argument('--since', help='Data inicial (AAAA-MM-DD, inclusiva)')
+        parser.add_argument('--until', help='Data final (AAAA-MM-DD, inclusiva)')
+        parser.add_argument('--tipo', choices=['SIM', 'NAO'], help='Tipo de comunicação (só sessões)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Linhas lidas por vez do banco')
+
+    def handle(self, *args, **options):
+        filters = {}
+        for key in ('since', 'until'):
+            if options[key]:
+                parsed = parse_day(options[key])
+                if parsed is None:
+                    raise CommandError(f'Data inválida em --{key}: {options[key]}')
+                filters[key] = parsed
+        if options['tipo']:
+            filters['tipo_comunicacao'] = options['tipo']
+
+        try:
+            chunks = stream_export(
+                options['dataset'],
+                options['format'],
+                compress=options['gzip'],
+                chunk_size=options['chunk_size'],
+                **filters,
+            )
+        except ExportError as exc:
+            raise CommandError(str(exc))
+
+        if options['output']:
+            with open(options['output'], 'wb') as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+        else:
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
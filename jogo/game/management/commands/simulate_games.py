@@ -0,0 +1,112 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.catalog import get_catalog
+from game.simulation import POLICIES, simulate
+from game.vectorized import simulate_vectorized
+
+
+class Command(BaseCommand):
+    help = 'Simula partidas completas (sem interface) para balancear os cenários'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--games',
+            type=int,
+            default=10_000,
+            help='Número de partidas por política (padrão: 10000)',
+        )
+        parser.add_argument(
+            '--policy',
+            action='append',
+            choices=sorted(POLICIES),
+            help='Política de votação; pode ser repetida (padrão: todas)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Número de processos (padrão: um por CPU)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10_000,
+            help='Partidas por lote enviado a cada processo',
+        )
+        parser.add_argument(
+            '--vectorized',
+            action='store_true',
+            help='Usa o simulador vetorizado com NumPy (lotes de --chunk-size partidas)',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed base das simulações')
+        parser.add_argument('--ruleset', default=None, help='Nome do ruleset (padrão: regras do motor)')
+        parser.add_argument('--json', action='store_true', help='Imprime o resultado em JSON')
+
+    def handle(self, *args, **options):
+        # Os cenários são lidos uma única vez e enviados aos processos
+        catalog = get_catalog()
+        try:
+            ruleset_id = catalog.ruleset_id(options['ruleset'])
+        except KeyError:
+            raise CommandError(f"Ruleset desconhecido: {options['ruleset']}")
+        rules = catalog.rules(ruleset_id)
+        scenarios = catalog.impacts_for(ruleset_id)
+        if not scenarios:
+            raise CommandError('Nenhum cenário cadastrado. Rode populate_scenarios antes.')
+
+        results = {}
+        for policy_name in options['policy'] or list(POLICIES):
+            started = time.perf_counter()
+            if options['vectorized']:
+                stats = self._simulate_vectorized(scenarios, policy_name, options, rules)
+            else:
+                stats = simulate(
+                    scenarios,
+                    policy_name,
+                    options['games'],
+                    seed=options['seed'],
+                    workers=options['workers'],
+                    chunk_size=options['chunk_size'],
+                    rules=rules,
+                )
+            elapsed = time.perf_counter() - started
+            summary = stats.summary()
+            summary['seconds'] = elapsed
+            results[policy_name] = summary
+
+            if not options['json']:
+                self._print_summary(policy_name, summary)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
+
+    def _simulate_vectorized(self, scenarios, policy_name, options, rules):
+        try:
+            return simulate_vectorized(
+                scenarios,
+                policy_name,
+                options['games'],
+                seed=options['seed'],
+                batch_size=options['chunk_size'],
+                rules=rules,
+            )
+        except ImportError as exc:
+            raise CommandError(str(exc))
+
+    def _print_summary(self, policy_name, summary):
+        self.stdout.write(self.style.SUCCESS(f'\n🎲 Política: {policy_name}'))
+        self.stdout.write(
+            f"  {summary['games']} partidas em {summary['seconds']:.2f}s "
+            f"({summary['games'] / max(summary['seconds'], 1e-9):,.0f} partidas/s)"
+        )
+        self.stdout.write(f"  Colapso: {summary['collapse_rate']:.1%} | Completas: {summary['completion_rate']:.1%}")
+        self.stdout.write(f"  Rodadas sobrevividas (média): {summary['mean_rounds']:.2f}")
+        self.stdout.write(f"  Consensos por rodada: {summary['consensus_rate']:.1%} | Empates: {summary['tie_rate']:.1%}")
+        self.stdout.write(f"  Pontuação coletiva (média): {summary['collective_mean']:.2f}")
+        self.stdout.write(f"    distribuição: {summary['collective_distribution']}")
+        self.stdout.write('  Pontuação individual (média):')
+        for papel, mean in summary['individual_mean'].items():
+            self.stdout.write(f'    {papel}: {mean:.2f} {summary["individual_distribution"][papel]}')
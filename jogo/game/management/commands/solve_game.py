@@ -0,0 +1,92 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.catalog import get_catalog
+from game.solver import OBJECTIVES, SAMPLING, Solver
+
+
+class Command(BaseCommand):
+    help = 'Calcula a chance de completar o jogo e a pontuação coletiva esperada com votação cooperativa ótima'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--objective',
+            choices=OBJECTIVES,
+            default='survival',
+            help='survival: completar o jogo antes de tudo; collective: maximizar a pontuação coletiva',
+        )
+        parser.add_argument(
+            '--exact',
+            action='store_true',
+            help='Sorteio sem reposição, como o baralho da sala (lento para catálogos grandes)',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=None,
+            help='Número de rodadas (padrão: as do ruleset)',
+        )
+        parser.add_argument('--ruleset', default=None, help='Nome do ruleset (padrão: regras do motor)')
+        parser.add_argument('--json', action='store_true', help='Imprime o resultado em JSON')
+
+    def handle(self, *args, **options):
+        catalog = get_catalog()
+        try:
+            ruleset_id = catalog.ruleset_id(options['ruleset'])
+        except KeyError:
+            raise CommandError(f"Ruleset desconhecido: {options['ruleset']}")
+        rules = catalog.rules(ruleset_id)
+        scenarios = catalog.impacts_for(ruleset_id)
+        if not scenarios:
+            raise CommandError('Nenhum cenário cadastrado. Rode populate_scenarios antes.')
+
+        started = time.perf_counter()
+        solver = Solver(
+            scenarios,
+            objective=options['objective'],
+            exact=options['exact'],
+            rounds=options['rounds'],
+            rules=rules,
+        )
+        solution = solver.solve()
+        elapsed = time.perf_counter() - started
+
+        result = {
+            'scenarios': len(scenarios),
+            'scenario_classes': len(solver.classes),
+            'objective': options['objective'],
+            'exact': options['exact'],
+            # A sala sorteia sem reposição; com reposição o resultado é uma aproximação
+            'sampling': SAMPLING[options['exact']],
+            'ruleset': rules.nome,
+            'rounds': solver.rounds,
+            'p_complete': solution.p_complete,
+            'p_collapse': solution.p_collapse,
+            'expected_collective': solution.expected_collective,
+            'states': solution.states,
+            'seconds': elapsed,
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+
+        self.stdout.write(
+            f"🧮 {result['scenarios']} cenários ({result['scenario_classes']} classes de impacto), "
+            f"{result['rounds']} rodadas, sorteio {'sem' if result['exact'] else 'com'} reposição"
+        )
+        self.stdout.write(f"  Completar o jogo: {solution.p_complete:.4%}")
+        self.stdout.write(f"  Colapso: {solution.p_collapse:.4%}")
+        self.stdout.write(f"  Pontuação coletiva esperada: {solution.expected_collective:.4f}")
+        self.stdout.write(f"  {solution.states} estados em {elapsed:.2f}s")
+        if not options['exact']:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ Aproximação: a sala sorteia o baralho sem reposição (--exact, viável só para catálogos pequenos)'
+            ))
+
+        if solution.p_complete == 0:
+            self.stdout.write(self.style.ERROR('❌ O jogo não pode ser completado nem com votação ótima!'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ O jogo pode ser completado'))
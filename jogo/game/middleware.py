@@ -0,0 +1,99 @@
+"""
+Uma linha de log por requisição (logger 'game.requests'), com sala,
+rodada, tempo total e quantidade/tempo das consultas ao banco.
+
+As consultas são medidas por um execute_wrapper instalado em toda conexão
+nova (sinal connection_created, ligado em GameConfig.ready). Ele soma num
+contador guardado em contextvar, então as consultas que as views
+assíncronas fazem em threads (sync_to_async) também entram na conta.
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger('game.requests')
+
+_current_stats = ContextVar('game_request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def query_timer(execute, sql, params, many, context):
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_timer(sender, connection, **kwargs):
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def annotate_request(request, **fields):
+    """Campos extras (sala, rodada...) para a linha de log da requisição"""
+    request.log_fields = {**getattr(request, 'log_fields', {}), **fields}
+
+
+def _log_request(request, response, started, stats):
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    fields = getattr(request, 'log_fields', {})
+    extra = {
+        'sala': fields.get('sala'),
+        'rodada': fields.get('rodada'),
+        'duration_ms': 1000 * (time.perf_counter() - started),
+        'queries': stats.queries,
+        'db_ms': 1000 * stats.db_time,
+    }
+    logger.info(
+        "%s %s %s sala=%s rodada=%s ms=%.1f queries=%d db_ms=%.1f",
+        request.method, request.path, response.status_code,
+        extra['sala'] or '-', extra['rodada'] or '-',
+        extra['duration_ms'], extra['queries'], extra['db_ms'],
+        extra=extra,
+    )
+
+
+@sync_and_async_middleware
+def request_timing_middleware(get_response):
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            stats = RequestStats()
+            token = _current_stats.set(stats)
+            started = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                _current_stats.reset(token)
+            _log_request(request, response, started, stats)
+            return response
+    else:
+        def middleware(request):
+            stats = RequestStats()
+            token = _current_stats.set(stats)
+            started = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                _current_stats.reset(token)
+            _log_request(request, response, started, stats)
+            return response
+
+    return middleware
@@ -0,0 +1,104 @@
+"""
+Salas (Game): estado, jogadores e rodadas passam a pertencer a uma sala.
+
+O banco de antes das salas tinha um jogo só; cada estado salvo vira uma
+sala, e jogadores e rodadas vão para a do primeiro estado (o que as views
+usavam, GameState.objects.first()).
+"""
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+import game.models
+
+
+def assign_games(apps, schema_editor):
+    Game = apps.get_model('game', 'Game')
+    GameState = apps.get_model('game', 'GameState')
+    Player = apps.get_model('game', 'Player')
+    Round = apps.get_model('game', 'Round')
+
+    states = list(GameState.objects.order_by('pk'))
+    for gs in states:
+        gs.game = Game.objects.create(codigo=game.models.generate_room_code())
+        gs.save(update_fields=['game'])
+
+    if Player.objects.exists() or Round.objects.exists():
+        first = states[0].game if states else Game.objects.create(codigo=game.models.generate_room_code())
+        Player.objects.update(game=first)
+        Round.objects.update(game=first)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(default=game.models.generate_room_code, max_length=12, unique=True, verbose_name='Código da Sala')),
+                ('criado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Criado em')),
+            ],
+            options={
+                'verbose_name': 'Sala',
+                'verbose_name_plural': 'Salas',
+                'ordering': ['-criado_em'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='player',
+            options={'ordering': ['id']},
+        ),
+        migrations.AlterModelOptions(
+            name='round',
+            options={'ordering': ['numero']},
+        ),
+        # Nulos até a cópia abaixo preencher as linhas que já existem
+        migrations.AddField(
+            model_name='gamestate',
+            name='game',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='state', to='game.game'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='game',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='players', to='game.game'),
+        ),
+        migrations.AddField(
+            model_name='round',
+            name='game',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rounds', to='game.game'),
+        ),
+        migrations.RunPython(assign_games, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='gamestate',
+            name='game',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='state', to='game.game'),
+        ),
+        migrations.AlterField(
+            model_name='player',
+            name='game',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='players', to='game.game'),
+        ),
+        migrations.AlterField(
+            model_name='round',
+            name='game',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rounds', to='game.game'),
+        ),
+        migrations.AddIndex(
+            model_name='gamestate',
+            index=models.Index(fields=['active', '-updated_at'], name='gamestate_ativos_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='player',
+            constraint=models.UniqueConstraint(fields=('game', 'papel'), name='unique_papel_por_sala'),
+        ),
+        migrations.AddConstraint(
+            model_name='round',
+            constraint=models.UniqueConstraint(fields=('game', 'numero'), name='unique_rodada_por_sala'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:27
+
+import game.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0002_games'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='deck',
+            field=models.JSONField(blank=True, default=list, verbose_name='Baralho de Cenários'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='seed',
+            field=models.BigIntegerField(default=game.models.generate_seed, verbose_name='Seed'),
+        ),
+    ]
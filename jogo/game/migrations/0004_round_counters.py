@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0003_game_deck'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamestate',
+            name='total_consensos',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gamestate',
+            name='total_empates',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='round',
+            name='opcao_vencedora',
+            field=models.CharField(blank=True, choices=[('A', 'A'), ('B', 'B'), ('E', 'Empate')], max_length=1),
+        ),
+        migrations.AddField(
+            model_name='round',
+            name='votos_a',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='round',
+            name='votos_b',
+            field=models.IntegerField(default=0),
+        ),
+    ]
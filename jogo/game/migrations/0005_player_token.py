@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+import game.models
+
+
+def fill_tokens(apps, schema_editor):
+    """Jogadores de salas já criadas ganham o token que os novos recebem no default"""
+    Player = apps.get_model('game', 'Player')
+    for player in Player.objects.filter(token__isnull=True).only('pk'):
+        player.token = game.models.generate_player_token()
+        player.save(update_fields=['token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0004_round_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamestate',
+            name='votos_pendentes',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        # Único só depois de cada jogador ter o seu: o default é avaliado uma
+        # vez só para as linhas que já existem
+        migrations.AddField(
+            model_name='player',
+            name='token',
+            field=models.CharField(editable=False, max_length=32, null=True),
+        ),
+        migrations.RunPython(fill_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='player',
+            name='token',
+            field=models.CharField(default=game.models.generate_player_token, editable=False, max_length=32, unique=True),
+        ),
+    ]
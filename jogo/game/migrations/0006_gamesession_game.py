@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0005_player_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='game',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='game.game', verbose_name='Sala'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0006_gamesession_game'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogMeta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=50, unique=True)),
+                ('versao', models.IntegerField(default=0)),
+                ('hash', models.CharField(blank=True, max_length=64)),
+                ('fonte', models.CharField(blank=True, max_length=255)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Versão do catálogo',
+                'verbose_name_plural': 'Versões do catálogo',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0007_catalogmeta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogmeta',
+            name='revisao',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
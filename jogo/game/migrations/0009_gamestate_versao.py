@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0008_catalogmeta_revisao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamestate',
+            name='versao',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0009_gamestate_versao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamestate',
+            name='ultimo_evento',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='GameEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('tipo', models.CharField(choices=[('INICIO', 'Partida iniciada'), ('VOTO', 'Voto registrado'), ('RODADA', 'Rodada resolvida'), ('FIM', 'Partida encerrada')], max_length=10)),
+                ('dados', models.JSONField(default=dict)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='game.game')),
+            ],
+            options={
+                'ordering': ['game', 'seq'],
+                'constraints': [models.UniqueConstraint(fields=('game', 'seq'), name='unique_evento_por_sala')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GameSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('estado', models.JSONField()),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='game.game')),
+            ],
+            options={
+                'ordering': ['game', 'seq'],
+                'constraints': [models.UniqueConstraint(fields=('game', 'seq'), name='unique_snapshot_por_sala')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0010_game_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='historico',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Histórico'),
+        ),
+    ]
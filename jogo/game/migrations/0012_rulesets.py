@@ -0,0 +1,147 @@
+"""
+Rulesets: indicadores em vetores JSON.
+
+Os valores das colunas antigas (um campo por indicador) são copiados para
+os campos JSON antes de elas serem removidas, na ordem de
+engine.INDICATORS, que é a do ruleset padrão.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+INDICATORS = ('estabilidade', 'seguranca', 'economia', 'liberdade')
+OUTCOMES = ('sim', 'nao', 'empate')
+FINAL_LABELS = {
+    'estabilidade': 'Estabilidade Final',
+    'seguranca': 'Segurança Final',
+    'economia': 'Economia Final',
+    'liberdade': 'Liberdade Final',
+}
+
+# (modelo, coluna, campo com default) das colunas que viram vetor
+OLD_COLUMNS = [
+    *[('gamesession', f'{name}_final', models.IntegerField(default=0, verbose_name=FINAL_LABELS[name]))
+      for name in INDICATORS],
+    *[('scenario', f'impacto_{opcao}_{name}', models.IntegerField(default=0))
+      for opcao in OUTCOMES for name in INDICATORS],
+]
+
+
+def copy_to_vectors(apps, schema_editor):
+    Scenario = apps.get_model('game', 'Scenario')
+    GameState = apps.get_model('game', 'GameState')
+    GameSession = apps.get_model('game', 'GameSession')
+
+    scenarios = list(Scenario.objects.all())
+    for s in scenarios:
+        s.impactos = [getattr(s, f'impacto_{opcao}_{name}') for opcao in OUTCOMES for name in INDICATORS]
+    Scenario.objects.bulk_update(scenarios, ['impactos'], batch_size=500)
+
+    states = list(GameState.objects.all())
+    for gs in states:
+        gs.indicadores = [getattr(gs, name) for name in INDICATORS]
+    GameState.objects.bulk_update(states, ['indicadores'], batch_size=500)
+
+    sessions = list(GameSession.objects.all())
+    for session in sessions:
+        session.indicadores_finais = {name: getattr(session, f'{name}_final') for name in INDICATORS}
+    GameSession.objects.bulk_update(sessions, ['indicadores_finais'], batch_size=500)
+
+
+def copy_to_columns(apps, schema_editor):
+    Scenario = apps.get_model('game', 'Scenario')
+    GameState = apps.get_model('game', 'GameState')
+    GameSession = apps.get_model('game', 'GameSession')
+    columns = [f'impacto_{opcao}_{name}' for opcao in OUTCOMES for name in INDICATORS]
+
+    # Só o ruleset padrão cabe nas colunas antigas
+    scenarios = list(Scenario.objects.filter(ruleset__isnull=True))
+    for s in scenarios:
+        for column, value in zip(columns, s.impactos):
+            setattr(s, column, value)
+    Scenario.objects.bulk_update(scenarios, columns, batch_size=500)
+
+    states = list(GameState.objects.filter(game__ruleset__isnull=True))
+    for gs in states:
+        for name, value in zip(INDICATORS, gs.indicadores):
+            setattr(gs, name, value)
+    GameState.objects.bulk_update(states, list(INDICATORS), batch_size=500)
+
+    sessions = list(GameSession.objects.filter(ruleset__isnull=True))
+    for session in sessions:
+        for name in INDICATORS:
+            setattr(session, f'{name}_final', session.indicadores_finais.get(name, 0))
+    GameSession.objects.bulk_update(sessions, [f'{name}_final' for name in INDICATORS], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0011_gamesession_historico'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ruleset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=50, unique=True)),
+                ('indicadores', models.JSONField(help_text='["estabilidade", "seguranca", ...]')),
+                ('papeis', models.JSONField(help_text='[["Presidente", "estabilidade"], ...]')),
+                ('iniciais', models.JSONField(help_text='Valor inicial de cada indicador, na mesma ordem')),
+                ('rotulos', models.JSONField(blank=True, default=dict, help_text='Nome exibido de cada indicador (opcional)')),
+                ('rodadas', models.PositiveSmallIntegerField(default=8)),
+                ('minimo', models.SmallIntegerField(default=1)),
+                ('maximo', models.SmallIntegerField(default=8)),
+                ('colapso', models.SmallIntegerField(default=1)),
+                ('faixa_min', models.SmallIntegerField(default=3)),
+                ('faixa_max', models.SmallIntegerField(default=5)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['nome'],
+            },
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='indicadores_finais',
+            field=models.JSONField(default=dict, verbose_name='Indicadores Finais'),
+        ),
+        migrations.AddField(
+            model_name='gamestate',
+            name='indicadores',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='scenario',
+            name='impactos',
+            field=models.JSONField(default=list),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='ruleset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='game.ruleset', verbose_name='Regras'),
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='ruleset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='game.ruleset', verbose_name='Regras'),
+        ),
+        migrations.AddField(
+            model_name='scenario',
+            name='ruleset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='scenarios', to='game.ruleset'),
+        ),
+        migrations.RunPython(copy_to_vectors, copy_to_columns),
+        # Default nas colunas antigas só para a volta (migrate game 0011)
+        # conseguir recriá-las com linhas na tabela
+        *[
+            migrations.AlterField(model_name=model_name, name=name, field=field)
+            for model_name, name, field in OLD_COLUMNS
+        ],
+        *[
+            migrations.RemoveField(model_name=model_name, name=name)
+            for model_name, name, _ in OLD_COLUMNS
+        ],
+        *[migrations.RemoveField(model_name='gamestate', name=name) for name in INDICATORS],
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0012_rulesets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='bot',
+            field=models.CharField(blank=True, choices=[('', 'Humano'), ('selfish', 'Bot egoísta'), ('cooperative', 'Bot cooperativo'), ('random', 'Bot aleatório'), ('lookahead', 'Bot estrategista')], default='', max_length=20),
+        ),
+    ]
@@ -1,13 +1,128 @@
+import secrets
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from . import engine
+
+# Sem caracteres ambíguos (0/O, 1/I) para facilitar ditar o código em voz alta
+ROOM_CODE_ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+ROOM_CODE_LENGTH = 6
+
+
+def generate_room_code():
+    return ''.join(secrets.choice(ROOM_CODE_ALPHABET) for _ in range(ROOM_CODE_LENGTH))
+
+
+def generate_seed():
+    return secrets.randbits(31)
+
+
+def generate_player_token():
+    return secrets.token_urlsafe(16)
+
+
+class Ruleset(models.Model):
+    """
+    Variante das regras: indicadores, papéis e seus interesses, limites,
+    rodadas e valores iniciais. Salas e cenários sem ruleset usam o padrão
+    do motor (engine.DEFAULT_RULES). Compilado uma vez por processo no
+    catálogo (game.catalog)
+    """
+    nome = models.CharField(max_length=50, unique=True)
+    indicadores = models.JSONField(help_text='["estabilidade", "seguranca", ...]')
+    # Pares [papel, indicador de interesse], na ordem dos jogadores da sala
+    papeis = models.JSONField(help_text='[["Presidente", "estabilidade"], ...]')
+    iniciais = models.JSONField(help_text='Valor inicial de cada indicador, na mesma ordem')
+    rotulos = models.JSONField(default=dict, blank=True, help_text='Nome exibido de cada indicador (opcional)')
+    rodadas = models.PositiveSmallIntegerField(default=engine.MAX_ROUNDS)
+    minimo = models.SmallIntegerField(default=engine.MIN_VALUE)
+    maximo = models.SmallIntegerField(default=engine.MAX_VALUE)
+    colapso = models.SmallIntegerField(default=engine.COLLAPSE_VALUE)
+    faixa_min = models.SmallIntegerField(default=engine.COLLECTIVE_BAND[0])
+    faixa_max = models.SmallIntegerField(default=engine.COLLECTIVE_BAND[1])
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['nome']
+
+    def __str__(self):
+        return self.nome
+
+    def compile(self):
+        return engine.Rules(
+            self.indicadores,
+            [tuple(pair) for pair in self.papeis],
+            rodadas=self.rodadas,
+            iniciais=self.iniciais,
+            minimo=self.minimo,
+            maximo=self.maximo,
+            colapso=self.colapso,
+            faixa=(self.faixa_min, self.faixa_max),
+            nome=self.nome,
+            rotulos=self.rotulos,
+        )
+
+    def clean(self):
+        try:
+            self.compile()
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(str(exc))
+
+
+class Game(models.Model):
+    """
+    Uma mesa (sala) de jogo. Estado, jogadores e rodadas ficam ligados a ela
+    """
+    codigo = models.CharField(
+        max_length=12,
+        unique=True,
+        default=generate_room_code,
+        verbose_name="Código da Sala"
+    )
+    criado_em = models.DateTimeField(default=timezone.now, verbose_name="Criado em")
+
+    # Baralho de cenários embaralhado no início da partida (ids de Scenario).
+    # O cenário da rodada N é deck[N - 1]; a mesma seed reproduz a mesma partida.
+    seed = models.BigIntegerField(default=generate_seed, verbose_name="Seed")
+    deck = models.JSONField(default=list, blank=True, verbose_name="Baralho de Cenários")
+    ruleset = models.ForeignKey(Ruleset, null=True, blank=True, on_delete=models.PROTECT, verbose_name="Regras")
+
+    class Meta:
+        verbose_name = "Sala"
+        verbose_name_plural = "Salas"
+        ordering = ['-criado_em']
+
+    def __str__(self):
+        return self.codigo
+
 
 class Player(models.Model):
+    # Estratégias de game.bots; vazio = jogador humano
+    BOT_CHOICES = [
+        ('', 'Humano'),
+        ('selfish', 'Bot egoísta'),
+        ('cooperative', 'Bot cooperativo'),
+        ('random', 'Bot aleatório'),
+        ('lookahead', 'Bot estrategista'),
+    ]
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='players')
     name = models.CharField(max_length=100)
     papel = models.CharField(max_length=100)  # ex: 'Presidente'
+    bot = models.CharField(max_length=20, choices=BOT_CHOICES, blank=True, default='')
+    # Vai no link e no WebSocket do celular do jogador; o id é sequencial e dá para adivinhar
+    token = models.CharField(max_length=32, unique=True, default=generate_player_token, editable=False)
     pontuacao_individual = models.IntegerField(default=0)
     pontuacao_coletiva = models.IntegerField(default=0)
 
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'papel'], name='unique_papel_por_sala'),
+        ]
+
     def __str__(self):
         return f"{self.papel}"
 
@@ -41,10 +156,15 @@ class GameSession(models.Model):
 
     # Resultados finais
     rounds_completados = models.IntegerField(verbose_name="Rounds Completados")
-    estabilidade_final = models.IntegerField(verbose_name="Estabilidade Final")
-    seguranca_final = models.IntegerField(verbose_name="Segurança Final")
-    economia_final = models.IntegerField(verbose_name="Economia Final")
-    liberdade_final = models.IntegerField(verbose_name="Liberdade Final")
+    # indicador -> valor final
+    indicadores_finais = models.JSONField(default=dict, verbose_name="Indicadores Finais")
+    ruleset = models.ForeignKey(
+        Ruleset, null=True, blank=True, on_delete=models.PROTECT, verbose_name="Regras"
+    )
+    # Sala em que a sessão foi jogada (a sessão sobrevive à sala)
+    game = models.ForeignKey(
+        Game, null=True, blank=True, on_delete=models.SET_NULL, related_name='sessions', verbose_name="Sala"
+    )
 
     # Estatísticas dos jogadores (JSON para simplicidade)
     pontuacoes_individuais = models.JSONField(verbose_name="Pontuações Individuais")
@@ -54,6 +174,9 @@ class GameSession(models.Model):
     total_consensos = models.IntegerField(default=0, verbose_name="Total de Consensos")
     total_empates = models.IntegerField(default=0, verbose_name="Total de Empates")
 
+    # Rodadas e escolhas da partida, comprimidas (ver game.archive)
+    historico = models.BinaryField(null=True, blank=True, editable=False, verbose_name="Histórico")
+
     # Metadata
     criado_em = models.DateTimeField(default=timezone.now, verbose_name="Criado em")
     observacoes = models.TextField(blank=True, verbose_name="Observações")
@@ -75,25 +198,14 @@ class Scenario(models.Model):
     contexto = models.TextField()
     dilema = models.TextField()
 
-    # impactos da opção SIM (A)
-    impacto_sim_estabilidade = models.IntegerField()
-    impacto_sim_seguranca = models.IntegerField()
-    impacto_sim_economia = models.IntegerField()
-    impacto_sim_liberdade = models.IntegerField()
-
-    # impactos da opção NÃO (B)
-    impacto_nao_estabilidade = models.IntegerField()
-    impacto_nao_seguranca = models.IntegerField()
-    impacto_nao_economia = models.IntegerField()
-    impacto_nao_liberdade = models.IntegerField()
-
-    # impactos do EMPATE
-    impacto_empate_estabilidade = models.IntegerField()
-    impacto_empate_seguranca = models.IntegerField()
-    impacto_empate_economia = models.IntegerField()
-    impacto_empate_liberdade = models.IntegerField()
+    # Vetor plano de impactos, na ordem dos indicadores do ruleset: os da
+    # opção SIM (A), depois os da NÃO (B) e os do EMPATE
+    impactos = models.JSONField()
 
     tema = models.CharField(max_length=200, blank=True, null=True)
+    ruleset = models.ForeignKey(
+        Ruleset, null=True, blank=True, on_delete=models.PROTECT, related_name='scenarios'
+    )
 
     class Meta:
         ordering = ["numero"]
@@ -101,23 +213,87 @@ class Scenario(models.Model):
     def __str__(self):
         return f"{self.codigo} - {self.titulo}"
 
+    def clean(self):
+        rules = self.ruleset.compile() if self.ruleset_id else engine.DEFAULT_RULES
+        if (not isinstance(self.impactos, list) or len(self.impactos) != rules.vector_size
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in self.impactos)):
+            raise ValidationError({
+                'impactos': f'Esperados {rules.vector_size} inteiros (3 opções x {len(rules.indicadores)} indicadores)'
+            })
+
+
+class CatalogMeta(models.Model):
+    """Versão do catálogo de cenários carregado no banco (populate_scenarios)"""
+    nome = models.CharField(max_length=50, unique=True)
+    versao = models.IntegerField(default=0)  # campo "versao" do arquivo de dados
+    hash = models.CharField(max_length=64, blank=True)  # sha256 do conteúdo carregado
+    fonte = models.CharField(max_length=255, blank=True)
+    # Muda a cada alteração dos cenários (carga ou admin): invalida o
+    # catálogo em memória dos processos (game.catalog.get_catalog)
+    revisao = models.CharField(max_length=32, blank=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Versão do catálogo"
+        verbose_name_plural = "Versões do catálogo"
+
+    def __str__(self):
+        return f"{self.nome} v{self.versao} ({self.hash[:12]})"
+
 
 class GameState(models.Model):
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, related_name='state')
     rodada_atual = models.IntegerField(default=1)
-    estabilidade = models.IntegerField(default=3)
-    seguranca = models.IntegerField(default=3)
-    economia = models.IntegerField(default=3)
-    liberdade = models.IntegerField(default=3)
+    # Valores dos indicadores, na ordem do ruleset da sala
+    indicadores = models.JSONField(default=list)
     active = models.BooleanField(default=True)  # se False => terminou
 
+    # Contadores mantidos a cada rodada resolvida (viram os totais da GameSession)
+    total_consensos = models.IntegerField(default=0)
+    total_empates = models.IntegerField(default=0)
+
+    # Votos já recebidos na rodada atual (papel -> 'A' | 'B'), usados quando
+    # cada jogador vota do próprio celular
+    votos_pendentes = models.JSONField(default=dict, blank=True)
+
+    # Incrementada a cada gravação; as escritas fazem compare-and-swap nela
+    # (ver views._save_state) e o formulário de votação a envia de volta
+    versao = models.PositiveIntegerField(default=0)
+
+    # seq do último GameEvent da sala; reservado no mesmo UPDATE do estado
+    ultimo_evento = models.PositiveIntegerField(default=0)
+
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['active', '-updated_at'], name='gamestate_ativos_idx'),
+        ]
+
 
 class Round(models.Model):
+    OPCAO_CHOICES = [
+        ('A', 'A'),
+        ('B', 'B'),
+        ('E', 'Empate'),
+    ]
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='rounds')
     numero = models.IntegerField()
     scenario = models.ForeignKey(Scenario, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Apuração da rodada
+    votos_a = models.IntegerField(default=0)
+    votos_b = models.IntegerField(default=0)
+    opcao_vencedora = models.CharField(max_length=1, choices=OPCAO_CHOICES, blank=True)
+
+    class Meta:
+        ordering = ['numero']
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'numero'], name='unique_rodada_por_sala'),
+        ]
+
 
 class Choice(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
@@ -126,4 +302,53 @@ class Choice(models.Model):
     alinhado = models.BooleanField(default=False)
     impacto = models.JSONField(null=True, blank=True)
     pontos_ganhos = models.IntegerField(default=0)
-    timestamp = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+
+class GameEvent(models.Model):
+    """
+    Log append-only da sala: nada aqui é alterado nem apagado no reset.
+    O estado de qualquer ponto sai da reaplicação dos eventos (game.events)
+    """
+    INICIO = 'INICIO'
+    VOTO = 'VOTO'
+    RODADA = 'RODADA'
+    FIM = 'FIM'
+    TIPO_CHOICES = [
+        (INICIO, 'Partida iniciada'),
+        (VOTO, 'Voto registrado'),
+        (RODADA, 'Rodada resolvida'),
+        (FIM, 'Partida encerrada'),
+    ]
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='events')
+    seq = models.PositiveIntegerField()  # sequência por sala, começa em 1
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES)
+    dados = models.JSONField(default=dict)
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['game', 'seq']
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'seq'], name='unique_evento_por_sala'),
+        ]
+
+    def __str__(self):
+        return f"{self.game} #{self.seq} {self.tipo}"
+
+
+class GameSnapshot(models.Model):
+    """Estado compacto da sala depois do evento seq (a cada SNAPSHOT_EVERY eventos)"""
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='snapshots')
+    seq = models.PositiveIntegerField()
+    estado = models.JSONField()
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['game', 'seq']
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'seq'], name='unique_snapshot_por_sala'),
+        ]
+
+    def __str__(self):
+        return f"{self.game} @{self.seq}"
@@ -0,0 +1,126 @@
+"""
+WebSocket das salas, servido direto pelo ASGI (poc_game/asgi.py).
+
+Cada conexão em /ws/game/<codigo>/ assina o grupo da sala na camada em
+memória (game.layer) e recebe o estado completo a cada mudança. A tela
+de um jogador conecta em /ws/game/<codigo>/<token>/ e a conexão fica
+presa ao papel dele: os votos chegam como {"type": "vote", "escolha":
+"A" | "B", "rodada": n} e valem só para esse papel e para a rodada que o
+jogador viu. Conexões sem jogador (a tela da sala) só acompanham o
+estado. A rodada é resolvida assim que o último voto chega.
+
+Tudo roda no event loop: nenhuma thread por conexão. O acesso ao banco
+passa por sync_to_async, que por padrão serializa as chamadas numa
+única thread; como fora do ciclo de uma requisição ninguém fecha as
+conexões velhas, cada chamada faz isso antes e depois (como o
+database_sync_to_async do Channels).
+"""
+import asyncio
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from .layer import layer
+from .models import Player
+from .views import VoteError, cast_vote, current_state
+
+WS_PATH = re.compile(r'^/ws/game/(?P<codigo>[-\w]+)/(?:(?P<token>[-\w]+)/?)?$')
+
+# Códigos de fechamento (faixa 4000-4999 é livre para a aplicação)
+CLOSE_NOT_FOUND = 4404
+
+
+def _db(func):
+    """sync_to_async com as conexões velhas fechadas antes e depois da chamada"""
+    def call(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(call)
+
+
+async def _send_json(send, message):
+    await send({'type': 'websocket.send', 'text': json.dumps(message, ensure_ascii=False)})
+
+
+async def _forward(queue, send):
+    """Repassa ao cliente tudo que for publicado na sala"""
+    while True:
+        message = await queue.get()
+        await _send_json(send, message)
+
+
+def _player_papel(codigo, token):
+    """Papel do jogador na sala, ou None se ele não é da sala"""
+    return Player.objects.filter(game__codigo=codigo, token=token).values_list('papel', flat=True).first()
+
+
+async def _handle_message(codigo, papel, text, send):
+    try:
+        message = json.loads(text or '')
+    except ValueError:
+        await _send_json(send, {'type': 'error', 'message': 'JSON inválido.'})
+        return
+
+    if not isinstance(message, dict) or message.get('type') != 'vote':
+        await _send_json(send, {'type': 'error', 'message': 'Mensagem desconhecida.'})
+        return
+
+    if papel is None:
+        await _send_json(send, {'type': 'error', 'message': 'Esta conexão só acompanha a sala.'})
+        return
+    if message.get('papel', papel) != papel:
+        await _send_json(send, {'type': 'error', 'message': f'Esta conexão vota só como {papel}.'})
+        return
+
+    try:
+        # O novo estado chega a todos (inclusive a este cliente) pela camada
+        await _db(cast_vote)(
+            codigo,
+            papel,
+            message.get('escolha'),
+            message.get('rodada'),
+            message.get('tipo_comunicacao', 'SIM'),
+        )
+    except VoteError as exc:
+        await _send_json(send, {'type': 'error', 'message': str(exc)})
+
+
+async def websocket_application(scope, receive, send):
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+
+    match = WS_PATH.match(scope['path'])
+    state = await _db(current_state)(match['codigo'].upper()) if match else None
+    if state is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+        return
+
+    codigo = state['sala']
+    # Conexão de jogador: o papel vem do jogador da URL, não das mensagens
+    papel = None
+    if match['token']:
+        papel = await _db(_player_papel)(codigo, match['token'])
+        if papel is None:
+            await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+            return
+
+    await send({'type': 'websocket.accept'})
+    queue = layer.subscribe(codigo)
+    forward = asyncio.ensure_future(_forward(queue, send))
+    try:
+        await _send_json(send, state)
+        while True:
+            event = await receive()
+            if event['type'] == 'websocket.disconnect':
+                break
+            if event['type'] == 'websocket.receive':
+                await _handle_message(codigo, papel, event.get('text'), send)
+    finally:
+        forward.cancel()
+        layer.unsubscribe(codigo, queue)
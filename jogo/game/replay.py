@@ -0,0 +1,83 @@
+"""
+Replay rodada a rodada de uma sessão encerrada, para o debrief.
+
+A trajetória é recalculada a partir do histórico arquivado (game.archive):
+os indicadores saem do impacto gravado de cada rodada com o clamp do
+motor (engine.apply_impact), o ponto coletivo da faixa do motor e o
+individual do alinhamento gravado. Usar o impacto da época, e não o do
+catálogo atual, mantém o replay fiel mesmo se o cenário foi editado.
+Pelo mesmo motivo limites, faixa coletiva e valores iniciais vêm das
+regras gravadas no blob.
+
+Um histórico arquivado não muda mais, então a trajetória decodificada
+fica no cache sem expiração: ir e voltar entre rodadas não consulta o
+banco depois da primeira carga. Gravar ou apagar a sessão (admin,
+limpeza do benchmark) descarta a entrada, para um id reaproveitado não
+herdar o replay de outra partida.
+"""
+from django.core.cache import cache
+
+from . import engine
+from .archive import load_history
+from .catalog import get_catalog
+
+REPLAY_CACHE_KEY = 'game:replay:{}'
+
+
+def _frame(rules, rodada, indicadores, pontuacoes, rnd=None, titulo=None):
+    return {
+        'rodada': rodada,
+        'cenario': rnd.cenario if rnd else None,
+        'titulo': titulo,
+        'opcao_vencedora': rnd.opcao if rnd else None,
+        'votos': rnd.votos if rnd else {},
+        'impacto': rnd.impacto if rnd else None,
+        'indicadores': rules.named(indicadores),
+        'pontuacoes': {
+            papel: {'individual': individual, 'coletiva': coletiva}
+            for papel, (individual, coletiva) in pontuacoes.items()
+        },
+        'colapso': engine.is_collapsed(indicadores, rules),
+    }
+
+
+def trajectory(history):
+    """Quadros 0..n: o estado inicial e o estado depois de cada rodada"""
+    catalog = get_catalog()
+    rules = history.rules
+    indicadores = engine.initial_state(rules).indicadores
+    pontuacoes = {papel: (0, 0) for papel in history.papeis}
+    frames = [_frame(rules, 0, indicadores, pontuacoes)]
+
+    for rnd in history.rounds():
+        indicadores = engine.apply_impact(indicadores, [rnd.impacto[name] for name in history.indicadores], rules)
+        coletivo = int(engine.in_collective_band(indicadores, rules))
+        pontuacoes = {
+            papel: (individual + int(rnd.alinhados[papel]), coletiva + coletivo)
+            for papel, (individual, coletiva) in pontuacoes.items()
+        }
+        scenario = catalog.get(rnd.cenario)
+        frames.append(_frame(rules, rnd.numero, indicadores, pontuacoes, rnd, scenario.titulo if scenario else None))
+    return frames
+
+
+def get_trajectory(session_id):
+    """Trajetória da sessão (do cache, ou do blob na primeira vez); None se não há histórico"""
+    key = REPLAY_CACHE_KEY.format(session_id)
+    frames = cache.get(key)
+    if frames is None:
+        history = load_history(session_id)
+        if history is None:
+            return None
+        frames = trajectory(history)
+        cache.set(key, frames, timeout=None)
+    return frames
+
+
+def session_changed(sender, instance, **kwargs):
+    cache.delete(REPLAY_CACHE_KEY.format(instance.pk))
+
+
+def frame_at(frames, rodada):
+    """Estado depois da rodada k (0 = início), limitado às rodadas jogadas"""
+    return frames[max(0, min(rodada, len(frames) - 1))]
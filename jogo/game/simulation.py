@@ -0,0 +1,234 @@
+"""
+Simulação headless de partidas completas sobre o motor (game.engine).
+
+Nada aqui acessa o banco: os cenários chegam como tuplas de
+ScenarioImpacts e as regras como um engine.Rules, o que permite repartir
+o trabalho entre processos.
+"""
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from . import engine
+from .engine import DEFAULT_RULES, OPTION_A, OPTION_B, OPTION_TIE
+
+# Papéis do ruleset padrão
+ROLES = DEFAULT_RULES.papeis
+
+
+# ====== Políticas de votação ======
+# Cada política recebe (estado, cenário, rng, rules) e devolve {papel: 'A' | 'B'}
+
+def random_policy(state, scenario, rng, rules=DEFAULT_RULES):
+    return {papel: rng.choice((OPTION_A, OPTION_B)) for papel in rules.papeis}
+
+
+def always_a_policy(state, scenario, rng, rules=DEFAULT_RULES):
+    return {papel: OPTION_A for papel in rules.papeis}
+
+
+def selfish_policy(state, scenario, rng, rules=DEFAULT_RULES):
+    """Cada papel vota na opção que mais favorece o próprio indicador"""
+    votes = {}
+    for papel in rules.papeis:
+        idx = rules.role_index[papel]
+        sim, nao = scenario.sim[idx], scenario.nao[idx]
+        if sim == nao:
+            votes[papel] = rng.choice((OPTION_A, OPTION_B))
+        else:
+            votes[papel] = OPTION_A if sim > nao else OPTION_B
+    return votes
+
+
+def outcome_score(indicadores, rules=DEFAULT_RULES):
+    """
+    Quão bom é um conjunto de indicadores para o grupo: evitar o colapso
+    antes de tudo, depois ficar na faixa coletiva e perto do centro dela
+    """
+    lo, hi = rules.faixa
+    center = (lo + hi) / 2
+    return (
+        not engine.is_collapsed(indicadores, rules),
+        engine.in_collective_band(indicadores, rules),
+        -sum(abs(v - center) for v in indicadores),
+    )
+
+
+def votes_for_outcome(opcao, roles=ROLES):
+    """Votos que produzem a opção desejada ('E' divide os votos ao meio)"""
+    if opcao != OPTION_TIE:
+        return {papel: opcao for papel in roles}
+    half = len(roles) // 2
+    return {papel: OPTION_A if i < half else OPTION_B for i, papel in enumerate(roles)}
+
+
+def cooperative_policy(state, scenario, rng, rules=DEFAULT_RULES):
+    """O grupo combina os votos para chegar ao melhor resultado coletivo"""
+    best = max(
+        rules.outcomes,
+        key=lambda opcao: outcome_score(engine.apply_impact(state.indicadores, scenario.impact(opcao), rules), rules),
+    )
+    return votes_for_outcome(best, rules.papeis)
+
+
+POLICIES = {
+    'random': random_policy,
+    'always_a': always_a_policy,
+    'selfish': selfish_policy,
+    'cooperative': cooperative_policy,
+}
+
+
+# ====== Partidas ======
+
+def deal(scenarios, rng, rounds=DEFAULT_RULES.rodadas):
+    """Mesmo baralho da view: embaralha tudo e repete se faltar cenário"""
+    deck = []
+    while len(deck) < rounds:
+        shuffled = list(scenarios)
+        rng.shuffle(shuffled)
+        deck.extend(shuffled)
+    return deck[:rounds]
+
+
+def points_tables(scenarios, rules=DEFAULT_RULES):
+    """points_table de cada cenário, por id"""
+    return {s.id: engine.points_table(s, rules) for s in scenarios}
+
+
+def play_game(scenarios, policy, rng, tables=None, rules=DEFAULT_RULES):
+    """
+    Joga uma partida completa e devolve
+    (colapso, rodadas, pontuações individuais por papel, pontuação coletiva,
+    consensos, empates)
+    """
+    return play_deck(deal(scenarios, rng, rules.rodadas), policy, rng, tables, rules)
+
+
+def play_deck(deck, policy, rng, tables=None, rules=DEFAULT_RULES):
+    """Joga uma partida com a ordem de cenários já definida"""
+    if tables is None:
+        tables = points_tables(deck, rules)
+    state = engine.initial_state(rules)
+    individual = dict.fromkeys(rules.papeis, 0)
+    coletiva = 0
+    consensos = 0
+    empates = 0
+    rodadas = 0
+
+    for scenario in deck:
+        votes = policy(state, scenario, rng, rules)
+        result = engine.resolve_round(state, scenario, votes, tables[scenario.id], rules)
+        rodadas += 1
+
+        for papel, aligned in result.alinhados.items():
+            individual[papel] += aligned
+        coletiva += result.ponto_coletivo
+        if result.votos_a == 0 or result.votos_b == 0:
+            consensos += 1
+        elif result.votos_a == result.votos_b:
+            empates += 1
+
+        state = result.state
+        if not state.active:
+            break
+
+    return result.colapso, rodadas, tuple(individual[p] for p in rules.papeis), coletiva, consensos, empates
+
+
+class SimulationStats:
+    """Acumulador de resultados; instâncias de processos diferentes se somam com merge()"""
+
+    def __init__(self, roles=ROLES):
+        self.roles = tuple(roles)
+        self.games = 0
+        self.colapsos = 0
+        self.rodadas = 0
+        self.consensos = 0
+        self.empates = 0
+        self.rodadas_hist = Counter()
+        self.coletiva_hist = Counter()
+        self.individual_hist = {papel: Counter() for papel in self.roles}
+
+    def add(self, colapso, rodadas, individual, coletiva, consensos, empates):
+        self.games += 1
+        self.colapsos += colapso
+        self.rodadas += rodadas
+        self.consensos += consensos
+        self.empates += empates
+        self.rodadas_hist[rodadas] += 1
+        self.coletiva_hist[coletiva] += 1
+        for papel, pontos in zip(self.roles, individual):
+            self.individual_hist[papel][pontos] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.colapsos += other.colapsos
+        self.rodadas += other.rodadas
+        self.consensos += other.consensos
+        self.empates += other.empates
+        self.rodadas_hist.update(other.rodadas_hist)
+        self.coletiva_hist.update(other.coletiva_hist)
+        for papel in self.roles:
+            self.individual_hist[papel].update(other.individual_hist[papel])
+        return self
+
+    def summary(self):
+        def mean(hist):
+            total = sum(hist.values())
+            return sum(k * v for k, v in hist.items()) / total if total else 0.0
+
+        games = self.games or 1
+        rodadas = self.rodadas or 1
+        return {
+            'games': self.games,
+            'collapse_rate': self.colapsos / games,
+            'completion_rate': 1 - self.colapsos / games,
+            'mean_rounds': self.rodadas / games,
+            'consensus_rate': self.consensos / rodadas,
+            'tie_rate': self.empates / rodadas,
+            'rounds_distribution': dict(sorted(self.rodadas_hist.items())),
+            'collective_mean': mean(self.coletiva_hist),
+            'collective_distribution': dict(sorted(self.coletiva_hist.items())),
+            'individual_mean': {papel: mean(hist) for papel, hist in self.individual_hist.items()},
+            'individual_distribution': {
+                papel: dict(sorted(hist.items())) for papel, hist in self.individual_hist.items()
+            },
+        }
+
+
+def run_games(scenarios, policy_name, n_games, seed, rules=DEFAULT_RULES):
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed)
+    tables = points_tables(scenarios, rules)
+    stats = SimulationStats(rules.papeis)
+    for _ in range(n_games):
+        stats.add(*play_game(scenarios, policy, rng, tables, rules))
+    return stats
+
+
+def _run_chunk(args):
+    return run_games(*args)
+
+
+def simulate(scenarios, policy_name, n_games, seed=0, workers=None, chunk_size=10_000, rules=DEFAULT_RULES):
+    """
+    Joga n_games partidas repartidas em lotes entre processos. Cada lote
+    usa a própria seed (seed + índice), então o resultado é reprodutível
+    independente do número de processos
+    """
+    scenarios = tuple(scenarios)
+    chunks = []
+    for index, start in enumerate(range(0, n_games, chunk_size)):
+        chunks.append((scenarios, policy_name, min(chunk_size, n_games - start), seed + index, rules))
+
+    stats = SimulationStats(rules.papeis)
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            stats.merge(_run_chunk(chunk))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_run_chunk, chunks):
+            stats.merge(partial)
+    return stats
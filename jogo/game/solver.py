@@ -0,0 +1,157 @@
+"""
+Solver exato para a votação cooperativa ótima.
+
+A cada rodada o grupo vê o cenário sorteado e escolhe o resultado (A, B
+ou empate, quando o número de jogadores é par). O solver calcula, por
+programação dinâmica com tabela de transposição, a probabilidade de
+completar o jogo e a pontuação coletiva esperada sob a melhor escolha,
+na média sobre o sorteio dos cenários.
+
+O estado é empacotado num inteiro: bits por indicador e para a rodada
+conforme os limites das regras (3 e 4 no padrão, 1..8 e 8 rodadas) e,
+no modo exato, a contagem de cenários já usados por classe (cenários
+com impactos idênticos são intercambiáveis).
+
+Sorteio:
+- padrão: cada rodada sorteia um cenário do catálogo inteiro (com
+  reposição, uma aproximação do baralho da sala). O estado é só
+  (indicadores, rodada), no máximo 4096 x 8 estados, e resolve em
+  poucos segundos;
+- exact=True: sem reposição, como o baralho da sala. O número de
+  estados cresce com as combinações de cenários usados, então só é
+  viável para catálogos pequenos ou poucas rodadas.
+"""
+from collections import Counter
+from typing import NamedTuple
+
+from . import engine
+from .engine import DEFAULT_RULES
+
+OBJECTIVES = ('survival', 'collective')
+# Casas decimais do critério principal na comparação entre escolhas.
+# Diferenças menores são ruído de ponto flutuante ou riscos que nenhuma
+# sala vai sentir, e não podem decidir contra o desempate: comparando os
+# floats direto, 'survival' trocava ~2 pontos coletivos esperados por
+# 1e-9 de chance de completar
+PRECISION = 4
+
+
+SAMPLING = {False: 'with_replacement', True: 'without_replacement'}
+
+
+class Solution(NamedTuple):
+    p_complete: float
+    p_collapse: float
+    expected_collective: float
+    states: int
+
+
+class Solver:
+    def __init__(self, scenarios, objective='survival', exact=False, rounds=None, n_players=None,
+                 rules=DEFAULT_RULES):
+        if objective not in OBJECTIVES:
+            raise ValueError(f'Objetivo desconhecido: {objective}')
+        if not scenarios:
+            raise ValueError('É preciso ao menos um cenário')
+
+        self.objective = objective
+        self.exact = exact
+        self.rules = rules
+        self.rounds = rules.rodadas if rounds is None else rounds
+        n_players = len(rules.papeis) if n_players is None else n_players
+        self.outcomes = engine.OUTCOMES if n_players % 2 == 0 else engine.OUTCOMES[:2]
+        self.indicator_bits = (rules.maximo - rules.minimo).bit_length()
+        self.round_bits = (self.rounds + 1).bit_length()
+
+        # Classes de cenários com o mesmo tensor de impactos
+        counts = Counter((s.sim, s.nao, s.empate) for s in scenarios)
+        self.classes = [
+            (tuple(impacts[engine.OUTCOMES.index(o)] for o in self.outcomes), count)
+            for impacts, count in counts.items()
+        ]
+        self.class_index = {impacts: index for index, impacts in enumerate(counts)}
+        self.total = sum(count for _, count in self.classes)
+        self.count_bits = max(count for _, count in self.classes).bit_length()
+        self.table = {}
+
+    def pack(self, indicadores, rodada, used=0):
+        key = rodada
+        for v in indicadores:
+            key = (key << self.indicator_bits) | (v - self.rules.minimo)
+        return key | (used << (self.round_bits + self.indicator_bits * len(indicadores)))
+
+    def value(self, indicadores, rodada, used=0):
+        """(probabilidade de completar, pontuação coletiva esperada) a partir do estado"""
+        first, second = self._value(indicadores, rodada, used)
+        return (first, second) if self.objective == 'survival' else (second, first)
+
+    def _value(self, indicadores, rodada, used):
+        # Internamente os pares ficam na ordem do objetivo, para comparar
+        # tuplas direto: (p, c) em 'survival' e (c, p) em 'collective'
+        if rodada > self.rounds:
+            return (1.0, 0.0) if self.objective == 'survival' else (0.0, 1.0)
+
+        key = self.pack(indicadores, rodada, used)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        total_first = 0.0
+        total_second = 0.0
+        remaining = 0
+        for index, (impacts, count) in enumerate(self.classes):
+            shift = index * self.count_bits
+            if self.exact:
+                left = count - ((used >> shift) & ((1 << self.count_bits) - 1))
+                if left <= 0:
+                    continue
+                next_used = used + (1 << shift)
+            else:
+                left = count
+                next_used = used
+
+            first, second = self._best(indicadores, rodada, impacts, next_used)
+            total_first += first * left
+            total_second += second * left
+            remaining += left
+
+        result = (total_first / remaining, total_second / remaining)
+        self.table[key] = result
+        return result
+
+    def _candidate(self, indicadores, rodada, impacto, next_used):
+        new = engine.apply_impact(indicadores, impacto, self.rules)
+        if self.rules.colapso in new:
+            return (0.0, 0.0)
+        first, second = self._value(new, rodada + 1, next_used)
+        if self.objective == 'survival':
+            return (first, second + engine.in_collective_band(new, self.rules))
+        return (first + engine.in_collective_band(new, self.rules), second)
+
+    @staticmethod
+    def _rank(value):
+        first, second = value
+        return (round(first, PRECISION), second)
+
+    def _best(self, indicadores, rodada, impacts, next_used):
+        return max((self._candidate(indicadores, rodada, impacto, next_used) for impacto in impacts), key=self._rank)
+
+    def best_outcome(self, state, scenario, used=0):
+        """Opção ('A', 'B' ou 'E') que o grupo deve produzir neste cenário"""
+        best_option = None
+        best_value = None
+        next_used = used
+        if self.exact:
+            index = self.class_index[(scenario.sim, scenario.nao, scenario.empate)]
+            next_used = used + (1 << (index * self.count_bits))
+
+        for opcao in self.outcomes:
+            candidate = self._candidate(state.indicadores, state.rodada, scenario.impact(opcao), next_used)
+            if best_value is None or self._rank(candidate) > self._rank(best_value):
+                best_option, best_value = opcao, candidate
+        return best_option
+
+    def solve(self, state=None):
+        state = state or engine.initial_state(self.rules)
+        p, c = self.value(state.indicadores, state.rodada)
+        return Solution(p, 1 - p, c, len(self.table))
@@ -1,3 +1,1162 @@
-from django.test import TestCase
+import gzip
+import importlib.util
+import io
+import json
+import random
+import tempfile
+import time
+from functools import lru_cache
+from unittest import mock, skipIf
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from . import archive, benchmark, bots, catalog, engine, events, replay, simulation, solver, vectorized
+from .realtime import websocket_application
+from .analytics import ANALYTICS_CACHE_KEY, ANALYTICS_CACHE_TTL
+from .management.commands import benchmark_db
+from .engine import DEFAULT_PLAYERS, MAX_ROUNDS
+from .models import (
+    ROOM_CODE_ALPHABET, ROOM_CODE_LENGTH, Choice, Game, GameEvent, GameSession, GameSnapshot, GameState, Player, Round,
+    Ruleset, Scenario,
+)
+from .views import (
+    ROOM_CODE_ATTEMPTS, StaleStateError, VoteError, _build_deck, _cast_vote, _create_game, _deal_deck, _resolve_round,
+    agame_view, cast_vote,
+)
+
+
+def make_scenario(numero, sim=(0, 0, 0, 0), nao=(0, 0, 0, 0), empate=(0, 0, 0, 0), ruleset=None):
+    return Scenario.objects.create(
+        codigo=f'TST-{numero:03d}',
+        numero=numero,
+        titulo=f'Cenário {numero}',
+        contexto='Contexto',
+        dilema='Dilema',
+        impactos=[*sim, *nao, *empate],
+        ruleset=ruleset,
+    )
+
+
+def votes(*escolhas):
+    """Monta o POST de votação na ordem de DEFAULT_PLAYERS"""
+    return {f'choice_{papel}': escolha for (_, papel), escolha in zip(DEFAULT_PLAYERS, escolhas)}
+
+
+def on_table(game, data):
+    """Completa o POST com a rodada e o cenário em tela, como o formulário da sala"""
+    gs = GameState.objects.select_related('game').get(game=game)
+    cenario = gs.game.deck[gs.rodada_atual - 1] if gs.active else ''
+    return {**data, 'rodada': gs.rodada_atual, 'cenario': cenario}
+
+
+class EngineTests(SimpleTestCase):
+    scenario = engine.ScenarioImpacts(1, (1, -1, 0, 0), (-1, 1, 0, 0), (0, 0, -1, 1))
+
+    def test_majority_and_alignment(self):
+        result = engine.resolve_round(
+            engine.initial_state(), self.scenario,
+            {'Presidente': 'A', 'Lider Militar': 'A', 'Lider Politico': 'B', 'Lider da População': 'A'},
+        )
+        self.assertEqual(result.opcao_vencedora, engine.OPTION_A)
+        self.assertEqual(result.state, engine.State((6, 4, 5, 5), 2, True))
+        self.assertEqual(
+            [papel for papel, aligned in result.alinhados.items() if aligned], ['Presidente']
+        )
+        self.assertFalse(result.ponto_coletivo)
+
+    def test_tie_scores_each_vote_by_its_own_option(self):
+        result = engine.resolve_round(
+            engine.initial_state(), self.scenario,
+            {'Presidente': 'A', 'Lider Militar': 'B', 'Lider Politico': 'A', 'Lider da População': 'B'},
+        )
+        self.assertEqual(result.opcao_vencedora, engine.OPTION_TIE)
+        self.assertEqual(result.impacto, (0, 0, -1, 1))
+        self.assertEqual(result.alinhados, {
+            'Presidente': True, 'Lider Militar': True, 'Lider Politico': False, 'Lider da População': False,
+        })
+        self.assertFalse(result.ponto_coletivo)
+
+    def test_points_table_matches_alignment_rule(self):
+        pontos = engine.points_table(self.scenario)
+        self.assertEqual(len(pontos), len(engine.ROLE_INTEREST) * len(engine.VOTES) * len(engine.OUTCOMES))
+        for papel in engine.ROLE_INTEREST:
+            for voto in engine.VOTES:
+                for resultado in engine.OUTCOMES:
+                    self.assertEqual(
+                        pontos[engine.point_index(papel, voto, resultado)],
+                        engine.is_aligned(self.scenario, papel, voto, resultado),
+                    )
+
+    def test_points_table_follows_the_rules(self):
+        # Três papéis: número ímpar de votos, sem empate possível
+        rules = engine.Rules(('a', 'b'), [('X', 'a'), ('Y', 'b'), ('Z', 'a')])
+        scenario = engine.ScenarioImpacts(1, (1, -1), (-1, 1), (0, 0))
+        pontos = engine.points_table(scenario, rules)
+        self.assertEqual(len(pontos), 3 * len(engine.VOTES) * len(engine.OUTCOMES))
+        self.assertEqual(rules.outcomes, (engine.OPTION_A, engine.OPTION_B))
+
+        result = engine.resolve_round(rules.initial, scenario, {'X': 'A', 'Y': 'B', 'Z': 'A'}, pontos, rules)
+        self.assertEqual(result.opcao_vencedora, engine.OPTION_A)
+        self.assertEqual(result.alinhados, {'X': True, 'Y': False, 'Z': True})
+        self.assertEqual(pontos[engine.point_index('Y', 'B', engine.OPTION_B, rules)], 1)
+
+    def test_rules_need_at_least_one_round(self):
+        with self.assertRaises(ValueError):
+            engine.Rules(('a',), [('X', 'a')], rodadas=0)
+
+    def test_collapse_ends_game_without_advancing(self):
+        state = engine.State((2, 5, 5, 5), 3)
+        result = engine.resolve_round(state, self.scenario, {'Presidente': 'B'})
+        self.assertTrue(result.colapso)
+        self.assertEqual(result.state, engine.State((1, 6, 5, 5), 3, False))
+
+    def test_last_round_ends_game(self):
+        state = engine.State((5, 5, 5, 5), MAX_ROUNDS)
+        result = engine.resolve_round(state, self.scenario, {'Presidente': 'A', 'Lider Militar': 'B'})
+        self.assertEqual(result.state, engine.State((5, 5, 4, 6), MAX_ROUNDS + 1, False))
+
+
+class RoomTests(TestCase):
+    def test_room_codes(self):
+        codes = {_create_game().codigo for _ in range(20)}
+        self.assertEqual(len(codes), 20)
+        for codigo in codes:
+            self.assertEqual(len(codigo), ROOM_CODE_LENGTH)
+            self.assertLessEqual(set(codigo), set(ROOM_CODE_ALPHABET))
+        # Sem caracteres que se confundem ao ditar o código para a mesa
+        self.assertFalse(set('01IO') & set(ROOM_CODE_ALPHABET))
+
+        # Cada sala tem os próprios jogadores e estado; a URL aceita minúsculas
+        game = Game.objects.get(codigo=codes.pop())
+        self.assertEqual(Player.objects.filter(game=game).count(), len(DEFAULT_PLAYERS))
+        response = self.client.get(reverse('game:game', args=[game.codigo.lower()]))
+        self.assertContains(response, f'Sala <strong>{game.codigo}</strong>')
+
+    def test_code_collision_draws_a_new_code(self):
+        taken = _create_game().codigo
+        with mock.patch('game.views.generate_room_code', side_effect=[taken, 'NOVA23']), \
+                self.assertLogs('game.views', 'WARNING') as logs:
+            game = _create_game()
+        self.assertEqual(game.codigo, 'NOVA23')
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(GameState.objects.get(game=game).rodada_atual, 1)
+
+        # Colidindo em todos os sorteios o erro aparece, sem sala pela metade
+        with mock.patch('game.views.generate_room_code', side_effect=[taken] * ROOM_CODE_ATTEMPTS), \
+                self.assertLogs('game.views', 'WARNING'):
+            with self.assertRaises(IntegrityError):
+                _create_game()
+        self.assertEqual(Game.objects.count(), 2)
+
+    def test_lobby_joins_existing_rooms_only(self):
+        game = _create_game()
+        url = reverse('game:lobby')
+        response = self.client.post(url, {'codigo': f' {game.codigo.lower()} '})
+        self.assertRedirects(response, reverse('game:game', args=[game.codigo]))
+        response = self.client.post(url, {'codigo': 'ZZZZZZ'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Game.objects.count(), 1)
+
+
+class DeckTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ids = [make_scenario(numero).pk for numero in range(1, MAX_ROUNDS + 3)]
+
+    def test_same_seed_deals_the_same_deck(self):
+        deck = _build_deck(1234)
+        self.assertEqual(_build_deck(1234), deck)
+        self.assertNotEqual(_build_deck(4321), deck)
+        # Um baralho é uma permutação do catálogo: nenhum cenário repete
+        self.assertEqual(sorted(deck), self.ids)
+
+    def test_small_catalog_repeats_the_deck(self):
+        # A revisão do catálogo em cache sobreviveria ao rollback da exclusão
+        self.addCleanup(cache.clear)
+        Scenario.objects.exclude(pk__in=self.ids[:3]).delete()
+        deck = _build_deck(7)
+        self.assertGreaterEqual(len(deck), MAX_ROUNDS)
+        self.assertEqual(sorted(deck[:3]), self.ids[:3])
+
+    def test_room_deck_comes_from_its_seed(self):
+        game = _create_game()
+        self.assertEqual(game.deck, _build_deck(game.seed))
+        seed, deck = game.seed, game.deck
+
+        # Reset: seed nova, baralho novo; a seed antiga reproduz a partida
+        _deal_deck(game, seed=seed + 1)
+        self.assertNotEqual(game.deck, deck)
+        _deal_deck(game, seed=seed)
+        self.assertEqual(Game.objects.get(pk=game.pk).deck, deck)
+
+
+class RoundResolutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for numero in range(1, MAX_ROUNDS + 1):
+            make_scenario(numero, sim=(1, -1, 0, 0), nao=(-1, 1, 0, 0))
+
+    def setUp(self):
+        self.game = _create_game()
+        self.url = reverse('game:game', args=[self.game.codigo])
+
+    def test_round_resolution_query_budget(self):
+        # 2 leituras (estado+sala, jogadores; o cenário vem do catálogo em
+        # memória) + savepoint/release + INSERT round + INSERT choices +
+        # UPDATE jogadores + UPDATE estado + INSERT evento
+        ballot = on_table(self.game, votes('A', 'A', 'A', 'B'))
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, ballot)
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(Round.objects.filter(game=self.game).count(), 1)
+        self.assertEqual(Choice.objects.filter(round__game=self.game).count(), len(DEFAULT_PLAYERS))
+
+        scores = dict(Player.objects.filter(game=self.game).values_list('papel', 'pontuacao_individual'))
+        # A venceu: só quem votou A e tem o indicador favorecido pontua
+        self.assertEqual(scores, {
+            'Presidente': 1, 'Lider Militar': 0, 'Lider Politico': 0, 'Lider da População': 0,
+        })
+
+        gs = GameState.objects.get(game=self.game)
+        self.assertEqual(gs.rodada_atual, 2)
+        self.assertEqual(gs.indicadores, [6, 4, 5, 5])
+        self.assertEqual(
+            set(Player.objects.filter(game=self.game).values_list('pontuacao_coletiva', flat=True)), {0}
+        )
+
+    def test_duplicate_submission_is_discarded(self):
+        ballot = {**votes('A', 'A', 'A', 'B'), 'rodada': 1, 'cenario': self.game.deck[0]}
+        self.client.post(self.url, ballot)
+
+        # Duplo clique: rodada já resolvida, descartado sem escrever nada
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, ballot)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Round.objects.filter(game=self.game).count(), 1)
+        self.assertEqual(GameState.objects.get(game=self.game).rodada_atual, 2)
+        # A mesa fica sabendo por que o envio não valeu
+        self.assertContains(self.client.get(self.url), 'A sala mudou desde que esta tela foi aberta')
+
+    def test_submission_without_round_is_discarded(self):
+        self.client.post(self.url, on_table(self.game, votes('A', 'A', 'A', 'B')))
+        # Sem a rodada não dá para saber o que a mesa viu: nem voto nem reset valem
+        self.client.post(self.url, votes('A', 'A', 'A', 'B'))
+        self.client.post(self.url, {'reset_game': '1'})
+        self.assertEqual(Round.objects.filter(game=self.game).count(), 1)
+        self.assertEqual(GameState.objects.get(game=self.game).rodada_atual, 2)
+
+    def test_phone_vote_does_not_invalidate_the_room_form(self):
+        # O Presidente votou pelo celular e fica em branco no formulário
+        ballot = {**votes('', 'A', 'A', 'B'), 'rodada': 1, 'cenario': self.game.deck[0]}
+        # Um voto pelo celular muda a versão do estado, mas não a rodada
+        cast_vote(self.game.codigo, 'Presidente', 'B', 1)
+        self.assertContains(self.client.get(self.url), 'Já votou pelo celular')
+        self.client.post(self.url, ballot)
+        self.assertEqual(GameState.objects.get(game=self.game).rodada_atual, 2)
+        self.assertEqual(Choice.objects.get(round__game=self.game, player__papel='Presidente').escolha, 'B')
+
+    def test_racing_resolution_loses_compare_and_swap(self):
+        stale = GameState.objects.select_related('game').get(game=self.game)
+        players = list(Player.objects.filter(game=self.game))
+        scenario = Scenario.objects.get(pk=self.game.deck[0])
+
+        # Outra requisição resolve a rodada entre a leitura e a escrita
+        self.client.post(self.url, on_table(self.game, votes('A', 'A', 'A', 'A')))
+
+        with self.assertRaises(StaleStateError):
+            with transaction.atomic():
+                _resolve_round(stale, players, scenario, dict(zip(engine.ROLE_INTEREST, 'BBBB')))
+        self.assertEqual(Round.objects.filter(game=self.game).count(), 1)
+        self.assertEqual(Choice.objects.filter(round__game=self.game, escolha='B').count(), 0)
+
+    def test_phone_votes_are_merged(self):
+        for papel in list(engine.ROLE_INTEREST)[:3]:
+            cast_vote(self.game.codigo, papel, 'A', 1)
+        gs = GameState.objects.get(game=self.game)
+        self.assertEqual(len(gs.votos_pendentes), 3)
+        self.assertEqual(gs.versao, 3)
+
+    def test_phone_vote_does_not_slide_into_the_next_round(self):
+        def collide(*args):
+            # A mesa resolve a rodada 1 entre a leitura e a escrita do voto
+            if not Round.objects.filter(game=self.game).exists():
+                self.client.post(self.url, on_table(self.game, votes('A', 'A', 'A', 'A')))
+                raise StaleStateError
+            return _cast_vote(*args)
+
+        with mock.patch('game.views._cast_vote', side_effect=collide), self.assertRaises(VoteError):
+            cast_vote(self.game.codigo, 'Presidente', 'B', 1)
+        gs = GameState.objects.get(game=self.game)
+        self.assertEqual((gs.rodada_atual, gs.votos_pendentes), (2, {}))
+
+    def test_collective_point_is_added_to_every_player(self):
+        # Empate: impacto nulo mantém todos os indicadores em 5, dentro da faixa 3..5
+        self.client.post(self.url, on_table(self.game, votes('A', 'A', 'B', 'B')))
+
+        self.assertEqual(
+            list(Player.objects.filter(game=self.game).values_list('pontuacao_coletiva', flat=True)),
+            [1] * len(DEFAULT_PLAYERS)
+        )
+        self.assertEqual(Player.objects.get(game=self.game, papel='Presidente').pontuacao_individual, 1)
+
+    def test_finishing_game_saves_session_from_running_counters(self):
+        ballots = [votes('A', 'A', 'A', 'A'), votes('A', 'A', 'B', 'B'), votes('B', 'B', 'B', 'A')]
+        for numero in range(1, MAX_ROUNDS):
+            self.client.post(self.url, on_table(self.game, ballots[numero % 3]))
+
+        # A última rodada custa ainda a contagem do nome da sessão, o INSERT
+        # dela, o snapshot (os eventos RODADA e FIM vão no mesmo INSERT), a
+        # leitura do histórico para o arquivo e a limpeza de rodadas e escolhas
+        ballot = on_table(self.game, ballots[MAX_ROUNDS % 3])
+        with self.assertNumQueries(16):
+            self.client.post(self.url, ballot)
+
+        session = GameSession.objects.get()
+        self.assertEqual(session.status, 'COMPLETO')
+        self.assertEqual(session.rounds_completados, MAX_ROUNDS)
+        self.assertEqual((session.total_consensos, session.total_empates), (2, 3))
+
+        # Rodadas e escolhas foram para o histórico da sessão
+        self.assertFalse(Round.objects.filter(game=self.game).exists())
+        self.assertFalse(Choice.objects.filter(round__game=self.game).exists())
+        rounds = list(archive.load_history(session.pk).rounds())
+        self.assertEqual([rnd.numero for rnd in rounds], list(range(1, MAX_ROUNDS + 1)))
+        self.assertEqual(session.total_consensos, sum(1 for rnd in rounds if rnd.votos_b == 0))
+        self.assertEqual(session.total_empates, sum(1 for rnd in rounds if rnd.opcao == 'E'))
+
+    def test_room_matches_headless_engine(self):
+        # A sala e a simulação sem banco jogam pelo mesmo motor: o mesmo
+        # baralho com os mesmos votos termina igual
+        ballots = ['AAAB', 'AABB', 'BBBA']
+        for numero in range(1, MAX_ROUNDS + 1):
+            self.client.post(self.url, on_table(self.game, votes(*ballots[numero % 3])))
+
+        def policy(state, scenario, rng, rules=engine.DEFAULT_RULES):
+            return dict(zip(rules.papeis, ballots[state.rodada % 3]))
+
+        scenarios = Scenario.objects.in_bulk(self.game.deck)
+        deck = [engine.ScenarioImpacts.from_model(scenarios[pk]) for pk in self.game.deck]
+        colapso, rodadas, individual, coletiva, consensos, empates = simulation.play_deck(deck, policy, None)
+
+        session = GameSession.objects.get()
+        self.assertEqual((colapso, rodadas), (session.status == 'INTERROMPIDO', session.rounds_completados))
+        self.assertEqual(dict(zip(engine.DEFAULT_RULES.papeis, individual)), session.pontuacoes_individuais)
+        self.assertEqual((consensos, empates), (session.total_consensos, session.total_empates))
+        self.assertEqual(coletiva, session.pontuacoes_coletivas['Presidente'])
+
+
+class EventLogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for numero in range(1, MAX_ROUNDS + 1):
+            make_scenario(numero, sim=(1, -1, 0, 0), nao=(-1, 1, 0, 0))
+
+    def setUp(self):
+        self.game = _create_game()
+        self.url = reverse('game:game', args=[self.game.codigo])
+
+    def live(self):
+        gs = GameState.objects.get(game=self.game)
+        return events.live_state(gs, Player.objects.filter(game=self.game))
+
+    def test_rebuild_matches_live_state(self):
+        ballots = [votes('A', 'A', 'A', 'B'), votes('A', 'A', 'B', 'B'), votes('B', 'B', 'B', 'A')]
+        for numero in range(1, MAX_ROUNDS + 1):
+            self.client.post(self.url, on_table(self.game, ballots[numero % 3]))
+            self.assertEqual(events.rebuild_state(self.game), self.live())
+
+        tipos = list(GameEvent.objects.filter(game=self.game).values_list('tipo', flat=True))
+        self.assertEqual(tipos, ['INICIO'] + ['RODADA'] * MAX_ROUNDS + ['FIM'])
+        self.assertEqual(GameState.objects.get(game=self.game).ultimo_evento, len(tipos))
+
+        # Snapshot no evento 10: a reconstrução não relê o log inteiro
+        self.assertEqual(list(GameSnapshot.objects.filter(game=self.game).values_list('seq', flat=True)), [10])
+        with self.assertNumQueries(2):
+            events.rebuild_state(self.game)
+
+    def test_phone_votes_and_reset_are_logged(self):
+        cast_vote(self.game.codigo, 'Presidente', 'B', 1)
+        self.assertEqual(events.rebuild_state(self.game)['votos'], {'Presidente': 'B'})
+
+        self.client.post(self.url, on_table(self.game, votes('A', 'A', 'A', 'A')))
+        self.client.post(self.url, on_table(self.game, {'reset_game': '1'}))
+
+        # O reset apaga as rodadas, não o histórico
+        self.assertEqual(Round.objects.filter(game=self.game).count(), 0)
+        log = list(events.history(self.game))
+        self.assertEqual([tipo for _, tipo, _, _ in log], ['INICIO', 'VOTO', 'RODADA', 'INICIO'])
+        self.assertEqual(log[2][3]['rodada'], 2)
+        self.assertEqual(events.rebuild_state(self.game), self.live())
+
+
+class ReplayTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for numero in range(1, MAX_ROUNDS + 1):
+            make_scenario(numero, sim=(1, -1, 0, 0), nao=(-1, 1, 0, 0))
+
+    def setUp(self):
+        cache.clear()
+        self.game = _create_game()
+        ballots = [votes('A', 'A', 'A', 'B'), votes('A', 'A', 'B', 'B'), votes('B', 'B', 'B', 'A')]
+        for numero in range(1, MAX_ROUNDS + 1):
+            self.client.post(reverse('game:game', args=[self.game.codigo]), on_table(self.game, ballots[numero % 3]))
+        self.session = GameSession.objects.get()
+        self.url = reverse('game:replay', args=[self.session.pk])
+        staff = get_user_model().objects.create_user('staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+
+    def test_trajectory_matches_event_log(self):
+        frames = self.client.get(self.url, {'format': 'json'}).json()['quadros']
+        self.assertEqual([f['rodada'] for f in frames], list(range(MAX_ROUNDS + 1)))
+
+        logged = [estado for _, tipo, _, estado in events.history(self.game) if tipo == 'RODADA']
+        for frame, estado in zip(frames[1:], logged):
+            self.assertEqual(list(frame['indicadores'].values()), estado['indicadores'])
+            self.assertEqual(
+                {papel: [p['individual'], p['coletiva']] for papel, p in frame['pontuacoes'].items()},
+                estado['pontuacoes'],
+            )
+
+        final = frames[-1]
+        self.assertEqual(final['indicadores']['estabilidade'], self.session.indicadores_finais['estabilidade'])
+        self.assertEqual(
+            {papel: p['individual'] for papel, p in final['pontuacoes'].items()},
+            self.session.pontuacoes_individuais,
+        )
+
+    def test_scrubbing_is_cached(self):
+        response = self.client.get(self.url, {'rodada': 3})
+        self.assertContains(response, 'Rodada 3 — Cenário')
+
+        # Depois da primeira carga, ir e voltar não consulta o banco
+        with self.assertNumQueries(0):
+            replay.get_trajectory(self.session.pk)
+        frame = self.client.get(self.url, {'rodada': 2, 'format': 'json'}).json()
+        self.assertEqual(self.client.get(self.url, {'rodada': 99}).status_code, 200)
+        self.assertEqual(frame['rodada'], 2)
+        self.assertEqual(len(frame['votos']), len(DEFAULT_PLAYERS))
+
+        self.assertEqual(self.client.get(self.url, {'rodada': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('game:replay', args=[self.session.pk + 1])).status_code, 404)
+
+    def test_replay_is_staff_only(self):
+        # Os votos de cada papel não ficam abertos a quem só jogou
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_deleting_the_session_drops_the_cached_replay(self):
+        session_id = self.session.pk
+        replay.get_trajectory(session_id)
+        GameSession.objects.filter(pk=session_id).delete()
+        self.assertIsNone(replay.get_trajectory(session_id))
+
+    def test_unreadable_archive_is_not_found(self):
+        GameSession.objects.filter(pk=self.session.pk).update(historico=b'lixo')
+        cache.clear()
+        with self.assertLogs('game.views', 'ERROR'):
+            self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class AsyncGameViewTests(TestCase):
+    def setUp(self):
+        make_scenario(1, sim=[1, 0, 0, 0])
+        self.game = _create_game()
+        self.factory = AsyncRequestFactory()
+        self.table = on_table(self.game, {})
+
+    async def test_get_and_resolve_round(self):
+        path = f'/game/{self.game.codigo}/'
+        response = await agame_view(self.factory.get(path), self.game.codigo)
+        self.assertEqual(response.status_code, 200)
+
+        request = self.factory.post(path, {**votes('A', 'A', 'A', 'A'), **self.table})
+        response = await agame_view(request, self.game.codigo)
+        self.assertEqual(response.status_code, 302)
+
+        gs = await GameState.objects.aget(game=self.game)
+        self.assertEqual(gs.rodada_atual, 2)
+        self.assertEqual(gs.indicadores[0], 6)
+        self.assertEqual(await Choice.objects.filter(round__game=self.game).acount(), 4)
+
+    async def test_missing_votes_render_error(self):
+        path = f'/game/{self.game.codigo}/'
+        response = await agame_view(self.factory.post(path, {**votes('A', 'B'), **self.table}), self.game.codigo)
+        self.assertContains(response, 'Selecione uma opção')
+
+
+class RequestLoggingTests(TestCase):
+    def test_one_line_per_request_with_queries(self):
+        make_scenario(1)
+        game = _create_game()
+
+        with self.assertLogs('game.requests', 'INFO') as logs:
+            self.client.post(reverse('game:game', args=[game.codigo]), on_table(game, votes('A', 'A', 'A', 'A')))
+
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.sala, game.codigo)
+        self.assertEqual(record.rodada, 1)
+        # Mesmo orçamento de RoundResolutionTests: 9 consultas por rodada
+        self.assertEqual(record.queries, 9)
+        self.assertGreater(record.duration_ms, record.db_ms)
+
+
+class BenchmarkDriverTests(TestCase):
+    def test_full_game_query_budget(self):
+        scenarios = {s.id: engine.ScenarioImpacts.from_model(s) for s in (make_scenario(n) for n in range(1, 4))}
+        recorder, elapsed = benchmark.run_games(scenarios, simulation.always_a_policy, games=1)
+        summary = recorder.summary(elapsed)
+
+        self.assertEqual(summary['rounds'], MAX_ROUNDS)
+        requests = summary['requests']
+        self.assertEqual(requests['vote']['requests'], MAX_ROUNDS)
+        self.assertEqual(requests['vote']['errors'], 0)
+        # 9 consultas por rodada; 16 na última, que grava a GameSession, o
+        # snapshot e o histórico arquivado
+        self.assertEqual(requests['vote']['queries_max'], 16)
+        self.assertEqual(requests['page']['queries_max'], 2)
+        self.assertEqual(requests['state']['queries_max'], 3)
+
+    def test_cleanup_keeps_sessions_from_other_rooms(self):
+        for n in range(1, 4):
+            make_scenario(n)
+        real = []
+
+        def run_games_with_a_real_session(*args, **kwargs):
+            # Uma partida de verdade termina em outro processo durante o benchmark
+            real.append(GameSession.objects.create(
+                nome_sessao='Partida real', rounds_completados=8, pontuacoes_individuais={}, pontuacoes_coletivas={},
+            ))
+            return benchmark.run_games(*args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch(
+            'game.management.commands.benchmark_game.run_games', run_games_with_a_real_session,
+        ):
+            call_command(
+                'benchmark_game', games=2, mode=['client'], output=f'{tmp}/report.json', stdout=io.StringIO(),
+            )
+        self.assertEqual(list(GameSession.objects.all()), real)
+        self.assertFalse(Game.objects.exists())
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(benchmark.percentile(values, 50), 50)
+        self.assertEqual(benchmark.percentile(values, 99), 99)
+        self.assertEqual(benchmark.percentile([], 99), 0.0)
+
+
+class BenchmarkDbProfileTests(SimpleTestCase):
+    def test_postgres_is_opt_in(self):
+        self.assertEqual(benchmark_db.select_profiles(None, {}), ['dev', 'sqlite'])
+        self.assertEqual(benchmark_db.select_profiles(['sqlite'], {}), ['sqlite'])
+
+    @skipIf(importlib.util.find_spec('psycopg') is None, 'psycopg não instalado')
+    def test_postgres_needs_a_throwaway_database(self):
+        with self.assertRaises(CommandError):
+            benchmark_db.select_profiles(['postgres'], {})
+        app_db = settings.DATABASE_PROFILES['postgres']['NAME']
+        with self.assertRaises(CommandError):
+            benchmark_db.select_profiles(['postgres'], {'POSTGRES_BENCH_DB': app_db})
+        self.assertEqual(
+            benchmark_db.select_profiles(['postgres'], {'POSTGRES_BENCH_DB': f'{app_db}_bench'}), ['postgres']
+        )
+
+    @skipIf(importlib.util.find_spec('psycopg') is not None, 'psycopg instalado')
+    def test_postgres_without_driver_is_refused(self):
+        with self.assertRaises(CommandError):
+            benchmark_db.select_profiles(['postgres'], {'POSTGRES_BENCH_DB': 'bench'})
+
+
+class CatalogTests(TestCase):
+    def records(self, n=50):
+        records = []
+        for i in range(1, n + 1):
+            record = {'impactos': {'sim': [0] * 4, 'nao': [0] * 4, 'empate': [0] * 4}}
+            record.update(par=f'PAR_{i}', numero=i, codigo=f'CAT-{i:03d}', titulo=f'Cenário {i}',
+                          contexto='...', dilema='?', tema=None)
+            records.append(record)
+        return catalog.validate(records)
+
+    def test_upsert_and_skip_unchanged(self):
+        records = self.records()
+        # Um único INSERT para os 50 cenários; o resto é transação e CatalogMeta
+        with self.assertNumQueries(9):
+            result = catalog.sync_catalog(records, versao=1)
+        self.assertEqual((result.criados, result.atualizados, result.iguais), (50, 0, 0))
+
+        with self.assertNumQueries(3):
+            self.assertTrue(catalog.sync_catalog(records, versao=1).pulado)
+
+        records[0]['titulo'] = 'Novo título'
+        result = catalog.sync_catalog(records, versao=2)
+        self.assertEqual((result.criados, result.atualizados, result.iguais), (0, 1, 49))
+        self.assertEqual(Scenario.objects.get(codigo='CAT-001').titulo, 'Novo título')
+        self.assertEqual(Scenario.objects.count(), 50)
+
+    def test_rejects_duplicate_codes(self):
+        records = self.records(2)
+        records[1]['codigo'] = records[0]['codigo']
+        with self.assertRaises(catalog.CatalogError):
+            catalog.validate(records)
+
+    def test_shipped_catalog_is_valid(self):
+        versao, ruleset, records = catalog.read_catalog()
+        self.assertGreaterEqual(versao, 1)
+        self.assertIsNone(ruleset)
+        self.assertEqual(len({r['codigo'] for r in records}), len(records))
+
+
+class ScenarioCatalogTests(TestCase):
+    def test_catalog_is_cached_and_invalidated_by_saves(self):
+        scenario = make_scenario(1, sim=(1, 0, 0, -1), nao=(0, 0, 0, 1))
+        first = catalog.get_catalog()
+        self.assertEqual(first.by_codigo['TST-001'].pk, scenario.pk)
+        self.assertEqual(first.impacts[scenario.pk].sim, (1, 0, 0, -1))
+        pontos = first.pontos[scenario.pk]
+        self.assertEqual(pontos[engine.point_index('Presidente', 'A', 'A')], 1)
+        self.assertEqual(pontos[engine.point_index('Presidente', 'A', 'B')], 0)
+        self.assertEqual(pontos[engine.point_index('Lider da População', 'B', 'E')], 1)
+
+        with self.assertNumQueries(0):
+            self.assertIs(catalog.get_catalog(), first)
+
+        # Um save (como o do admin) troca a revisão e força a recarga
+        scenario.titulo = 'Outro título'
+        scenario.save()
+        second = catalog.get_catalog()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.get(scenario.pk).titulo, 'Outro título')
+
+        make_scenario(2)
+        self.assertEqual(len(catalog.get_catalog()), 2)
+
+
+class RulesetMigrationTests(TransactionTestCase):
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([('game', target)])
+        return executor.loader.project_state([('game', target)]).apps
+
+    def tearDown(self):
+        self.migrate(MigrationLoader(connection).graph.leaf_nodes('game')[0][1])
+
+    def test_old_columns_are_copied_into_vectors(self):
+        apps = self.migrate('0011_gamesession_historico')
+        impactos = {
+            f'impacto_{opcao}_{name}': i
+            for i, (opcao, name) in enumerate((o, n) for o in ('sim', 'nao', 'empate') for n in engine.INDICATORS)
+        }
+        apps.get_model('game', 'Scenario').objects.create(
+            codigo='OLD-001', numero=1, titulo='t', contexto='c', dilema='d', **impactos,
+        )
+        Game = apps.get_model('game', 'Game')
+        game = Game.objects.create(codigo='OLD234', seed=1, deck=[])
+        apps.get_model('game', 'GameState').objects.create(game=game, estabilidade=7, seguranca=2)
+        apps.get_model('game', 'GameSession').objects.create(
+            nome_sessao='s', rounds_completados=8, estabilidade_final=2, seguranca_final=3,
+            economia_final=4, liberdade_final=5, pontuacoes_individuais={}, pontuacoes_coletivas={},
+        )
+
+        apps = self.migrate('0012_rulesets')
+        self.assertEqual(apps.get_model('game', 'Scenario').objects.get().impactos, list(range(12)))
+        self.assertEqual(apps.get_model('game', 'GameState').objects.get().indicadores[:2], [7, 2])
+        self.assertEqual(
+            apps.get_model('game', 'GameSession').objects.get().indicadores_finais,
+            {'estabilidade': 2, 'seguranca': 3, 'economia': 4, 'liberdade': 5},
+        )
+
+
+class BotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for numero in range(1, MAX_ROUNDS + 1):
+            make_scenario(numero, sim=(1, -1, 0, 0), nao=(-1, 1, 0, 0))
+
+    def setUp(self):
+        self.game = _create_game()
+        self.url = reverse('game:game', args=[self.game.codigo])
+
+    def set_bots(self, **strategies):
+        self.client.post(self.url, {'set_bots': '1', **{f'bot_{p}': s for p, s in strategies.items()}})
+
+    def test_bots_vote_in_the_same_request(self):
+        self.set_bots(**{'Lider Militar': 'selfish', 'Lider da População': 'lookahead'})
+        # Mesmo orçamento de consultas da rodada só com humanos
+        ballot = on_table(self.game, {'choice_Presidente': 'A', 'choice_Lider Politico': 'A'})
+        with self.assertNumQueries(9):
+            self.client.post(self.url, ballot)
+
+        choices = dict(Choice.objects.filter(round__game=self.game).values_list('player__papel', 'escolha'))
+        self.assertEqual(len(choices), len(DEFAULT_PLAYERS))
+        # O egoísta vota no que sobe a segurança (B)
+        self.assertEqual(choices['Lider Militar'], 'B')
+        self.assertEqual(GameState.objects.get(game=self.game).rodada_atual, 2)
+
+    def test_last_human_phone_vote_triggers_bots(self):
+        self.set_bots(**{'Lider Militar': 'random', 'Lider Politico': 'cooperative', 'Lider da População': 'selfish'})
+        state = cast_vote(self.game.codigo, 'Presidente', 'A', 1)
+        self.assertEqual(state['rodada'], 2)
+        self.assertEqual(set(state['bots']), {'Lider Militar', 'Lider Politico', 'Lider da População'})
+
+        with self.assertRaises(VoteError):
+            cast_vote(self.game.codigo, 'Lider Militar', 'A', 2)
+
+    def test_bots_answer_the_human_votes(self):
+        # A e B tiram a estabilidade da faixa coletiva; só o empate a mantém
+        # Fora do banco: um cenário gravado aqui entraria no catálogo do processo
+        scenario = Scenario(impactos=[3, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0])
+        self.set_bots(Presidente='cooperative')
+        gs = GameState.objects.select_related('game').get(game=self.game)
+        players = list(Player.objects.filter(game=self.game))
+
+        humans = {'Lider Politico': 'A', 'Lider Militar': 'A', 'Lider da População': 'B'}
+        choices = bots.fill_votes(gs, players, scenario, humans)
+        self.assertEqual(choices, {**humans, 'Presidente': 'B'})
+        result = engine.resolve_round(engine.initial_state(), engine.ScenarioImpacts.from_model(scenario), choices)
+        self.assertEqual(result.opcao_vencedora, engine.OPTION_TIE)
+
+    def test_lookahead_avoids_collapse_and_respects_budget(self):
+        doom = engine.ScenarioImpacts(1, (-4, 0, 0, 0), (0, 0, 0, 0), (-4, 0, 0, 0))
+        rng = random.Random(0)
+        scenarios = [
+            engine.ScenarioImpacts(i, *(tuple(rng.randint(-2, 2) for _ in engine.INDICATORS) for _ in range(3)))
+            for i in range(2, 40)
+        ]
+        lookahead = bots.Lookahead([doom, *scenarios])
+        state = engine.State((4, 5, 5, 5), 1)
+
+        started = time.perf_counter()
+        self.assertEqual(lookahead.best_outcome(state, doom, budget=0.01), engine.OPTION_B)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        # As avaliações ficam para a próxima rodada
+        self.assertTrue(lookahead.table)
+
+
+class RulesetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ruleset = Ruleset.objects.create(
+            nome='conselho',
+            indicadores=['estabilidade', 'seguranca', 'economia', 'liberdade', 'saude'],
+            papeis=[['Presidente', 'estabilidade'], ['General', 'seguranca'], ['Ministro', 'economia'],
+                    ['Ativista', 'liberdade'], ['Médica', 'saude'], ['Juiz', 'estabilidade']],
+            iniciais=[5, 5, 5, 5, 4],
+            rotulos={'saude': '🏥 Saúde'},
+            rodadas=2,
+        )
+        make_scenario(1, sim=(1, 0, 0, 0, -1), nao=(0, 0, 0, 0, 1), empate=(0, 0, 0, 0, 0), ruleset=cls.ruleset)
+        # Vetor do tamanho do ruleset padrão: fica fora do catálogo do conselho
+        make_scenario(2, ruleset=cls.ruleset)
+        make_scenario(3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_catalog_splits_scenarios_by_ruleset(self):
+        cat = catalog.get_catalog()
+        rules = cat.rules(cat.ruleset_id('conselho'))
+        self.assertEqual((len(rules.indicadores), len(rules.papeis)), (5, 6))
+        self.assertEqual(rules.outcomes, engine.OUTCOMES)
+        self.assertEqual(cat.ids_for(self.ruleset.pk), [Scenario.objects.get(numero=1).pk])
+        self.assertEqual(cat.ids, [Scenario.objects.get(numero=3).pk])
+
+    def test_game_with_five_indicators_and_six_players(self):
+        game = _create_game(self.ruleset.pk)
+        players = list(Player.objects.filter(game=game).values_list('papel', flat=True))
+        self.assertEqual(len(players), 6)
+        gs = GameState.objects.get(game=game)
+        self.assertEqual(gs.indicadores, [5, 5, 5, 5, 4])
+
+        url = reverse('game:game', args=[game.codigo])
+        response = self.client.get(url)
+        self.assertContains(response, '🏥 Saúde: 4/8')
+        self.assertContains(response, 'Rodada 1/2')
+
+        ballot = {f'choice_{papel}': 'A' for papel in players}
+        self.client.post(url, on_table(game, ballot))
+        gs.refresh_from_db()
+        self.assertEqual(gs.indicadores, [6, 5, 5, 5, 3])
+        scores = dict(Player.objects.filter(game=game).values_list('papel', 'pontuacao_individual'))
+        self.assertEqual((scores['Presidente'], scores['Juiz'], scores['Médica']), (1, 1, 0))
+
+        self.client.post(url, on_table(game, ballot))
+        session = GameSession.objects.get()
+        self.assertEqual(session.status, 'COMPLETO')
+        self.assertEqual(session.ruleset, self.ruleset)
+        self.assertEqual(session.indicadores_finais['saude'], 2)
+
+        frames = replay.get_trajectory(session.pk)
+        self.assertEqual(frames[-1]['indicadores'], session.indicadores_finais)
+
+        # Editar o ruleset depois não muda o replay: as regras da época estão no blob
+        self.ruleset.iniciais = [3, 3, 3, 3, 3]
+        self.ruleset.faixa_min, self.ruleset.faixa_max = 1, 2
+        self.ruleset.save()
+        cache.clear()
+        self.assertEqual(replay.get_trajectory(session.pk), frames)
+
+    def test_invalid_ruleset_is_rejected(self):
+        ruleset = Ruleset(nome='ruim', indicadores=['a'], papeis=[['X', 'b']], iniciais=[5])
+        with self.assertRaises(ValidationError):
+            ruleset.full_clean()
+
+
+class StateApiTests(TestCase):
+    def setUp(self):
+        make_scenario(1)
+        self.game = _create_game()
+        self.url = reverse('game:state', args=[self.game.codigo])
+
+    def test_conditional_get_and_long_poll_timeout(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rodada'], 1)
+        self.assertEqual(response.json()['cenario_id'], self.game.deck[0])
+        etag = response['ETag']
+
+        # Estado igual: 304 com uma consulta só
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url, {'versao': etag, 'wait': '0.05'})
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_version_after_vote(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.post(reverse('game:game', args=[self.game.codigo]), on_table(self.game, votes('A', 'A', 'A', 'A')))
+
+        response = self.client.get(self.url, {'versao': etag, 'wait': '5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['rodada'], 2)
+
+    def test_unknown_room(self):
+        self.assertEqual(self.client.get(reverse('game:state', args=['NAOEXISTE'])).status_code, 404)
+
+
+class RealtimeTests(TransactionTestCase):
+    def setUp(self):
+        for numero in range(1, MAX_ROUNDS + 1):
+            make_scenario(numero, sim=(1, -1, 0, 0), nao=(-1, 1, 0, 0))
+        self.game = _create_game()
+
+    def connect(self, codigo, player=None):
+        path = f'/ws/game/{codigo}/' if player is None else f'/ws/game/{codigo}/{player.token}/'
+        return ApplicationCommunicator(websocket_application, {'type': 'websocket', 'path': path})
+
+    async def receive_json(self, communicator):
+        return json.loads((await communicator.receive_output(timeout=2))['text'])
+
+    async def join(self, communicator):
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual(await communicator.receive_output(timeout=2), {'type': 'websocket.accept'})
+        return await self.receive_json(communicator)
+
+    async def vote(self, communicator, **message):
+        await communicator.send_input({'type': 'websocket.receive', 'text': json.dumps({'type': 'vote', **message})})
+
+    def test_unknown_room_is_rejected(self):
+        async def scenario():
+            communicator = self.connect('NAOEXISTE')
+            await communicator.send_input({'type': 'websocket.connect'})
+            return await communicator.receive_output(timeout=2)
+
+        self.assertEqual(async_to_sync(scenario)(), {'type': 'websocket.close', 'code': 4404})
+
+    def test_player_from_another_room_is_rejected(self):
+        other = Player.objects.filter(game=_create_game()).first()
+
+        async def scenario():
+            communicator = self.connect(self.game.codigo, other)
+            await communicator.send_input({'type': 'websocket.connect'})
+            return await communicator.receive_output(timeout=2)
+
+        self.assertEqual(async_to_sync(scenario)(), {'type': 'websocket.close', 'code': 4404})
+
+    def test_player_link_needs_the_token(self):
+        player = Player.objects.filter(game=self.game).first()
+        response = self.client.get(reverse('game:player', args=[self.game.codigo, player.token]))
+        self.assertContains(response, f'/ws/game/{self.game.codigo}/{player.token}/')
+        # O id sequencial não abre a tela de ninguém
+        self.assertEqual(self.client.get(reverse('game:player', args=[self.game.codigo, player.pk])).status_code, 404)
+
+    def test_last_vote_resolves_round_for_every_client(self):
+        players = list(Player.objects.filter(game=self.game).order_by('pk'))
+
+        async def scenario():
+            # Um celular por jogador e a tela da sala, que só acompanha
+            clients = [self.connect(self.game.codigo, player) for player in players]
+            clients.append(self.connect(self.game.codigo))
+            for communicator in clients:
+                self.assertEqual((await self.join(communicator))['rodada'], 1)
+
+            for communicator, escolha in zip(clients, 'AABA'):
+                await self.vote(communicator, escolha=escolha, rodada=1)
+
+            states = []
+            for communicator in clients:
+                received = [await self.receive_json(communicator) for _ in players]
+                states.append(received)
+                await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+                await communicator.wait(timeout=2)
+            return states
+
+        for received in async_to_sync(scenario)():
+            self.assertEqual([len(state['votaram']) for state in received], [1, 2, 3, 0])
+            self.assertEqual(received[-1]['rodada'], 2)
+            self.assertEqual(received[-1]['indicadores']['estabilidade'], 6)
+
+        self.assertEqual(Round.objects.get(game=self.game).votos_a, 3)
+
+    def test_connection_votes_only_for_its_own_role(self):
+        presidente, militar = Player.objects.filter(game=self.game).order_by('pk')[:2]
+
+        async def scenario():
+            phone = self.connect(self.game.codigo, presidente)
+            room = self.connect(self.game.codigo)
+            await self.join(phone)
+            await self.join(room)
+
+            await self.vote(phone, papel=militar.papel, escolha='A', rodada=1)
+            other_role = await self.receive_json(phone)
+            await self.vote(room, papel=presidente.papel, escolha='A', rodada=1)
+            read_only = await self.receive_json(room)
+            for communicator in (phone, room):
+                await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+                await communicator.wait(timeout=2)
+            return other_role, read_only
+
+        other_role, read_only = async_to_sync(scenario)()
+        self.assertEqual(other_role, {'type': 'error', 'message': f'Esta conexão vota só como {presidente.papel}.'})
+        self.assertEqual(read_only['type'], 'error')
+        self.assertEqual(GameState.objects.get(game=self.game).votos_pendentes, {})
+
+    def test_malformed_messages_get_an_error_frame(self):
+        presidente = Player.objects.filter(game=self.game).order_by('pk').first()
+
+        async def scenario():
+            phone = self.connect(self.game.codigo, presidente)
+            await self.join(phone)
+            replies = []
+            await phone.send_input({'type': 'websocket.receive', 'text': '[1, 2]'})
+            replies.append(await self.receive_json(phone))
+            await self.vote(phone, escolha='A', rodada=1, tipo_comunicacao='TALVEZ')
+            replies.append(await self.receive_json(phone))
+            await phone.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await phone.wait(timeout=2)
+            return replies
+
+        self.assertEqual([reply['type'] for reply in async_to_sync(scenario)()], ['error', 'error'])
+        self.assertEqual(GameState.objects.get(game=self.game).votos_pendentes, {})
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        cache.delete(ANALYTICS_CACHE_KEY)
+        make_scenario(1, sim=(-4, 0, 0, 0), nao=(-4, 0, 0, 0), empate=(-4, 0, 0, 0))
+        self.url = reverse('game:analytics')
+
+    def play_collapsing_game(self):
+        game = _create_game()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('game:game', args=[game.codigo]), on_table(game, votes('A', 'A', 'A', 'A')))
+
+    def test_analytics_are_cached_until_a_session_is_saved(self):
+        self.play_collapsing_game()
+
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url, {'format': 'json'}).json()
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'format': 'json'})
+
+        [grupo] = data['grupos']
+        self.assertEqual((grupo['sessoes'], grupo['colapsos'], grupo['taxa_colapso']), (1, 1, 1.0))
+        self.assertEqual(grupo['indicadores']['estabilidade']['distribuicao'][0], 1)
+        self.assertEqual(grupo['papeis']['Presidente'], {'individual': 0.0, 'coletiva': 0.0})
+
+        self.play_collapsing_game()
+        self.assertEqual(self.client.get(self.url, {'format': 'json'}).json()['grupos'][0]['sessoes'], 2)
+
+    def test_sessions_saved_by_other_workers_show_up_after_the_ttl(self):
+        self.play_collapsing_game()
+        self.client.get(self.url)
+        # Gravada por outro processo: o cache deste não foi limpo
+        GameSession.objects.create(
+            nome_sessao='Outro worker', rounds_completados=8, pontuacoes_individuais={}, pontuacoes_coletivas={},
+        )
+        self.assertEqual(self.client.get(self.url, {'format': 'json'}).json()['grupos'][0]['sessoes'], 1)
+
+        expired = time.time() + ANALYTICS_CACHE_TTL + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=expired):
+            data = self.client.get(self.url, {'format': 'json'}).json()
+        self.assertEqual(sum(grupo['sessoes'] for grupo in data['grupos']), 2)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        make_scenario(1)
+        self.game = _create_game()
+        self.client.post(reverse('game:game', args=[self.game.codigo]), on_table(self.game, votes('A', 'B', 'A', 'A')))
+        staff = get_user_model().objects.create_user('staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+
+    def test_export_requires_staff(self):
+        self.client.logout()
+        response = self.client.get(reverse('game:export', args=['choices', 'csv']))
+        self.assertEqual(response.status_code, 302)
+
+    def test_streams_csv(self):
+        response = self.client.get(reverse('game:export', args=['choices', 'csv']))
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,round_id,sala,rodada,papel,escolha,alinhado,impacto,pontos_ganhos,timestamp')
+        self.assertEqual(len(lines), 1 + len(DEFAULT_PLAYERS))
+
+    def test_streams_gzipped_ndjson_with_filters(self):
+        response = self.client.get(
+            reverse('game:export', args=['rounds', 'ndjson']), {'gzip': '1', 'desde': '2000-01-01'}
+        )
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="rounds.ndjson.gz"')
+        [record] = [json.loads(line) for line in gzip.decompress(b''.join(response.streaming_content)).splitlines()]
+        self.assertEqual((record['sala'], record['votos_a'], record['opcao_vencedora']), (self.game.codigo, 3, 'A'))
+
+        for desde in ('ontem', '2024-02-30'):
+            response = self.client.get(reverse('game:export', args=['rounds', 'csv']), {'desde': desde})
+            self.assertEqual(response.status_code, 400)
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'rounds', since='2024-02-30', stdout=io.StringIO())
+
+    def test_archived_history(self):
+        # Colapso na primeira rodada: a sessão é arquivada e as tabelas quentes esvaziadas
+        make_scenario(2, empate=(-4, 0, 0, 0))
+        game = _create_game()
+        game.deck = [2]
+        game.save(update_fields=['deck'])
+        self.client.post(reverse('game:game', args=[game.codigo]), on_table(game, votes('A', 'B', 'B', 'A')))
+        self.assertFalse(Round.objects.filter(game=game).exists())
+
+        session = GameSession.objects.get()
+        response = self.client.get(reverse('game:session_history', args=[session.pk]))
+        [rodada] = response.json()['rodadas']
+        self.assertEqual(response.json()['sala'], game.codigo)
+        self.assertEqual((rodada['numero'], rodada['cenario'], rodada['opcao_vencedora']), (1, 2, 'E'))
+        self.assertEqual(list(rodada['votos'].values()), ['A', 'B', 'B', 'A'])
+        self.assertEqual(rodada['impacto']['estabilidade'], -4)
+
+        response = self.client.get(reverse('game:export', args=['archived_choices', 'csv']))
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'session_id,sala,rodada,cenario,opcao_vencedora,papel,escolha,alinhado,timestamp')
+        self.assertEqual(len(lines), 1 + len(DEFAULT_PLAYERS))
+
+        self.assertEqual(self.client.get(reverse('game:session_history', args=[session.pk + 1])).status_code, 404)
+
+
+class SolverTests(SimpleTestCase):
+    def test_unavoidable_collapse(self):
+        doom = engine.ScenarioImpacts(1, (-4, 0, 0, 0), (-4, 0, 0, 0), (-4, 0, 0, 0))
+        solution = solver.Solver([doom]).solve()
+        self.assertEqual((solution.p_complete, solution.p_collapse), (0.0, 1.0))
+
+    def test_optimal_choice_avoids_collapse(self):
+        # Só o empate evita o colapso e ainda rende o ponto coletivo
+        risky = engine.ScenarioImpacts(1, (-4, 0, 0, 0), (0, -4, 0, 0), (0, 0, 0, 0))
+        solution = solver.Solver([risky]).solve()
+        self.assertEqual(solution.p_complete, 1.0)
+        self.assertEqual(solution.expected_collective, MAX_ROUNDS)
+        self.assertEqual(
+            solver.Solver([risky]).best_outcome(engine.initial_state(), risky), engine.OPTION_TIE
+        )
+
+    def test_exact_draw_tracks_used_scenarios(self):
+        # Sem reposição o cenário ruim sai obrigatoriamente em uma das duas rodadas
+        good = engine.ScenarioImpacts(1, (0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 0))
+        bad = engine.ScenarioImpacts(2, (-4, 0, 0, 0), (-4, 0, 0, 0), (-4, 0, 0, 0))
+        exact = solver.Solver([good, bad], exact=True, rounds=2).solve()
+        with_replacement = solver.Solver([good, bad], rounds=2).solve()
+        self.assertEqual(exact.p_complete, 0.0)
+        self.assertEqual(with_replacement.p_complete, 0.25)
+
+    def test_default_objective_is_not_worse_than_greedy_play(self):
+        _, _, records = catalog.read_catalog()
+        scenarios = [engine.ScenarioImpacts.from_vector(i, r['impactos']) for i, r in enumerate(records)]
+
+        # Valor exato da política cooperativa gulosa, com o mesmo sorteio do solver
+        @lru_cache(maxsize=None)
+        def greedy(indicadores, rodada):
+            if rodada > MAX_ROUNDS:
+                return (1.0, 0.0)
+            p = c = 0.0
+            for scenario in scenarios:
+                state = engine.State(indicadores, rodada)
+                result = engine.resolve_round(state, scenario, simulation.cooperative_policy(state, scenario, None))
+                if not result.colapso:
+                    next_p, next_c = greedy(result.state.indicadores, rodada + 1)
+                    p, c = p + next_p, c + next_c + result.ponto_coletivo
+            return (p / len(scenarios), c / len(scenarios))
+
+        p_greedy, c_greedy = greedy(engine.initial_state().indicadores, 1)
+        # Sobreviver antes de tudo não pode trocar pontos coletivos por
+        # diferenças de ponto flutuante na chance de completar
+        solution = solver.Solver(scenarios).solve()
+        self.assertGreaterEqual(solution.p_complete, p_greedy)
+        self.assertGreaterEqual(solution.expected_collective, c_greedy)
+
+
+@skipIf(vectorized.np is None, 'NumPy não instalado')
+class VectorizedParityTests(SimpleTestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.scenarios = [
+            engine.ScenarioImpacts(i, *(tuple(rng.randint(-2, 2) for _ in engine.INDICATORS) for _ in range(3)))
+            for i in range(12)
+        ]
+        self.tensor = vectorized.impact_tensor(self.scenarios)
+        self.points = vectorized.points_tensor(self.scenarios)
+        self.decks = vectorized.deal_batch(len(self.scenarios), 300, vectorized.np.random.default_rng(3))
+
+    def assert_parity(self, policy_name):
+        batch = vectorized.play_batch(self.tensor, self.points, self.decks, policy_name, vectorized.np.random.default_rng(0))
+        policy = simulation.POLICIES[policy_name]
+
+        for i, deck in enumerate(self.decks):
+            expected = simulation.play_deck([self.scenarios[j] for j in deck], policy, random.Random(0))
+            got = (
+                bool(batch['colapso'][i]),
+                int(batch['rodadas'][i]),
+                tuple(int(v) for v in batch['individual'][i]),
+                int(batch['coletiva'][i]),
+                int(batch['consensos'][i]),
+                int(batch['empates'][i]),
+            )
+            self.assertEqual(got, expected, f'partida {i}')
+
+    def test_always_a_matches_scalar_engine(self):
+        self.assert_parity('always_a')
+
+    def test_cooperative_matches_scalar_engine(self):
+        self.assert_parity('cooperative')
+
+    def test_stats_match_scalar_simulation(self):
+        batch = vectorized.play_batch(self.tensor, self.points, self.decks, 'cooperative', vectorized.np.random.default_rng(0))
+        expected = simulation.SimulationStats()
+        for deck in self.decks:
+            expected.add(*simulation.play_deck(
+                [self.scenarios[j] for j in deck], simulation.cooperative_policy, random.Random(0)
+            ))
+        self.assertEqual(vectorized.stats_from_batch(batch).summary(), expected.summary())
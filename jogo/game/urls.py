@@ -1,9 +1,30 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# No ASGI as telas da sala usam as views assíncronas (ver poc_game/asgi.py)
+if settings.GAME_ASYNC_VIEWS:
+    game_view, player_view = views.agame_view, views.aplayer_view
+else:
+    game_view, player_view = views.game_view, views.player_view
+
 app_name = 'game'
 
 urlpatterns = [
-    # Jogo principal
-    path('', views.game_view, name='game'),
+    # Lobby: criar sala ou entrar com o código
+    path('', views.lobby_view, name='lobby'),
+    # Análises das sessões salvas (?format=json para o JSON)
+    path('analises/', views.analytics_view, name='analytics'),
+    # Exportação em streaming: sessions|rounds|choices|archived_choices . csv|ndjson
+    path('exportar/<str:dataset>.<str:fmt>', views.export_view, name='export'),
+    # Histórico arquivado de uma sessão encerrada (rodadas e votos)
+    path('sessoes/<int:session_id>/historico/', views.session_history_view, name='session_history'),
+    # Replay rodada a rodada de uma sessão encerrada (?rodada=k, ?format=json)
+    path('sessoes/<int:session_id>/replay/', views.replay_view, name='replay'),
+    # Jogo principal de uma sala
+    path('<slug:codigo>/', game_view, name='game'),
+    # Estado em JSON com ETag e long-polling (?wait=segundos)
+    path('<slug:codigo>/estado/', views.state_view, name='state'),
+    # Tela individual do jogador (vota pelo WebSocket)
+    path('<slug:codigo>/jogador/<slug:token>/', player_view, name='player'),
 ]
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Simulador em lote com NumPy.
+
+Os impactos de cada cenário formam um tensor (n_cenarios, 3 opções,
+indicadores) e as points_table do motor outro, (n_cenarios, papéis,
+2 votos, 3 resultados); cada rodada é aplicada de uma vez a todas as partidas do
+lote, com máscaras para colapso e para a faixa coletiva. As regras são as
+mesmas de game.engine (um engine.Rules, padrão ou de um ruleset) e as estatísticas saem num SimulationStats, como em
+game.simulation.
+
+NumPy é opcional: só é importado ao usar este módulo.
+"""
+from collections import Counter
+
+from . import engine
+from .engine import DEFAULT_RULES, OUTCOMES, VOTES
+from .simulation import SimulationStats
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+# Índices das opções no tensor (mesma ordem de engine.OUTCOMES)
+A, B, TIE = range(3)
+
+VECTORIZED_POLICIES = ('random', 'always_a', 'selfish', 'cooperative')
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError('O simulador vetorizado precisa do NumPy: pip install numpy')
+
+
+def impact_tensor(scenarios):
+    """Tensor (n_cenarios, 3, indicadores) a partir de uma sequência de ScenarioImpacts"""
+    require_numpy()
+    return np.array([(s.sim, s.nao, s.empate) for s in scenarios], dtype=np.int16)
+
+
+def points_tensor(scenarios, rules=DEFAULT_RULES):
+    """Tensor (n_cenarios, papéis, 2, 3) com a points_table de cada cenário"""
+    require_numpy()
+    return np.array(
+        [engine.points_table(s, rules) for s in scenarios], dtype=np.int8,
+    ).reshape(len(scenarios), len(rules.papeis), len(VOTES), len(OUTCOMES))
+
+
+def deal_batch(n_scenarios, n_games, rng, rounds=DEFAULT_RULES.rodadas):
+    """Índices de cenário (n_games, rounds): uma permutação por partida"""
+    require_numpy()
+    decks = []
+    dealt = 0
+    while dealt < rounds:
+        decks.append(rng.random((n_games, n_scenarios)).argsort(axis=1))
+        dealt += n_scenarios
+    return np.concatenate(decks, axis=1)[:, :rounds]
+
+
+def _outcome_keys(indicadores, impacts, rules=DEFAULT_RULES):
+    """
+    Versão inteira de simulation.outcome_score para as três opções:
+    (n, 3). Distâncias em dobro para ficar em inteiros.
+    """
+    lo, hi = rules.faixa
+    after = np.clip(indicadores[:, None, :] + impacts, rules.minimo, rules.maximo)
+    not_collapsed = ~(after == rules.colapso).any(axis=2)
+    in_band = ((after >= lo) & (after <= hi)).all(axis=2)
+    distance = np.abs(2 * after - (lo + hi)).sum(axis=2)
+    return not_collapsed * 10_000 + in_band * 1_000 - distance
+
+
+def _votes(policy, indicadores, impacts, role_index, rng, rules=DEFAULT_RULES):
+    """Votos (n, jogadores) com 0 = A e 1 = B"""
+    n = len(indicadores)
+    n_players = len(role_index)
+
+    if policy == 'random':
+        return rng.integers(0, 2, size=(n, n_players))
+
+    if policy == 'always_a':
+        return np.zeros((n, n_players), dtype=np.int64)
+
+    if policy == 'selfish':
+        sim = impacts[:, A, role_index]
+        nao = impacts[:, B, role_index]
+        votes = (nao > sim).astype(np.int64)
+        draw = sim == nao
+        votes[draw] = rng.integers(0, 2, size=int(draw.sum()))
+        return votes
+
+    if policy == 'cooperative':
+        keys = _outcome_keys(indicadores, impacts, rules)
+        if n_players % 2:
+            keys = keys[:, :TIE]
+        best = keys.argmax(axis=1)
+        votes = np.repeat(best[:, None], n_players, axis=1)
+        # Empate: primeira metade vota A, a outra B (simulation.votes_for_outcome)
+        tie = best == TIE
+        votes[tie] = (np.arange(n_players) >= n_players // 2).astype(np.int64)
+        return votes
+
+    raise ValueError(f'Política desconhecida: {policy}')
+
+
+def play_batch(tensor, points, decks, policy, rng, roles=None, rules=DEFAULT_RULES):
+    """
+    Joga todas as partidas de decks (n_games, rodadas) em paralelo, com o
+    tensor de impactos e o de pontos (points_tensor) dos mesmos cenários.
+    roles escolhe (e ordena) os jogadores; por padrão, todos os do ruleset.
+
+    Devolve um dict de arrays por partida: colapso, rodadas, individual
+    (n_games, jogadores), coletiva, consensos e empates.
+    """
+    require_numpy()
+    n_games = len(decks)
+    roles = rules.papeis if roles is None else roles
+    role_index = np.array([rules.role_index[papel] for papel in roles])
+    role_position = np.array([rules.papeis.index(papel) for papel in roles])
+    n_players = len(role_index)
+    games = np.arange(n_games)
+    lo, hi = rules.faixa
+
+    indicadores = np.tile(np.array(rules.iniciais, dtype=np.int16), (n_games, 1))
+    active = np.ones(n_games, dtype=bool)
+    colapso = np.zeros(n_games, dtype=bool)
+    rodadas = np.zeros(n_games, dtype=np.int64)
+    individual = np.zeros((n_games, n_players), dtype=np.int64)
+    coletiva = np.zeros(n_games, dtype=np.int64)
+    consensos = np.zeros(n_games, dtype=np.int64)
+    empates = np.zeros(n_games, dtype=np.int64)
+
+    for rodada in range(decks.shape[1]):
+        if not active.any():
+            break
+
+        impacts = tensor[decks[:, rodada]]
+        votes = _votes(policy, indicadores, impacts, role_index, rng, rules)
+
+        votos_b = votes.sum(axis=1)
+        votos_a = n_players - votos_b
+        outcome = np.where(votos_a > votos_b, A, np.where(votos_b > votos_a, B, TIE))
+
+        new = np.clip(indicadores + impacts[games, outcome], rules.minimo, rules.maximo)
+        indicadores = np.where(active[:, None], new, indicadores)
+
+        # Pontos individuais: uma leitura na tabela por (cenário, papel, voto, resultado)
+        pontos = points[decks[:, rodada][:, None], role_position[None, :], votes, outcome[:, None]]
+        individual += pontos * active[:, None]
+
+        band = ((indicadores >= lo) & (indicadores <= hi)).all(axis=1)
+        coletiva += band & active
+        consensos += ((votos_a == 0) | (votos_b == 0)) & active
+        empates += (votos_a == votos_b) & (votos_a > 0) & active
+        rodadas += active
+
+        collapsed = (indicadores == rules.colapso).any(axis=1) & active
+        colapso |= collapsed
+        active &= ~collapsed
+
+    return {
+        'colapso': colapso,
+        'rodadas': rodadas,
+        'individual': individual,
+        'coletiva': coletiva,
+        'consensos': consensos,
+        'empates': empates,
+    }
+
+
+def _histogram(values):
+    counts = np.bincount(values)
+    return Counter({int(k): int(v) for k, v in enumerate(counts) if v})
+
+
+def stats_from_batch(batch, roles=DEFAULT_RULES.papeis):
+    stats = SimulationStats(roles)
+    stats.games = len(batch['rodadas'])
+    stats.colapsos = int(batch['colapso'].sum())
+    stats.rodadas = int(batch['rodadas'].sum())
+    stats.consensos = int(batch['consensos'].sum())
+    stats.empates = int(batch['empates'].sum())
+    stats.rodadas_hist = _histogram(batch['rodadas'])
+    stats.coletiva_hist = _histogram(batch['coletiva'])
+    stats.individual_hist = {
+        papel: _histogram(batch['individual'][:, i]) for i, papel in enumerate(roles)
+    }
+    return stats
+
+
+def simulate_vectorized(scenarios, policy_name, n_games, seed=0, batch_size=100_000, rules=DEFAULT_RULES):
+    """Mesmo contrato de simulation.simulate(), em lotes vetorizados"""
+    require_numpy()
+    if policy_name not in VECTORIZED_POLICIES:
+        raise ValueError(f'Política desconhecida: {policy_name}')
+
+    tensor = impact_tensor(scenarios)
+    points = points_tensor(scenarios, rules)
+    rng = np.random.default_rng(seed)
+    stats = SimulationStats(rules.papeis)
+    for start in range(0, n_games, batch_size):
+        size = min(batch_size, n_games - start)
+        decks = deal_batch(len(tensor), size, rng, rules.rodadas)
+        stats.merge(stats_from_batch(play_batch(tensor, points, decks, policy_name, rng, rules=rules), rules.papeis))
+    return stats
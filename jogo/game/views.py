@@ -1,90 +1,132 @@
-from django.shortcuts import render, redirect
-from django.db import transaction
-from django.db.models import Count
-from .models import Player, GameState, Scenario, Round, Choice, GameSession
-
-ROLE_INTEREST = {
-    'Presidente': 'estabilidade',
-    'Lider Militar': 'seguranca',
-    'Lider Politico': 'economia',
-    'Lider da População': 'liberdade',
-}
-
-DEFAULT_PLAYERS = [
-    ('Presidente', 'Presidente'),
-    ('Lider Militar', 'Lider Militar'),
-    ('Lider Politico', 'Lider Politico'),
-    ('Lider da População', 'Lider da População'),
-]
-
-MAX_ROUNDS = 8
-
-
-def _init_if_needed():
-    """Inicializa jogadores e estado do jogo se necessário"""
+import asyncio
+import logging
+import random
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponseBadRequest, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.utils import timezone
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from . import archive, bots, engine, events
+from .analytics import get_analytics, invalidate_analytics
+from .catalog import aget_catalog, get_catalog
+from .export import FORMATS, ExportError, filename, parse_day, stream_export
+from .layer import layer
+from .middleware import annotate_request
+from .replay import frame_at, get_trajectory
+from .models import Player, Game, GameState, Round, Choice, GameSession, generate_room_code, generate_seed
+
+logger = logging.getLogger(__name__)
+
+
+def _rules(game):
+    """Regras compiladas da sala (do catálogo em memória, sem consultas)"""
+    return get_catalog().rules(game.ruleset_id)
+
+
+def _init_if_needed(game):
+    """Inicializa jogadores e estado do jogo da sala se necessário"""
+    rules = _rules(game)
+
     # Criar jogadores se não existirem
-    if not Player.objects.exists():
-        for name, papel in DEFAULT_PLAYERS:
-            Player.objects.create(name=name, papel=papel)
-        print("DEBUG: Jogadores criados")
-
-    # Criar estado do jogo se não existir
-    if not GameState.objects.exists():
-        GameState.objects.create(
+    players = list(Player.objects.filter(game=game))
+    if not players:
+        players = Player.objects.bulk_create([
+            Player(game=game, name=name, papel=papel) for name, papel in rules.jogadores
+        ])
+        logger.debug("Jogadores criados na sala %s", game.codigo)
+
+    # Criar estado do jogo se não existir; é o primeiro evento do log
+    if not GameState.objects.filter(game=game).exists():
+        indicadores = rules.initial.indicadores
+        gs = GameState.objects.create(
+            game=game,
             rodada_atual=1,
-            estabilidade=5,
-            seguranca=5,
-            economia=5,
-            liberdade=5,
-            active=True
+            indicadores=list(indicadores),
+            active=True,
+            ultimo_evento=1,
         )
-        print("DEBUG: GameState criado")
-    else:
-        gs = GameState.objects.first()
-        print(f"DEBUG: GameState existente - ativo: {gs.active}, rodada: {gs.rodada_atual}")
-        # NÃO reativar automaticamente - deixar o usuário decidir
+        events.append(gs, players, [events.started(game, players, indicadores)])
+        logger.debug("GameState criado na sala %s", game.codigo)
+
+
+def _build_deck(seed, ruleset_id=None):
+    """Embaralha os ids dos cenários do ruleset a partir da seed (determinístico)"""
+    catalog = get_catalog()
+    scenario_ids = catalog.ids_for(ruleset_id)
+    if not scenario_ids:
+        return []
+
+    rounds = catalog.rules(ruleset_id).rodadas
+    rng = random.Random(seed)
+    deck = []
+    # Se houver menos cenários que rodadas, repete o baralho (fallback)
+    while len(deck) < rounds:
+        shuffled = scenario_ids[:]
+        rng.shuffle(shuffled)
+        deck.extend(shuffled)
+    return deck
+
+
+def _deal_deck(game, seed=None):
+    """Sorteia um novo baralho para a sala (início de partida ou reset)"""
+    game.seed = generate_seed() if seed is None else seed
+    game.deck = _build_deck(game.seed, game.ruleset_id)
+    game.save(update_fields=['seed', 'deck'])
+
+
+# Sorteios de código de sala antes de desistir (32^6 códigos: colidir
+# duas vezes seguidas já indica outro problema)
+ROOM_CODE_ATTEMPTS = 3
+
+
+def _insert_game(ruleset_id):
+    """Grava a sala; se o código sorteado já existe, sorteia outro"""
+    for attempt in range(1, ROOM_CODE_ATTEMPTS + 1):
+        codigo = generate_room_code()
+        try:
+            # Savepoint próprio: a colisão não derruba a transação de fora
+            with transaction.atomic():
+                return Game.objects.create(codigo=codigo, ruleset_id=ruleset_id)
+        except IntegrityError:
+            if attempt == ROOM_CODE_ATTEMPTS:
+                raise
+            logger.warning("Código de sala %s já em uso, sorteando outro", codigo)
 
 
-def _get_random_scenario_for_round(round_number):
-    """Pega um cenário aleatório que ainda não foi usado neste jogo"""
-    # Pegar cenários já usados neste jogo
-    used_scenarios = Round.objects.values_list('scenario_id', flat=True)
+def _create_game(ruleset_id=None):
+    """Cria uma sala nova, com código único, jogadores e estado inicial"""
+    with transaction.atomic():
+        game = _insert_game(ruleset_id)
+        _deal_deck(game, seed=game.seed)
+        _init_if_needed(game)
+    return game
 
-    # Pegar um cenário disponível
-    available_scenarios = Scenario.objects.exclude(id__in=used_scenarios)
 
-    if available_scenarios.exists():
-        return available_scenarios.order_by('?').first()  # Ordem aleatória
-    else:
-        # Se todos foram usados, pegar qualquer um (fallback)
-        return Scenario.objects.order_by('?').first()
+def _get_scenario_for_round(game, round_number):
+    """Pega o cenário da rodada no baralho da sala"""
+    if len(game.deck) < round_number:
+        # Sala criada antes de haver cenários cadastrados: sortear agora
+        _deal_deck(game, seed=game.seed)
+        if len(game.deck) < round_number:
+            return None
 
+    return get_catalog().get(game.deck[round_number - 1])
 
-def _save_game_session(gs, players, tipo_comunicacao='SIM'):
-    """Salva os dados da sessão quando o jogo termina"""
-    # Contar estatísticas
-    rounds = Round.objects.all()
-    total_consensos = 0
-    total_empates = 0
-
-    for round_obj in rounds:
-        choices_in_round = Choice.objects.filter(round=round_obj)
-        choice_counts = choices_in_round.values('escolha').annotate(count=Count('escolha'))
 
-        if len(choice_counts) == 1:  # Unanimous
-            total_consensos += 1
-        else:
-            # Check if it's a tie
-            counts = [item['count'] for item in choice_counts]
-            if len(set(counts)) == 1:  # All counts are equal (tie)
-                total_empates += 1
-
-    # Determinar status
-    if (gs.estabilidade == 1 or gs.seguranca == 1 or
-            gs.economia == 1 or gs.liberdade == 1):
+def _save_game_session(gs, players, tipo_comunicacao='SIM', rules=engine.DEFAULT_RULES):
+    """Salva os dados da sessão quando o jogo termina"""
+    # Determinar status. No colapso a rodada não avança; ao completar ela
+    # passa do número de rodadas
+    if engine.is_collapsed(_indicators(gs), rules):
         status = 'INTERROMPIDO'
+        rounds_completados = gs.rodada_atual
     else:
         status = 'COMPLETO'
+        rounds_completados = gs.rodada_atual - 1
 
     # Preparar dados dos jogadores
     pontuacoes_individuais = {}
@@ -98,220 +140,750 @@ def _save_game_session(gs, players, tipo_comunicacao='SIM'):
     tipo_display = 'Com Comunicação' if tipo_comunicacao == 'SIM' else 'Sem Comunicação'
     nome_sessao = f"Sessão {count} - {tipo_display}"
 
-    # Calcular rounds completados corretamente
-    rounds_completados = rounds.count()
-
     # Salvar sessão
     GameSession.objects.create(
         nome_sessao=nome_sessao,
         tipo_comunicacao=tipo_comunicacao,
         status=status,
         rounds_completados=rounds_completados,
-        estabilidade_final=gs.estabilidade,
-        seguranca_final=gs.seguranca,
-        economia_final=gs.economia,
-        liberdade_final=gs.liberdade,
+        indicadores_finais=rules.named(gs.indicadores),
+        ruleset_id=gs.game.ruleset_id,
+        game=gs.game,
         pontuacoes_individuais=pontuacoes_individuais,
         pontuacoes_coletivas=pontuacoes_coletivas,
-        total_consensos=total_consensos,
-        total_empates=total_empates,
+        total_consensos=gs.total_consensos,
+        total_empates=gs.total_empates,
+        historico=archive.archive_game(gs.game, players, rules),
     )
 
-    print(f"DEBUG: Sessão salva - {rounds_completados} rounds completados, status: {status}")
+    # O histórico foi para o blob da sessão: rodadas e escolhas saem das tabelas quentes
+    archive.clear_hot_tables(gs.game)
 
+    # As análises agregadas ficam em cache até entrar uma sessão nova
+    transaction.on_commit(invalidate_analytics)
 
-def clamp(v, lo=1, hi=8):
-    """Limita valores entre 1 e 8"""
-    return max(lo, min(hi, v))
+    logger.info("Sessão salva: sala %s, %s rodadas completadas, status %s", gs.game.codigo, rounds_completados, status)
 
 
-def game_view(request):
-    _init_if_needed()
-    gs = GameState.objects.first()
-    players = list(Player.objects.all())
+def _apply_player_points(game, aligned_ids, ponto_coletivo):
+    """Soma os pontos da rodada a todos os jogadores da sala em um só UPDATE"""
+    if not aligned_ids and not ponto_coletivo:
+        return
 
-    # Debug info
-    print(f"DEBUG: GameState - active: {gs.active}, rodada: {gs.rodada_atual}")
+    if aligned_ids:
+        ponto_individual = Case(When(pk__in=aligned_ids, then=Value(1)), default=Value(0))
+    else:
+        ponto_individual = Value(0)
+
+    Player.objects.filter(game=game).update(
+        pontuacao_individual=F('pontuacao_individual') + ponto_individual,
+        pontuacao_coletiva=F('pontuacao_coletiva') + ponto_coletivo,
+    )
+
+
+def _indicators(gs):
+    """Indicadores do GameState como tupla, na ordem do ruleset da sala"""
+    return tuple(gs.indicadores)
+
+
+# Campos do GameState gravados por _save_state
+STATE_FIELDS = (
+    'rodada_atual', 'indicadores', 'active', 'total_consensos', 'total_empates', 'votos_pendentes',
+    'ultimo_evento',
+)
+
+
+class StaleStateError(Exception):
+    """O GameState mudou desde a leitura: outra submissão chegou antes"""
+
+
+def _save_state(gs, fields=STATE_FIELDS):
+    """
+    Grava os campos do GameState com compare-and-swap na versão lida: um
+    UPDATE ... WHERE versao = lida, sem lock. Levanta StaleStateError se
+    outra requisição gravou antes. Quem vai registrar eventos soma a
+    quantidade em gs.ultimo_evento antes: os seqs ficam reservados aqui
+    """
+    values = {name: getattr(gs, name) for name in fields}
+    values['updated_at'] = timezone.now()
+    updated = GameState.objects.filter(pk=gs.pk, versao=gs.versao).update(
+        versao=F('versao') + 1, **values,
+    )
+    if not updated:
+        raise StaleStateError(f"Sala {gs.game.codigo}: estado mudou (versão {gs.versao})")
+    gs.versao += 1
+    gs.updated_at = values['updated_at']
+
+
+def _resolve_round(gs, players, scenario, choices, tipo_comunicacao='SIM'):
+    """
+    Resolve a rodada no motor e persiste o resultado. Deve rodar dentro de
+    transaction.atomic(). O GameState é gravado primeiro, com
+    compare-and-swap: se outra submissão resolveu a rodada antes, sai com
+    StaleStateError sem ter escrito nada
+    """
+    game = gs.game
+    state = engine.State(_indicators(gs), gs.rodada_atual, gs.active)
+    catalog = get_catalog()
+    rules = catalog.rules(game.ruleset_id)
+    impacts = catalog.impacts.get(scenario.pk) or engine.ScenarioImpacts.from_model(scenario)
+    result = engine.resolve_round(state, impacts, choices, catalog.pontos.get(scenario.pk), rules)
+    impacto_final = rules.named(result.impacto)
+
+    logger.debug("Sala %s rodada %s: votos A=%s B=%s", game.codigo, gs.rodada_atual, result.votos_a, result.votos_b)
+
+    # Aplicar o novo estado do país (compare-and-swap: reivindica a rodada)
+    numero = gs.rodada_atual
+    gs.indicadores = list(result.state.indicadores)
+    gs.rodada_atual = result.state.rodada
+    gs.active = result.state.active
+    gs.votos_pendentes = {}
+    if result.votos_a == 0 or result.votos_b == 0:
+        gs.total_consensos += 1
+    elif result.votos_a == result.votos_b:
+        gs.total_empates += 1
+    pending = [events.round_resolved(numero, scenario.pk, choices, result)]
+    if not gs.active:
+        pending.append(events.ended(numero, result.colapso))
+    gs.ultimo_evento += len(pending)
+    _save_state(gs)
+
+    # Criar round
+    rnd = Round.objects.create(
+        game=game,
+        numero=numero,
+        scenario=scenario,
+        votos_a=result.votos_a,
+        votos_b=result.votos_b,
+        opcao_vencedora=result.opcao_vencedora,
+    )
+
+    # Escolhas e pontuação individual (gravadas em lote)
+    new_choices = []
+    aligned_ids = []
+    for p in players:
+        aligned = result.alinhados[p.papel]
+        new_choices.append(Choice(
+            player=p,
+            round=rnd,
+            escolha=choices[p.papel],
+            alinhado=aligned,
+            impacto=impacto_final,
+            pontos_ganhos=1 if aligned else 0
+        ))
+        if aligned:
+            p.pontuacao_individual += 1
+            aligned_ids.append(p.pk)
+        if result.ponto_coletivo:
+            p.pontuacao_coletiva += 1
+
+    Choice.objects.bulk_create(new_choices)
+
+    # Um único UPDATE para as pontuações de todos os jogadores da sala
+    _apply_player_points(game, aligned_ids, 1 if result.ponto_coletivo else 0)
+    events.append(gs, players, pending)
+
+    logger.debug("Sala %s indicadores após impacto: %s", game.codigo, gs.indicadores)
+
+    if result.colapso:
+        logger.info("Sala %s encerrada: indicador chegou a %s", game.codigo, rules.colapso)
+    elif not gs.active:
+        logger.info("Sala %s encerrada: %s rodadas completadas", game.codigo, rules.rodadas)
+
+    if not gs.active:
+        _save_game_session(gs, players, tipo_comunicacao, rules)
+
+    return result
+
+
+# Long-polling do estado: espera máxima e intervalo de checagem no banco
+# (mudanças feitas por outros processos não passam pela camada em memória)
+STATE_MAX_WAIT = 30
+STATE_POLL_INTERVAL = 1.0
+
+
+class VoteError(Exception):
+    pass
+
+
+def _state_version(versao):
+    """ETag do estado: a versão do GameState, que muda a cada gravação"""
+    return f'"{versao}"'
+
+
+def state_payload(gs, players):
+    """Estado público da sala: o que os clientes precisam para se atualizar"""
+    game = gs.game
+    rules = _rules(game)
+    scenario_id = None
+    if gs.active and len(game.deck) >= gs.rodada_atual:
+        scenario_id = game.deck[gs.rodada_atual - 1]
+
+    return {
+        'type': 'state',
+        'versao': _state_version(gs.versao),
+        'sala': game.codigo,
+        'rodada': gs.rodada_atual,
+        'max_rodadas': rules.rodadas,
+        'ativo': gs.active,
+        'indicadores': rules.named(gs.indicadores),
+        'cenario_id': scenario_id,
+        'jogadores': [p.papel for p in players],
+        'bots': {p.papel: p.bot for p in players if p.bot},
+        # Só quem já votou; as escolhas ficam em segredo até a apuração
+        'votaram': sorted(gs.votos_pendentes),
+        'pontuacoes': {
+            p.papel: {'individual': p.pontuacao_individual, 'coletiva': p.pontuacao_coletiva}
+            for p in players
+        },
+    }
+
+
+def _publish_state(gs, players):
+    """Envia o novo estado aos WebSockets da sala depois do commit"""
+    codigo = gs.game.codigo
+    if layer.has_subscribers(codigo):
+        payload = state_payload(gs, players)
+        transaction.on_commit(lambda: layer.publish(codigo, payload))
+
+
+def current_state(codigo):
+    gs = GameState.objects.select_related('game').filter(game__codigo=codigo).first()
+    if gs is None:
+        return None
+    return state_payload(gs, list(Player.objects.filter(game=gs.game)))
+
+
+# Votos de jogadores diferentes da mesma sala podem colidir no
+# compare-and-swap; quem perde relê o estado e tenta de novo
+CAST_VOTE_ATTEMPTS = 3
+
+
+def cast_vote(codigo, papel, escolha, rodada, tipo_comunicacao='SIM'):
+    """
+    Registra o voto de um jogador na rodada que ele viu. Quando o último
+    voto chega a rodada é resolvida na hora. Devolve o novo estado da sala
+    """
+    if escolha not in ("A", "B"):
+        raise VoteError("Escolha inválida.")
+    if tipo_comunicacao not in dict(GameSession.COMUNICACAO_CHOICES):
+        raise VoteError("Tipo de comunicação inválido.")
+    try:
+        rodada = int(rodada)
+    except (TypeError, ValueError):
+        raise VoteError("Rodada inválida.")
+
+    # Numa colisão a nova tentativa relê o estado; se a rodada tiver mudado
+    # nesse meio tempo, _cast_vote recusa em vez de votar no cenário seguinte
+    for _ in range(CAST_VOTE_ATTEMPTS):
+        try:
+            return _cast_vote(codigo, papel, escolha, rodada, tipo_comunicacao)
+        except StaleStateError:
+            logger.debug("Sala %s: voto de %s colidiu, tentando de novo", codigo, papel)
+    raise VoteError("A sala está ocupada, tente de novo.")
+
+
+def _cast_vote(codigo, papel, escolha, rodada, tipo_comunicacao):
+    with transaction.atomic():
+        # select_for_update trava a linha onde o banco suporta (no SQLite não
+        # faz nada); o compare-and-swap de _save_state vale para todos
+        gs = (
+            GameState.objects.select_for_update().select_related('game')
+            .filter(game__codigo=codigo).first()
+        )
+        if gs is None:
+            raise VoteError("Sala não encontrada.")
+        if not gs.active:
+            raise VoteError("A partida já terminou.")
+        if gs.rodada_atual != rodada:
+            raise VoteError("A rodada mudou; confira o novo cenário e vote de novo.")
+
+        players = list(Player.objects.filter(game=gs.game))
+        if papel not in {p.papel for p in players if not p.bot}:
+            raise VoteError("Papel inválido.")
+
+        gs.votos_pendentes = {**gs.votos_pendentes, papel: escolha}
+        if any(p.papel not in gs.votos_pendentes for p in players if not p.bot):
+            gs.ultimo_evento += 1
+            _save_state(gs, ['votos_pendentes', 'ultimo_evento'])
+            events.append(gs, players, [events.vote_cast(papel, escolha)])
+            payload = state_payload(gs, players)
+            transaction.on_commit(lambda: layer.publish(codigo, payload))
+            return payload
+
+        scenario = _get_scenario_for_round(gs.game, gs.rodada_atual)
+        if scenario is None:
+            raise VoteError("Cenário não encontrado.")
+
+    # O último humano votou: os bots votam fora da transação, como em
+    # _play_round, e a lookahead não segura a linha travada. Se outra
+    # submissão mexer na sala nesse meio tempo, o compare-and-swap de
+    # _resolve_round recusa e cast_vote tenta de novo
+    choices = bots.fill_votes(gs, players, scenario, dict(gs.votos_pendentes))
+    with transaction.atomic():
+        _resolve_round(gs, players, scenario, choices, tipo_comunicacao)
+        payload = state_payload(gs, players)
+        transaction.on_commit(lambda: layer.publish(codigo, payload))
+
+    return payload
+
+
+def _active_games(limit=50):
+    """Salas com partida em andamento, das mais recentes para as mais antigas"""
+    return (
+        GameState.objects
+        .filter(active=True)
+        .select_related('game')
+        .order_by('-updated_at')[:limit]
+    )
 
-    # Verificar se o jogo deve continuar
-    scenario = None
-    if gs.active and gs.rodada_atual <= MAX_ROUNDS:
-        scenario = _get_random_scenario_for_round(gs.rodada_atual)
-        print(f"DEBUG: Scenario encontrado para rodada {gs.rodada_atual}: {scenario is not None}")
+
+def lobby_view(request):
+    """Cria salas novas e encaminha para salas existentes pelo código"""
+    catalog = get_catalog()
+    context = {"games": _active_games(), "rulesets": sorted(catalog.ruleset_ids)}
 
     if request.method == "POST":
-        # Verificar se é um reset do jogo
-        if request.POST.get('reset_game'):
-            # Reset completo do jogo
-            with transaction.atomic():
-                # Limpar dados do jogo anterior
-                Round.objects.all().delete()  # Isso também deleta as Choices devido ao CASCADE
-
-                # Reset dos jogadores
-                for p in players:
-                    p.pontuacao_individual = 0
-                    p.pontuacao_coletiva = 0
-                    p.save()
-
-                # Reset do estado do jogo
-                gs.active = True
-                gs.rodada_atual = 1
-                gs.estabilidade = 5
-                gs.seguranca = 5
-                gs.economia = 5
-                gs.liberdade = 5
-                gs.save()
-
-                print("DEBUG: Jogo resetado com sucesso")
-            return redirect("game:game")
+        if request.POST.get('create_game'):
+            try:
+                ruleset_id = catalog.ruleset_id(request.POST.get('ruleset'))
+            except KeyError:
+                return render(request, "game/lobby.html", {**context, "error": "Regras desconhecidas."})
+            game = _create_game(ruleset_id)
+            return redirect("game:game", codigo=game.codigo)
+
+        codigo = request.POST.get('codigo', '').strip().upper()
+        if Game.objects.filter(codigo=codigo).exists():
+            return redirect("game:game", codigo=codigo)
+
+        return render(request, "game/lobby.html", {**context, "error": f"Sala {codigo or '?'} não encontrada."})
+
+    return render(request, "game/lobby.html", context)
+
+
+def analytics_view(request):
+    """Comparativo das sessões salvas por tipo de comunicação"""
+    data = get_analytics()
+    if request.GET.get('format') == 'json':
+        return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+    return render(request, "game/analytics.html", {"analytics": data})
+
+
+@staff_member_required
+def export_view(request, dataset, fmt):
+    """
+    Exporta sessions/rounds/choices/archived_choices em CSV ou NDJSON, em streaming.
+    Filtros: ?desde=AAAA-MM-DD&ate=AAAA-MM-DD&tipo=SIM|NAO&gzip=1
+    """
+    filters = {}
+    for param, key in (('desde', 'since'), ('ate', 'until')):
+        value = request.GET.get(param)
+        if value:
+            parsed = parse_day(value)
+            if parsed is None:
+                return HttpResponseBadRequest(f"Data inválida em '{param}': {value}")
+            filters[key] = parsed
+    if request.GET.get('tipo'):
+        filters['tipo_comunicacao'] = request.GET['tipo']
+
+    compress = request.GET.get('gzip') in ('1', 'true')
+    try:
+        content = stream_export(dataset, fmt, compress=compress, **filters)
+    except ExportError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    response = StreamingHttpResponse(
+        content,
+        content_type='application/gzip' if compress else f'{FORMATS[fmt]}; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename(dataset, fmt, compress)}"'
+    return response
+
+
+@staff_member_required
+def session_history_view(request, session_id):
+    """Rodadas e votos arquivados de uma sessão encerrada, em JSON"""
+    history = archive.load_history(session_id)
+    if history is None:
+        raise Http404("Sessão sem histórico arquivado")
+    try:
+        data = history.as_dict()
+    except archive.ArchiveError as exc:
+        logger.error("Sessão %s: %s", session_id, exc)
+        raise Http404("Histórico ilegível")
+    return JsonResponse({'sessao': session_id, **data}, json_dumps_params={'ensure_ascii': False})
+
+
+@staff_member_required
+def replay_view(request, session_id):
+    """
+    Replay de uma sessão encerrada para o debrief: ?rodada=k mostra o
+    estado depois da rodada k; ?format=json devolve a trajetória (ou só o
+    quadro k, se vier ?rodada). A trajetória fica em cache. Mostra os votos
+    de cada papel, então é só para a equipe, como o histórico
+    """
+    try:
+        frames = get_trajectory(session_id)
+    except archive.ArchiveError as exc:
+        logger.error("Sessão %s: %s", session_id, exc)
+        raise Http404("Histórico ilegível")
+    if frames is None:
+        raise Http404("Sessão sem histórico arquivado")
+
+    rodada = request.GET.get('rodada')
+    try:
+        frame = frame_at(frames, len(frames) - 1 if rodada is None else int(rodada))
+    except ValueError:
+        return HttpResponseBadRequest(f"Rodada inválida: {rodada}")
+
+    if request.GET.get('format') == 'json':
+        data = frame if rodada is not None else {'sessao': session_id, 'quadros': frames}
+        return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+
+    return render(request, "game/replay.html", {
+        "session_id": session_id,
+        "frames": frames,
+        "frame": frame,
+        "ultima": len(frames) - 1,
+    })
+
+
+def _parse_choices(data, players, pendentes):
+    """
+    Votos do formulário da sala, normalizados para 'A', 'B' ou None. Quem
+    ficou em branco no formulário mas já votou pelo celular mantém esse voto
+    """
+    choices = {}
+    for p in players:
+        escolha = data.get(f"choice_{p.papel}")
+        choices[p.papel] = escolha if escolha in ("A", "B") else pendentes.get(p.papel)
+    return choices
+
+
+def _reset_game(gs, players):
+    """Reset completo da partida da sala, com baralho novo"""
+    game = gs.game
+    with transaction.atomic():
+        # Reset do estado do jogo (compare-and-swap: um reset repetido para aqui)
+        gs.active = True
+        gs.rodada_atual = 1
+        gs.total_consensos = 0
+        gs.total_empates = 0
+        gs.votos_pendentes = {}
+        indicadores = _rules(game).initial.indicadores
+        gs.indicadores = list(indicadores)
+        gs.ultimo_evento += 1
+        _save_state(gs)
+
+        # Limpar dados do jogo anterior (o histórico continua no log de eventos)
+        Round.objects.filter(game=game).delete()  # Isso também deleta as Choices devido ao CASCADE
+
+        # Reset dos jogadores
+        Player.objects.filter(game=game).update(pontuacao_individual=0, pontuacao_coletiva=0)
+        for p in players:
+            p.pontuacao_individual = 0
+            p.pontuacao_coletiva = 0
+
+        # Novo baralho para a nova partida
+        _deal_deck(game)
+        events.append(gs, players, [events.started(game, players, indicadores)])
+        _publish_state(gs, players)
+
+    logger.info("Sala %s resetada", game.codigo)
+
+
+def _is_stale_submission(data, gs, scenario):
+    """
+    O formulário da sala manda a rodada e o cenário em que foi montado: um
+    duplo clique ou uma segunda aba que envia uma rodada já resolvida (ou
+    de antes de um reset, que troca o baralho) chega com valores velhos e
+    é descartado sem escrever nada. Sem a rodada não há como saber o que
+    a mesa viu, e o envio também é descartado. Votos pelo celular mudam a
+    versão do estado no meio da rodada, mas não invalidam o formulário
+    """
+    rodada = data.get('rodada')
+    if rodada is None:
+        return True
+    cenario = str(scenario.pk) if scenario else ''
+    return rodada != str(gs.rodada_atual) or data.get('cenario', '') != cenario
+
+
+def _discard_stale_submission(request, game):
+    logger.info("Sala %s: submissão de um estado anterior descartada", game.codigo)
+    messages.warning(
+        request, "A sala mudou desde que esta tela foi aberta (rodada resolvida ou jogo reiniciado). "
+                 "Nada foi gravado: confira o estado atual e envie de novo.",
+    )
+    return redirect("game:game", codigo=game.codigo)
 
-        # Lógica normal do jogo - processar round
-        if gs.active and scenario is not None:
-            print(f"DEBUG: Processando rodada {gs.rodada_atual}")
-            choices = {}
-            votes_a = 0
-            votes_b = 0
-
-            for p in players:
-                key = f"choice_{p.papel}"
-                escolha = request.POST.get(key)
-                if escolha == "A":
-                    votes_a += 1
-                elif escolha == "B":
-                    votes_b += 1
-                choices[p.papel] = escolha
-
-            print(f"DEBUG: Votos A: {votes_a}, Votos B: {votes_b}")
 
-            # Verificar se todas as escolhas foram feitas
-            if not all(choices.values()):
-                print("DEBUG: Nem todos votaram, retornando erro")
-                return render(request, "game/game.html", {
-                    "players": players, "gs": gs, "scenario": scenario,
-                    "error": "Selecione uma opção (A/B) para todos os jogadores."
-                })
+def _missing_votes(choices, players):
+    """Humanos sem voto no formulário; os bots votam sozinhos"""
+    return [p.papel for p in players if not p.bot and not choices.get(p.papel)]
 
-            with transaction.atomic():
-                # Determinar impacto final baseado na votação
-                if votes_a > votes_b:
-                    impacto_final = {
-                        'estabilidade': scenario.impacto_sim_estabilidade,
-                        'seguranca': scenario.impacto_sim_seguranca,
-                        'economia': scenario.impacto_sim_economia,
-                        'liberdade': scenario.impacto_sim_liberdade,
-                    }
-                    opcao_vencedora = "A"
-                elif votes_b > votes_a:
-                    impacto_final = {
-                        'estabilidade': scenario.impacto_nao_estabilidade,
-                        'seguranca': scenario.impacto_nao_seguranca,
-                        'economia': scenario.impacto_nao_economia,
-                        'liberdade': scenario.impacto_nao_liberdade,
-                    }
-                    opcao_vencedora = "B"
-                else:  # empate
-                    impacto_final = {
-                        'estabilidade': scenario.impacto_empate_estabilidade,
-                        'seguranca': scenario.impacto_empate_seguranca,
-                        'economia': scenario.impacto_empate_economia,
-                        'liberdade': scenario.impacto_empate_liberdade,
-                    }
-                    opcao_vencedora = "E"  # Empate
-
-                # Criar round
-                rnd = Round.objects.create(numero=gs.rodada_atual, scenario=scenario)
-
-                # Salvar escolhas e calcular pontuação individual
-                for p in players:
-                    escolha = choices[p.papel]
-                    interest = ROLE_INTEREST[p.papel]
-                    aligned = False
-
-                    # Verificar se a escolha está alinhada com o interesse do papel
-                    if escolha == "A" and opcao_vencedora == "A":
-                        aligned = scenario.__dict__[f"impacto_sim_{interest}"] > 0
-                    elif escolha == "B" and opcao_vencedora == "B":
-                        aligned = scenario.__dict__[f"impacto_nao_{interest}"] > 0
-                    elif escolha in ["A", "B"] and opcao_vencedora == "E":
-                        # Em caso de empate, verificar se a escolha individual beneficiaria o interesse
-                        if escolha == "A":
-                            aligned = scenario.__dict__[f"impacto_sim_{interest}"] > 0
-                        else:  # escolha == "B"
-                            aligned = scenario.__dict__[f"impacto_nao_{interest}"] > 0
-
-                    pontos = 1 if aligned else 0
-
-                    Choice.objects.create(
-                        player=p,
-                        round=rnd,
-                        escolha=escolha,
-                        alinhado=aligned,
-                        impacto=impacto_final,
-                        pontos_ganhos=pontos
-                    )
-
-                    # Atualizar pontuação individual
-                    if aligned:
-                        p.pontuacao_individual += 1
-                        p.save()
-
-                # Aplicar impacto no estado do país
-                gs.estabilidade = clamp(gs.estabilidade + impacto_final['estabilidade'])
-                gs.seguranca = clamp(gs.seguranca + impacto_final['seguranca'])
-                gs.economia = clamp(gs.economia + impacto_final['economia'])
-                gs.liberdade = clamp(gs.liberdade + impacto_final['liberdade'])
-
-                print(
-                    f"DEBUG: Indicadores após impacto - E:{gs.estabilidade} S:{gs.seguranca} Ec:{gs.economia} L:{gs.liberdade}")
-
-                # Verificar condição para ponto coletivo (todos os indicadores entre 3 e 5)
-                if (3 <= gs.estabilidade <= 5 and 3 <= gs.seguranca <= 5 and
-                        3 <= gs.economia <= 5 and 3 <= gs.liberdade <= 5):
-                    for p in players:
-                        p.pontuacao_coletiva += 1
-                        p.save()
-
-                # VERIFICAR IMEDIATAMENTE se algum indicador chegou a 1
-                if (gs.estabilidade == 1 or gs.seguranca == 1 or
-                        gs.economia == 1 or gs.liberdade == 1):
-                    gs.active = False
-                    gs.save()
-                    print("DEBUG: Jogo encerrado IMEDIATAMENTE - indicador chegou a 1")
-                    # Salvar sessão e terminar
-                    tipo_comunicacao = request.POST.get('tipo_comunicacao_final', 'SIM')
-                    _save_game_session(gs, players, tipo_comunicacao)
-                    return redirect("game:game")
-
-                # Se chegou até aqui, o jogo continua - avançar rodada
-                gs.rodada_atual += 1
-                print(f"DEBUG: Rodada processada: {gs.rodada_atual - 1}, avançando para: {gs.rodada_atual}")
-
-                # Verificar se completou 6 rounds
-                if gs.rodada_atual > MAX_ROUNDS:
-                    gs.active = False
-                    print("DEBUG: Jogo encerrado - 6 rounds completados")
-                    # Salvar sessão
-                    tipo_comunicacao = request.POST.get('tipo_comunicacao_final', 'SIM')
-                    _save_game_session(gs, players, tipo_comunicacao)
-
-                gs.save()
-
-            return redirect("game:game")
 
-    # GET -> renderizar a tela do jogo
+def _set_bots(gs, players, data):
+    """Troca quais papéis são jogados por bots (e com qual estratégia)"""
+    strategies = {value for value, _ in Player.BOT_CHOICES}
+    changed = []
+    for p in players:
+        bot = data.get(f"bot_{p.papel}", p.bot)
+        if bot in strategies and bot != p.bot:
+            p.bot = bot
+            changed.append(p)
+    if changed:
+        Player.objects.bulk_update(changed, ['bot'])
+        _publish_state(gs, players)
+        logger.info("Sala %s: bots %s", gs.game.codigo, {p.papel: p.bot or '-' for p in changed})
+
+
+def _play_round(gs, players, scenario, choices, tipo_comunicacao='SIM'):
+    """Resolve a rodada numa transação e avisa os WebSockets da sala"""
+    # Os votos dos bots saem antes da transação: a lookahead não segura o banco
+    choices = bots.fill_votes(gs, players, scenario, choices)
+    with transaction.atomic():
+        _resolve_round(gs, players, scenario, choices, tipo_comunicacao)
+        _publish_state(gs, players)
+
+
+def _indicator_rows(gs, rules):
+    """Indicadores para os templates: nome, rótulo, valor e se está no colapso"""
+    return [
+        {'nome': nome, 'rotulo': rules.rotulos[nome], 'valor': valor, 'maximo': rules.maximo,
+         'critico': valor == rules.colapso}
+        for nome, valor in zip(rules.indicadores, gs.indicadores)
+    ]
+
+
+def _game_context(gs, players, scenario, rules, **extra):
     context = {
+        "game": gs.game,
         "players": players,
         "gs": gs,
         "scenario": scenario,
-        "max_rounds": MAX_ROUNDS,
+        "rules": rules,
+        "indicators": _indicator_rows(gs, rules),
+        "max_rounds": rules.rodadas,
+        "bot_choices": Player.BOT_CHOICES,
+        **extra,
     }
 
     # Determinar motivo do fim se o jogo terminou
     if not gs.active:
-        if (gs.estabilidade == 1 or gs.seguranca == 1 or
-                gs.economia == 1 or gs.liberdade == 1):
+        if engine.is_collapsed(_indicators(gs), rules):
             context["end_reason"] = "collapse"
         else:
             context["end_reason"] = "completed"
 
-    return render(request, "game/game.html", context)
\ No newline at end of file
+    return context
+
+
+def game_view(request, codigo):
+    gs = get_object_or_404(GameState.objects.select_related('game'), game__codigo=codigo.upper())
+    game = gs.game
+    players = list(Player.objects.filter(game=game))
+
+    rules = _rules(game)
+
+    annotate_request(request, sala=game.codigo, rodada=gs.rodada_atual)
+
+    # Verificar se o jogo deve continuar
+    scenario = None
+    if gs.active and gs.rodada_atual <= rules.rodadas:
+        scenario = _get_scenario_for_round(game, gs.rodada_atual)
+
+    if request.method == "POST":
+        # Trocar bots não depende da rodada em tela
+        if request.POST.get('set_bots'):
+            _set_bots(gs, players, request.POST)
+            return redirect("game:game", codigo=game.codigo)
+
+        if _is_stale_submission(request.POST, gs, scenario):
+            return _discard_stale_submission(request, game)
+
+        # Verificar se é um reset do jogo
+        if request.POST.get('reset_game'):
+            try:
+                _reset_game(gs, players)
+            except StaleStateError:
+                logger.info("Sala %s: reset concorrente descartado", game.codigo)
+            return redirect("game:game", codigo=game.codigo)
+
+        # Lógica normal do jogo - processar round
+        if gs.active and scenario is not None:
+            choices = _parse_choices(request.POST, players, gs.votos_pendentes)
+
+            # Verificar se todas as escolhas foram feitas
+            if _missing_votes(choices, players):
+                return render(request, "game/game.html", _game_context(
+                    gs, players, scenario, rules,
+                    error="Selecione uma opção (A/B) para todos os jogadores humanos.",
+                ))
+
+            tipo_comunicacao = request.POST.get('tipo_comunicacao_final', 'SIM')
+            try:
+                _play_round(gs, players, scenario, choices, tipo_comunicacao)
+            except StaleStateError:
+                logger.info("Sala %s: rodada %s já resolvida por outra submissão", game.codigo, gs.rodada_atual)
+            return redirect("game:game", codigo=game.codigo)
+
+    # GET -> renderizar a tela do jogo
+    return render(request, "game/game.html", _game_context(gs, players, scenario, rules))
+
+
+def player_view(request, codigo, token):
+    """Tela de um jogador só, para votar do próprio celular via WebSocket"""
+    gs = get_object_or_404(GameState.objects.select_related('game'), game__codigo=codigo.upper())
+    player = get_object_or_404(Player, token=token, game=gs.game)
+    annotate_request(request, sala=gs.game.codigo, rodada=gs.rodada_atual)
+    rules = _rules(gs.game)
+
+    scenario = None
+    if gs.active and gs.rodada_atual <= rules.rodadas:
+        scenario = _get_scenario_for_round(gs.game, gs.rodada_atual)
+
+    return render(request, "game/player.html", _player_context(gs, player, scenario, rules))
+
+
+def _player_context(gs, player, scenario, rules):
+    return {
+        "game": gs.game,
+        "gs": gs,
+        "player": player,
+        "scenario": scenario,
+        "voted": gs.votos_pendentes.get(player.papel),
+        "indicators": _indicator_rows(gs, rules),
+        "max_rounds": rules.rodadas,
+    }
+
+
+# Versões assíncronas das telas da sala, usadas no app ASGI (GAME_ASYNC_VIEWS).
+# As leituras usam o ORM assíncrono direto no event loop; as escritas da
+# rodada e do reset precisam de transaction.atomic (que o Django ainda não
+# tem em versão async), então vão inteiras para uma thread num único salto.
+
+async def _aget_scenario_for_round(game, round_number):
+    if len(game.deck) < round_number:
+        # Baralho curto: _get_scenario_for_round sorteia de novo e grava
+        return await sync_to_async(_get_scenario_for_round)(game, round_number)
+    catalog = await aget_catalog()
+    return catalog.get(game.deck[round_number - 1])
+
+
+async def agame_view(request, codigo):
+    gs = await aget_object_or_404(GameState.objects.select_related('game'), game__codigo=codigo.upper())
+    game = gs.game
+    players = [p async for p in Player.objects.filter(game=game)]
+    annotate_request(request, sala=game.codigo, rodada=gs.rodada_atual)
+    rules = (await aget_catalog()).rules(game.ruleset_id)
+
+    scenario = None
+    if gs.active and gs.rodada_atual <= rules.rodadas:
+        scenario = await _aget_scenario_for_round(game, gs.rodada_atual)
+
+    if request.method == "POST":
+        if request.POST.get('set_bots'):
+            await sync_to_async(_set_bots)(gs, players, request.POST)
+            return redirect("game:game", codigo=game.codigo)
+
+        if _is_stale_submission(request.POST, gs, scenario):
+            return _discard_stale_submission(request, game)
+
+        if request.POST.get('reset_game'):
+            try:
+                await sync_to_async(_reset_game)(gs, players)
+            except StaleStateError:
+                logger.info("Sala %s: reset concorrente descartado", game.codigo)
+            return redirect("game:game", codigo=game.codigo)
+
+        if gs.active and scenario is not None:
+            choices = _parse_choices(request.POST, players, gs.votos_pendentes)
+            if _missing_votes(choices, players):
+                return render(request, "game/game.html", _game_context(
+                    gs, players, scenario, rules,
+                    error="Selecione uma opção (A/B) para todos os jogadores humanos.",
+                ))
+
+            tipo_comunicacao = request.POST.get('tipo_comunicacao_final', 'SIM')
+            try:
+                await sync_to_async(_play_round)(gs, players, scenario, choices, tipo_comunicacao)
+            except StaleStateError:
+                logger.info("Sala %s: rodada %s já resolvida por outra submissão", game.codigo, gs.rodada_atual)
+            return redirect("game:game", codigo=game.codigo)
+
+    return render(request, "game/game.html", _game_context(gs, players, scenario, rules))
+
+
+async def aplayer_view(request, codigo, token):
+    gs = await aget_object_or_404(GameState.objects.select_related('game'), game__codigo=codigo.upper())
+    player = await aget_object_or_404(Player, token=token, game=gs.game)
+    annotate_request(request, sala=gs.game.codigo, rodada=gs.rodada_atual)
+    rules = (await aget_catalog()).rules(gs.game.ruleset_id)
+
+    scenario = None
+    if gs.active and gs.rodada_atual <= rules.rodadas:
+        scenario = await _aget_scenario_for_round(gs.game, gs.rodada_atual)
+
+    return render(request, "game/player.html", _player_context(gs, player, scenario, rules))
+
+
+async def _current_version(codigo):
+    row = await (
+        GameState.objects.filter(game__codigo=codigo)
+        .values_list('versao', flat=True)
+        .afirst()
+    )
+    return None if row is None else _state_version(row)
+
+
+async def _wait_for_change(codigo, version, timeout):
+    """Segura a requisição até a versão mudar ou o tempo acabar"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    queue = layer.subscribe(codigo)
+    try:
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                # Acorda na hora quando a sala é atualizada neste processo
+                await asyncio.wait_for(queue.get(), timeout=min(remaining, STATE_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+            current = await _current_version(codigo)
+            if current != version:
+                return current
+        return version
+    finally:
+        layer.unsubscribe(codigo, queue)
+
+
+async def state_view(request, codigo):
+    """
+    Estado da sala em JSON, com ETag. Com If-None-Match (ou ?versao=)
+    igual à versão atual responde 304 sem montar o estado; com ?wait=N
+    espera até N segundos por uma mudança antes de responder
+    """
+    codigo = codigo.upper()
+    annotate_request(request, sala=codigo)
+    known = request.headers.get('If-None-Match') or request.GET.get('versao')
+    try:
+        wait = min(float(request.GET.get('wait') or 0), STATE_MAX_WAIT)
+    except ValueError:
+        return HttpResponseBadRequest("Parâmetro 'wait' inválido.")
+
+    version = await _current_version(codigo)
+    if version is None:
+        raise Http404("Sala não encontrada.")
+
+    if known == version and wait > 0:
+        version = await _wait_for_change(codigo, version, wait)
+
+    if known == version:
+        response = HttpResponseNotModified()
+        response['ETag'] = version
+        return response
+
+    payload = await sync_to_async(current_state)(codigo)
+    response = JsonResponse(payload, json_dumps_params={'ensure_ascii': False})
+    response['ETag'] = payload['versao']
+    response['Cache-Control'] = 'no-cache'
+    return response
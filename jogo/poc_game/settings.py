@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro da lista: o tempo medido inclui os outros middlewares
+    'game.middleware.request_timing_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,15 +75,72 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'poc_game.wsgi.application'
 
+# Telas da sala com views assíncronas (ORM async); o poc_game/asgi.py liga
+GAME_ASYNC_VIEWS = os.environ.get('GAME_ASYNC_VIEWS') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# GAME_DB_PROFILE escolhe o perfil do banco:
+# - dev (padrão): SQLite sem ajustes
+# - sqlite: SQLite para produção. WAL (leitores não bloqueiam o escritor),
+#   synchronous=NORMAL, busy_timeout para esperar o lock em vez de falhar,
+#   transações IMMEDIATE (o lock de escrita é pego no BEGIN, sem o
+#   "database is locked" da promoção de leitura para escrita) e conexões
+#   persistentes
+# - postgres: PostgreSQL com o pool de conexões do Django; requer
+#   pip install "psycopg[binary,pool]" e as variáveis POSTGRES_*
+# GAME_DB_NAME troca o arquivo dos perfis SQLite.
+
+DB_PROFILE = os.environ.get('GAME_DB_PROFILE', 'dev')
+SQLITE_NAME = os.environ.get('GAME_DB_NAME', BASE_DIR / 'db.sqlite3')
+
+DATABASE_PROFILES = {
+    'dev': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'NAME': SQLITE_NAME,
+    },
+    'sqlite': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': SQLITE_NAME,
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA busy_timeout=5000;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA cache_size=-20000;'
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    'postgres': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'jogo'),
+        'USER': os.environ.get('POSTGRES_USER', 'jogo'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # Com pool as conexões são devolvidas ao pool; CONN_MAX_AGE fica 0
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.environ.get('POSTGRES_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('POSTGRES_POOL_MAX', 20)),
+            },
+        },
+    },
+}
+
+if DB_PROFILE not in DATABASE_PROFILES:
+    raise ImproperlyConfigured(
+        f"GAME_DB_PROFILE={DB_PROFILE!r}; use um destes: {', '.join(DATABASE_PROFILES)}"
+    )
+
+DATABASES = {
+    'default': DATABASE_PROFILES[DB_PROFILE],
 }
 
 
@@ -121,3 +184,34 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# GAME_LOG_LEVEL=DEBUG mostra os detalhes de cada rodada; WARNING desliga
+# também a linha por requisição (logger game.requests). Em manage.py test
+# o padrão é WARNING, para as linhas de cada rodada não inundarem a saída
+TESTING = sys.argv[1:2] == ['test']
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'game': {
+            'handlers': ['console'],
+            'level': os.environ.get('GAME_LOG_LEVEL', 'WARNING' if TESTING else 'INFO'),
+            'propagate': False,
+        },
+    },
+}